@@ -0,0 +1,318 @@
+import math
+import os
+import random
+from collections import Counter, deque
+
+from character_generator import generate_batch, regenerate_character
+from rules import Career
+
+# Streaming balance statistics over generated characters.
+#
+# Characters are folded into online accumulators as they are generated and
+# then dropped, so memory stays constant for any number of characters:
+# Welford mean/variance (RunningStats), fixed-bin histograms (Histogram) and a
+# relative-error quantile sketch for cash (QuantileSketch, after DDSketch).
+# Every accumulator has merge(), so workers aggregate their own chunks and the
+# parent merges the results; aggregate_batch() does this for a seeded batch.
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream (Welford; merged with Chan's formula)"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self._m2, self.min, self.max = other.count, other.mean, other._m2, other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (0.0 for fewer than two values)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'stdev': self.stdev, 'min': self.min, 'max': self.max}
+
+
+class Histogram:
+    """Counts in fixed-width bins over [low, high), plus underflow and overflow"""
+
+    __slots__ = ('low', 'high', 'width', 'counts', 'underflow', 'overflow')
+
+    def __init__(self, low, high, width=1):
+        if width <= 0 or high <= low:
+            raise ValueError("Histogram needs low < high and a positive width")
+        self.low = low
+        self.high = high
+        self.width = width
+        self.counts = [0] * math.ceil((high - low) / width)
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value):
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            self.counts[int((value - self.low) // self.width)] += 1
+
+    def merge(self, other):
+        if (other.low, other.high, other.width) != (self.low, self.high, self.width):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def bins(self):
+        """[(bin start, count)] for every bin"""
+        return [(self.low + i * self.width, count) for i, count in enumerate(self.counts)]
+
+    def to_dict(self):
+        return {'bins': {str(start): count for start, count in self.bins()},
+                'underflow': self.underflow, 'overflow': self.overflow}
+
+
+class QuantileSketch:
+    """Quantiles of a non-negative stream to within relative_accuracy, in log-spaced buckets (DDSketch)"""
+
+    __slots__ = ('relative_accuracy', '_gamma', '_log_gamma', 'buckets', 'zeros', 'count')
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}  # k -> count of values in (gamma**(k-1), gamma**k]
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        if value < 0:
+            raise ValueError("QuantileSketch only takes non-negative values")
+        self.count += 1
+        if value == 0:
+            self.zeros += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Estimate of the q-quantile (0 <= q <= 1), or None if empty"""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+class CareerStats:
+    """Accumulators for one group of characters"""
+
+    __slots__ = ('characters', 'died', 'injured', 'commissioned', 'drafted',
+                 'terms', 'age', 'cash', 'cash_quantiles', 'ranks', 'skills', 'skill_levels')
+
+    def __init__(self):
+        self.characters = 0
+        self.died = 0
+        self.injured = 0
+        self.commissioned = 0
+        self.drafted = 0
+        self.terms = RunningStats()
+        self.age = RunningStats()
+        self.cash = RunningStats()
+        self.cash_quantiles = QuantileSketch()
+        self.ranks = Histogram(0, 7)
+        self.skills = Counter()  # skill -> characters who have it
+        self.skill_levels = RunningStats()  # total skill levels per character
+
+    def add(self, character):
+        self.characters += 1
+        self.died += character.died
+        history = character.career_history
+        self.injured += bool(history) and history[-1].get('partial_term', False)
+        self.commissioned += character.commissioned
+        self.drafted += character.drafted
+        self.terms.add(float(character.terms_served))
+        self.age.add(character.age)
+        cash = character.mustering_out_benefits['cash']
+        self.cash.add(cash)
+        self.cash_quantiles.add(cash)
+        self.ranks.add(character.rank)
+        self.skills.update(str(skill) for skill in character.skills)
+        self.skill_levels.add(sum(character.skills.values()))
+
+    def merge(self, other):
+        self.characters += other.characters
+        self.died += other.died
+        self.injured += other.injured
+        self.commissioned += other.commissioned
+        self.drafted += other.drafted
+        for name in ('terms', 'age', 'cash', 'cash_quantiles', 'ranks', 'skill_levels'):
+            getattr(self, name).merge(getattr(other, name))
+        self.skills.update(other.skills)
+        return self
+
+    def _rate(self, count):
+        return count / self.characters if self.characters else 0.0
+
+    def to_dict(self):
+        return {
+            'characters': self.characters,
+            'survival_rate': self._rate(self.characters - self.died),
+            'died': self.died,
+            'injured': self.injured,
+            'commission_rate': self._rate(self.commissioned),
+            'drafted_rate': self._rate(self.drafted),
+            'terms': self.terms.to_dict(),
+            'age': self.age.to_dict(),
+            'cash': {**self.cash.to_dict(),
+                     'quantiles': {str(q): self.cash_quantiles.quantile(q) for q in QUANTILES}},
+            'ranks': self.ranks.to_dict(),
+            'skills': dict(self.skills.most_common()),
+            'skill_levels': self.skill_levels.to_dict(),
+        }
+
+
+class Aggregate:
+    """Per-career and overall CareerStats for a stream of characters; mergeable"""
+
+    def __init__(self):
+        self.careers = {}  # career label -> CareerStats
+        self.total = CareerStats()
+
+    def add(self, character):
+        key = str(character.career)
+        stats = self.careers.get(key)
+        if stats is None:
+            stats = self.careers[key] = CareerStats()
+        stats.add(character)
+        self.total.add(character)
+
+    def extend(self, characters):
+        for character in characters:
+            self.add(character)
+        return self
+
+    def merge(self, other):
+        for key, stats in other.careers.items():
+            self.careers.setdefault(key, CareerStats()).merge(stats)
+        self.total.merge(other.total)
+        return self
+
+    def _ordered(self):
+        order = {str(career): i for i, career in enumerate(Career)}
+        return sorted(self.careers.items(), key=lambda item: order.get(item[0], len(order)))
+
+    def to_dict(self):
+        return {'total': self.total.to_dict(), 'careers': {key: stats.to_dict() for key, stats in self._ordered()}}
+
+    def format_report(self):
+        """Text table of the main figures per career"""
+        lines = [f"{'career':<11}{'chars':>8}{'survive':>9}{'injured':>9}{'officer':>9}{'terms':>12}"
+                 f"{'cash p10':>10}{'p50':>8}{'p90':>8}  top skills"]
+        for key, stats in self._ordered() + [('All', self.total)]:
+            data = stats.to_dict()
+            cash = data['cash']['quantiles']
+            top = ', '.join(f"{skill} {count / stats.characters:.0%}" for skill, count in stats.skills.most_common(3))
+            lines.append(f"{key:<11}{stats.characters:>8}{data['survival_rate']:>9.1%}"
+                         f"{stats._rate(stats.injured):>9.1%}{data['commission_rate']:>9.1%}"
+                         f"{stats.terms.mean:>7.2f}±{stats.terms.stdev:<4.2f}"
+                         f"{cash['0.1']:>10.0f}{cash['0.5']:>8.0f}{cash['0.9']:>8.0f}  {top}")
+        return '\n'.join(lines)
+
+
+def _aggregate_chunk(seed, start, stop, log_level, options):
+    """Aggregate characters [start, stop) of a batch (runs inside a worker process)"""
+    aggregate = Aggregate()
+    for index in range(start, stop):
+        aggregate.add(regenerate_character(seed, index, log_level=log_level, **options))
+    return aggregate
+
+
+def aggregate_batch(n, seed=None, workers=1, chunk_size=None, log_level='off', **options):
+    """Aggregate of generate_batch(n, seed, **options) without keeping any character.
+
+    The characters are the same as generate_batch's for the same seed; logs
+    are off by default since no statistic needs them. With workers > 1 each
+    worker aggregates whole chunks and the parent merges them in order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return Aggregate().extend(generate_batch(n, seed, output_format='object', log_level=log_level, **options))
+
+    list(generate_batch(0, seed, log_level=log_level, **options))  # validates the options
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+    if chunk_size is None:
+        chunk_size = max(1, min(5000, n // (workers * 8)))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    total = Aggregate()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A bounded number of chunks in flight keeps the parent's memory flat too
+        pending = deque()
+        for start in range(0, n, chunk_size):
+            pending.append(executor.submit(_aggregate_chunk, seed, start, min(start + chunk_size, n),
+                                           log_level, options))
+            if len(pending) >= workers * 2:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
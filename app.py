@@ -1,15 +1,84 @@
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, g, jsonify, send_from_directory, request
+import atexit
+import copy
+import functools
 import os
-import json
+import threading
+import uuid
+from collections import OrderedDict
 from character_generator import Character
-
-# Delete current_character.json on app startup
-json_path = 'current_character.json'
-if os.path.exists(json_path):
-    os.remove(json_path)
+from library import DEFAULT_PATH, Library
+from state_store import SESSION_ID, StateStore
 
 app = Flask(__name__)
 
+# Each browser gets its own character, keyed by a random session id cookie.
+# States live in memory (least recently used sessions evicted past
+# TRAVELLER_MAX_SESSIONS); set TRAVELLER_STATE_DIR to also keep them on disk,
+# written behind every TRAVELLER_FLUSH_SECONDS (0 writes on every change).
+SESSION_COOKIE = 'traveller_session'
+store = StateStore(capacity=int(os.environ.get('TRAVELLER_MAX_SESSIONS', 1000)),
+                   directory=os.environ.get('TRAVELLER_STATE_DIR'),
+                   flush_interval=float(os.environ.get('TRAVELLER_FLUSH_SECONDS', 1.0)))
+atexit.register(store.close)
+
+@functools.cache
+def library():
+    """The character library (TRAVELLER_LIBRARY, default characters.db), opened on first use"""
+    opened = Library(os.environ.get('TRAVELLER_LIBRARY', DEFAULT_PATH))
+    atexit.register(opened.close)
+    return opened
+
+def session_id():
+    """This request's session id, starting a new session if the cookie is missing or malformed"""
+    sid = request.cookies.get(SESSION_COOKIE)
+    if sid is None or not SESSION_ID.fullmatch(sid):
+        sid = g.get('new_session_id')
+        if sid is None:
+            sid = g.new_session_id = uuid.uuid4().hex
+    return sid
+
+@app.after_request
+def set_session_cookie(response):
+    sid = g.get('new_session_id')
+    if sid is not None:
+        response.set_cookie(SESSION_COOKIE, sid, httponly=True, samesite='Lax')
+    return response
+
+def character_endpoint(view):
+    """Call view(char_data) with the session's state under its lock.
+
+    Unless the request is a GET, the view gets a copy, which replaces the state (with a new
+    revision) only if the view succeeds and changed something.
+    """
+    @functools.wraps(view)
+    def wrapper():
+        sid = session_id()
+        with store.lock(sid):
+            char_data = store.get(sid)
+            if char_data is None:
+                return jsonify({'error': 'No character found'}), 400
+            if request.method == 'GET':
+                return view(char_data)
+            g.saved_state = char_data
+            draft = copy.deepcopy(char_data)
+            response = app.make_response(view(draft))
+            if response.status_code < 400 and stamp_revision(draft):
+                store.put(sid, draft)
+            return response
+    return wrapper
+
+# Views that report the revision call this before building their response
+def stamp_revision(draft):
+    """Give a view's copy of the state a new revision if it differs from the saved state; True if it does"""
+    saved = g.saved_state
+    if draft.get('revision') != saved.get('revision'):
+        return True  # already stamped
+    if draft == saved:
+        return False
+    draft['revision'] = store.next_revision()
+    return True
+
 def ordinal(n):
     # Dictionary mapping numbers to written ordinal forms
     ordinal_dict = {
@@ -50,9 +119,6 @@ def serve_style():
 
 @app.route('/create_character', methods=['POST'])
 def create_character():
-    json_path = 'current_character.json'
-    if os.path.exists(json_path):
-        os.remove(json_path)
     character = Character()
     character.name = character.get_random_name()
     character.age = 18
@@ -83,8 +149,10 @@ def create_character():
     char_data['skills'] = {}  # Reset skills (for future implementation)
     char_data['skill_tables'] = []  # Reset skill tables (for future implementation)
     char_data['remaining_skills'] = 0  # Reset remaining skills (for future implementation)
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
+    char_data['revision'] = store.next_revision()
+    sid = session_id()
+    with store.lock(sid):
+        store.put(sid, char_data)
     return jsonify({
         'name': character.name,
         'age': character.age
@@ -95,19 +163,12 @@ def safe_dict(obj):
 
 @app.route('/delete_character', methods=['POST'])
 def delete_character():
-    json_path = 'current_character.json'
-    if os.path.exists(json_path):
-        os.remove(json_path)
-        deleted = True
-    else:
-        deleted = False
+    deleted = store.delete(session_id())
     return jsonify({'deleted': deleted})
 
 @app.route('/reveal_characteristic', methods=['POST'])
-def reveal_characteristic():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
+@character_endpoint
+def reveal_characteristic(char_data):
     data = request.get_json()
     char_name = data.get('characteristic')
     valid_chars = ['strength', 'dexterity', 'endurance', 'intelligence', 'education', 'social']
@@ -121,8 +182,6 @@ def reveal_characteristic():
     }
     if char_name not in valid_chars:
         return jsonify({'error': 'Invalid characteristic'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
     # Generate characteristics if not present
     if not char_data.get('characteristics'):
         all_chars = Character.generate_characteristics()
@@ -155,23 +214,16 @@ def reveal_characteristic():
             upp += hex_values[c]
         else:
             upp += '-'
-    # Save updated state
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
     return jsonify({'upp': upp, 'revealed': char_data['revealed']})
 
 @app.route('/attempt_enlistment', methods=['POST'])
-def attempt_enlistment():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
+@character_endpoint
+def attempt_enlistment(char_data):
     data = request.get_json()
     service = data.get('service')
     valid_services = ['Navy', 'Marines', 'Army', 'Scouts', 'Merchants', 'Others']
     if service not in valid_services:
         return jsonify({'error': 'Invalid service'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
     characteristics = char_data.get('characteristics', {})
     # Map to short keys for attempt_enlistment
     char_map = {
@@ -193,8 +245,6 @@ def attempt_enlistment():
     # Set drafted flag if character was drafted
     if enlistment_status == 'drafted':
         char_data['drafted'] = True
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
     return jsonify({
         'service': career,
         'enlistment_status': enlistment_status,
@@ -203,26 +253,21 @@ def attempt_enlistment():
         'modifier': modifier
     })
 
-@app.route('/term_info', methods=['GET'])
-def term_info():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+def term_info_data(char_data):
+    """Number and ordinal name of the character's current term"""
     term_number = char_data.get('terms_served', 0) + 1
-    return jsonify({
+    return {
         'term_number': term_number,
         'term_ordinal': ordinal(term_number)
-    })
+    }
 
-@app.route('/term_survival', methods=['POST'])
-def term_survival():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@app.route('/term_info', methods=['GET'])
+@character_endpoint
+def term_info(char_data):
+    return jsonify(term_info_data(char_data))
+
+def resolve_survival(char_data):
+    """Roll survival for the current term; records and returns the detailed result"""
     service = char_data.get('service')
     characteristics = char_data.get('characteristics', {})
     # Map to short keys for check_survival_detailed
@@ -239,26 +284,20 @@ def term_survival():
     # Save outcome to character data and mark survival as completed
     char_data['last_survival'] = result
     char_data['survival_completed'] = True
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
-    return jsonify(result)
+    return result
+
+@app.route('/term_survival', methods=['POST'])
+@character_endpoint
+def term_survival(char_data):
+    return jsonify(resolve_survival(char_data))
 
 @app.route('/term_survival', methods=['GET'])
-def get_term_survival():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@character_endpoint
+def get_term_survival(char_data):
     return jsonify(char_data.get('last_survival', {}))
 
-@app.route('/term_commission', methods=['POST'])
-def term_commission():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+def resolve_commission(char_data):
+    """Roll for a commission; records and returns the detailed result"""
     service = char_data.get('service')
     characteristics = char_data.get('characteristics', {})
     # Map to short keys for check_commission_detailed
@@ -280,26 +319,20 @@ def term_commission():
     if result.get('success', False):
         char_data['is_commissioned'] = True
         char_data['rank'] = 1  # Set initial rank to 1 when commissioned
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
-    return jsonify(result)
+    return result
+
+@app.route('/term_commission', methods=['POST'])
+@character_endpoint
+def term_commission(char_data):
+    return jsonify(resolve_commission(char_data))
 
 @app.route('/term_commission', methods=['GET'])
-def get_term_commission():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@character_endpoint
+def get_term_commission(char_data):
     return jsonify(char_data.get('last_commission', {}))
 
-@app.route('/term_promotion', methods=['POST'])
-def term_promotion():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+def resolve_promotion(char_data):
+    """Roll for promotion; records and returns the detailed result"""
     service = char_data.get('service')
     characteristics = char_data.get('characteristics', {})
     current_rank = char_data.get('rank', 0)  # Use 'rank' field instead of 'current_rank'
@@ -320,42 +353,36 @@ def term_promotion():
     # If promotion succeeded, increment rank
     if result.get('success', False):
         char_data['rank'] = result.get('new_rank', current_rank)
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
-    return jsonify(result)
+    return result
+
+@app.route('/term_promotion', methods=['POST'])
+@character_endpoint
+def term_promotion(char_data):
+    return jsonify(resolve_promotion(char_data))
 
 @app.route('/term_promotion', methods=['GET'])
-def get_term_promotion():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@character_endpoint
+def get_term_promotion(char_data):
     return jsonify(char_data.get('last_promotion', {}))
 
-@app.route('/term_button_status', methods=['GET'])
-def term_button_status():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
-    return jsonify({
+def button_status_data(char_data):
+    """Which term steps are done (drives the term buttons)"""
+    return {
         'survival_completed': char_data.get('survival_completed', False),
         'commission_completed': char_data.get('commission_completed', False),
         'commission_succeeded': char_data.get('commission_succeeded', False),
         'is_commissioned': char_data.get('is_commissioned', False),
         'promotion_completed': char_data.get('promotion_completed', False),
         'reenlistment_completed': char_data.get('reenlistment_completed', False)
-    })
+    }
 
-@app.route('/term_reenlistment', methods=['POST'])
-def term_reenlistment():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@app.route('/term_button_status', methods=['GET'])
+@character_endpoint
+def term_button_status(char_data):
+    return jsonify(button_status_data(char_data))
+
+def resolve_reenlistment(char_data):
+    """Roll re-enlistment, starting the next term if it succeeds; returns the outcome"""
     service = char_data.get('service')
     age = char_data.get('age', 18)
     # For now, assume character wants to re-enlist
@@ -366,6 +393,8 @@ def term_reenlistment():
     char_data['reenlistment_succeeded'] = result in ['approved', 'mandatory']
     # If re-enlistment succeeded, increment terms served and age
     if result in ['approved', 'mandatory']:
+        # Keep the finished term's skill rolls; the reset below would lose them
+        char_data['last_term_skills'] = term_skills(char_data)
         char_data['terms_served'] = char_data.get('terms_served', 0) + 1
         char_data['age'] = age + 4
         # Reset term completion flags for next term
@@ -375,24 +404,20 @@ def term_reenlistment():
         char_data['last_survival'] = {}
         char_data['last_commission'] = {}
         char_data['last_promotion'] = {}
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
-    return jsonify({
+    return {
         'result': result,
         'succeeded': result in ['approved', 'mandatory'],
         'terms_served': char_data.get('terms_served', 0),
         'age': char_data.get('age', 18)
-    })
-
+    }
 
+@app.route('/term_reenlistment', methods=['POST'])
+@character_endpoint
+def term_reenlistment(char_data):
+    return jsonify(resolve_reenlistment(char_data))
 
-@app.route('/character_status', methods=['GET'])
-def character_status():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+def character_status_data(char_data):
+    """Permanent record and last rolls, as the UI displays them"""
     # Build UPP string in pseudo-hex
     characteristics = char_data.get('characteristics', {})
     upp_order = ['strength', 'dexterity', 'endurance', 'intelligence', 'education', 'social']
@@ -400,7 +425,7 @@ def character_status():
         hex(characteristics.get(attr, 0))[2:].upper() if characteristics.get(attr) is not None else '-'
         for attr in upp_order
     ])
-    return jsonify({
+    return {
         'name': char_data.get('name'),
         'service': char_data.get('service'),
         'rank': char_data.get('rank'),
@@ -419,16 +444,17 @@ def character_status():
         'last_promotion': char_data.get('last_promotion', {}),
         'last_reenlistment': char_data.get('last_reenlistment', ''),
         # Add any other fields you want to display
-    })
+    }
 
-@app.route('/calculate_term_skills', methods=['POST'])
-def calculate_term_skills():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
-    
+@app.route('/character_status', methods=['GET'])
+@character_endpoint
+def character_status(char_data):
+    return jsonify(character_status_data(char_data))
+
+def term_skills(char_data):
+    """Skill rolls earned by this term's outcomes; before its survival roll, the last term's (reads char_data only)"""
+    if not char_data.get('survival_completed', False) and 'last_term_skills' in char_data:
+        return char_data['last_term_skills']
     service = char_data.get('service')
     characteristics = char_data.get('characteristics', {})
     terms_served = char_data.get('terms_served', 0)
@@ -500,41 +526,116 @@ def calculate_term_skills():
     if characteristics.get('education', 0) >= 8:
         available_tables.append('advanced_education')
     
-    # Save to character data
-    char_data['skill_tables'] = available_tables
-    char_data['remaining_skills'] = total_skills
-    char_data['skill_breakdown'] = skill_breakdown
-    
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
-    
-    return jsonify({
+    return {
         'available_tables': available_tables,
         'remaining_skills': total_skills,
         'skill_breakdown': skill_breakdown
+    }
+
+# State revision -> term_skills() result; revisions are never reused, so entries never go stale
+_skills_cache = OrderedDict()
+_skills_cache_lock = threading.Lock()
+
+def cached_term_skills(char_data):
+    """term_skills(), computed once per state revision"""
+    revision = char_data.get('revision')
+    with _skills_cache_lock:
+        skills = _skills_cache.get(revision)
+        if skills is not None:
+            _skills_cache.move_to_end(revision)
+            return skills
+    skills = term_skills(char_data)
+    if revision is not None:
+        with _skills_cache_lock:
+            _skills_cache[revision] = skills
+            while len(_skills_cache) > store.capacity:
+                _skills_cache.popitem(last=False)
+    return skills
+
+def calculate_skills(char_data):
+    """term_skills(), recorded as the skill rolls /term_skill hands out"""
+    # Not cached: the caller may have changed the state without a new revision yet
+    skills = term_skills(char_data)
+    char_data['skill_tables'] = list(skills['available_tables'])
+    char_data['remaining_skills'] = skills['remaining_skills']
+    char_data['skill_breakdown'] = dict(skills['skill_breakdown'])
+    return skills
+
+@app.route('/calculate_term_skills', methods=['POST'])
+@character_endpoint
+def calculate_term_skills(char_data):
+    return jsonify(calculate_skills(char_data))
+
+# Steps /term/resolve can run, in the order a term takes them
+TERM_STEPS = {
+    'survival': resolve_survival,
+    'commission': resolve_commission,
+    'promotion': resolve_promotion,
+    'reenlistment': resolve_reenlistment,
+}
+
+@app.route('/term/resolve', methods=['POST'])
+@character_endpoint
+def resolve_term(char_data):
+    """Run the requested term steps (default: all) in order and return the whole updated state at once"""
+    data = request.get_json(silent=True) or {}
+    steps = data.get('steps', list(TERM_STEPS))
+    if not isinstance(steps, list) or any(step not in TERM_STEPS for step in steps):
+        return jsonify({'error': f"steps must be a list of: {', '.join(TERM_STEPS)}"}), 400
+    results = {}
+    for step, resolve in TERM_STEPS.items():
+        if step not in steps:
+            continue
+        # An injured or dead character's term ends at the survival roll
+        if step != 'survival' and char_data.get('last_survival', {}).get('outcome', 'survived') != 'survived':
+            results[step] = {'skipped': 'did not survive the term'}
+        elif step == 'commission' and char_data.get('is_commissioned', False):
+            results[step] = {'skipped': 'already commissioned'}
+        else:
+            results[step] = resolve(char_data)
+    calculate_skills(char_data)
+    stamp_revision(char_data)
+    return jsonify({
+        'steps': list(results),  # the order they ran in (JSON objects lose it)
+        'results': results,
+        **ui_state_data(char_data),
     })
 
+def ui_state_data(char_data):
+    """Everything the UI renders, at the state's revision"""
+    return {
+        'revision': char_data.get('revision', 0),
+        'status': character_status_data(char_data),
+        'term': term_info_data(char_data),
+        'buttons': button_status_data(char_data),
+        'skills': cached_term_skills(char_data),
+    }
+
+@app.route('/ui_state', methods=['GET'])
+@character_endpoint
+def ui_state(char_data):
+    """ui_state_data() with the revision as ETag; 304 with no body if the client already has it"""
+    revision = str(char_data.get('revision', 0))
+    if request.if_none_match.contains(revision):
+        return '', 304, {'ETag': f'"{revision}"', 'Cache-Control': 'no-cache'}
+    response = jsonify(ui_state_data(char_data))
+    response.set_etag(revision)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/available_skill_tables', methods=['GET'])
-def available_skill_tables():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
+@character_endpoint
+def available_skill_tables(char_data):
     return jsonify({
         'available_tables': char_data.get('skill_tables', []),
         'remaining_skills': char_data.get('remaining_skills', 0)
     })
 
 @app.route('/term_skill', methods=['POST'])
-def term_skill():
-    json_path = 'current_character.json'
-    if not os.path.exists(json_path):
-        return jsonify({'error': 'No character found'}), 400
+@character_endpoint
+def term_skill(char_data):
     data = request.get_json()
     table_name = data.get('table')
-    with open(json_path, 'r') as f:
-        char_data = json.load(f)
     service = char_data.get('service')
     characteristics = char_data.get('characteristics', {})
     # Map to short keys for skill rolling
@@ -565,10 +666,19 @@ def term_skill():
     if table_name in skill_tables:
         skill_tables.remove(table_name)
     char_data['skill_tables'] = skill_tables
-    # Save updated character data
-    with open(json_path, 'w') as f:
-        json.dump(char_data, f)
     return jsonify(skill_result if skill_result else {'skill': None, 'error': 'Skill roll not implemented'})
 
+@app.route('/library', methods=['POST'])
+@character_endpoint
+def save_to_library(char_data):
+    return jsonify({'id': library().save(char_data)})
+
+@app.route('/library/<int:character_id>', methods=['GET'])
+def get_from_library(character_id):
+    char_data = library().get(character_id)
+    if char_data is None:
+        return jsonify({'error': 'No such character'}), 404
+    return jsonify(char_data)
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
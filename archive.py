@@ -0,0 +1,238 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import rules
+from character_generator import Character
+from compact_character import CompactCharacter, dictionary
+
+# Append-only, memory-mapped archive of generated characters.
+#
+# An archive is two files. PATH holds a fixed 64-byte header, a JSON metadata
+# block, the zlib dictionary and then the records, each a uint32 length and a
+# CompactCharacter.to_bytes() record. The metadata is the skill table catalog
+# (rules.SKILL_TABLE_CATALOG) and its version, stored once per archive, so
+# skill table ids in the records resolve against the tables they were rolled
+# on even after the rules change. The shared compression dictionary is
+# generated by the engine and changes with it, so the archive keeps its own
+# copy; when the running one differs, blobs are recompressed between the two.
+# PATH.idx holds a 16-byte header followed by one uint64 offset into PATH per
+# record, so character i is found with a single index read. A writer appends
+# records, flushes them, and only then appends their offsets: readers take the
+# record count from the size of the index, never see a half-written record and
+# take no locks. Records are decoded only when accessed.
+
+MAGIC = b'TRVARCH\0'
+INDEX_MAGIC = b'TRVINDX\0'
+VERSION = 3
+INDEX_SUFFIX = '.idx'
+
+# magic, format version, reserved, CRC-32 of the archive's dictionary, metadata size, dictionary size
+_HEADER = struct.Struct('<8sHHIII40x')
+# magic, format version, reserved, dictionary CRC-32 (ties the index to its PATH)
+_INDEX_HEADER = struct.Struct('<8sHHI')
+_LENGTH = struct.Struct('<I')
+_OFFSET = struct.Struct('<Q')
+
+# Records buffered per write by ArchiveWriter.extend()
+WRITE_BATCH = 4096
+
+
+def _check_header(header, magic, path):
+    found, version = header[:2]
+    if found != magic:
+        raise ValueError(f"{path} is not a character archive")
+    if version != VERSION:
+        raise ValueError(f"{path} is archive version {version}, expected {VERSION}")
+
+
+def _metadata():
+    return json.dumps({
+        'skill_table_catalog_version': rules.SKILL_TABLE_CATALOG_VERSION,
+        'skill_table_catalog': rules.skill_table_catalog_to_json(),
+    }, separators=(',', ':')).encode()
+
+
+def _read_header(f, path):
+    """Check PATH's header; returns its metadata and its compression dictionary"""
+    header = _HEADER.unpack(f.read(_HEADER.size))
+    _check_header(header, MAGIC, path)
+    metadata = json.loads(f.read(header[4]))
+    zdict = f.read(header[5])
+    if zlib.crc32(zdict) != header[3]:
+        raise ValueError(f"{path} has a damaged compression dictionary")
+    return metadata, zdict
+
+
+def _check_index(f, path, zdict):
+    header = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+    _check_header(header, INDEX_MAGIC, path)
+    if header[3] != zlib.crc32(zdict):
+        raise ValueError(f"{path} belongs to a different archive")
+
+
+def _foreign(zdict):
+    """zdict if records made with it need recompressing for this process, else None"""
+    return None if zdict == dictionary() else zdict
+
+
+def _compact(character):
+    """CompactCharacter for a CompactCharacter, Character or to_json() dict"""
+    if isinstance(character, CompactCharacter):
+        return character
+    if isinstance(character, Character):
+        return CompactCharacter.from_character(character)
+    return CompactCharacter.from_json(character)
+
+
+class ArchiveWriter:
+    """Appends characters to an archive, creating it if needed"""
+
+    def __init__(self, path):
+        self.path = path
+        index_path = path + INDEX_SUFFIX
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            metadata, zdict = _metadata(), dictionary()
+            with open(path, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, 0, zlib.crc32(zdict), len(metadata), len(zdict))
+                        + metadata + zdict)
+            with open(index_path, 'wb') as f:
+                f.write(_INDEX_HEADER.pack(INDEX_MAGIC, VERSION, 0, zlib.crc32(zdict)))
+        else:
+            with open(path, 'rb') as f:
+                metadata, zdict = _read_header(f, path)
+            # New records refer to the current skill tables, so they must match the archive's catalog
+            if metadata['skill_table_catalog_version'] != rules.SKILL_TABLE_CATALOG_VERSION:
+                raise ValueError(f"{path} was written with different skill tables")
+            with open(index_path, 'rb') as f:
+                _check_index(f, index_path, zdict)
+            # Drop a partly written offset left by an interrupted writer
+            entries = (os.path.getsize(index_path) - _INDEX_HEADER.size) // _OFFSET.size
+            os.truncate(index_path, _INDEX_HEADER.size + entries * _OFFSET.size)
+        # New records are compressed with the archive's dictionary
+        self._zdict = _foreign(zdict)
+        self._data = open(path, 'ab')
+        self._index = open(index_path, 'ab')
+        # Bytes after the last indexed record (from an interrupted writer) are never referenced
+        self._end = self._data.seek(0, os.SEEK_END)
+        self.count = (self._index.seek(0, os.SEEK_END) - _INDEX_HEADER.size) // _OFFSET.size
+
+    def append(self, character):
+        """Append one character (Character, to_json() dict or CompactCharacter) and return its id"""
+        return self.extend((character,)).start
+
+    def extend(self, characters):
+        """Append characters in buffered writes and return the range of their ids"""
+        first = self.count
+        records, offsets = [], []
+        for character in characters:
+            record = _compact(character).to_bytes(self._zdict)
+            records += (_LENGTH.pack(len(record)), record)
+            offsets.append(_OFFSET.pack(self._end))
+            self._end += _LENGTH.size + len(record)
+            if len(offsets) == WRITE_BATCH:
+                self._write(records, offsets)
+                records, offsets = [], []
+        if offsets:
+            self._write(records, offsets)
+        return range(first, self.count)
+
+    def _write(self, records, offsets):
+        # Records must reach the file before the offsets that make them visible
+        self._data.write(b''.join(records))
+        self._data.flush()
+        self._index.write(b''.join(offsets))
+        self._index.flush()
+        self.count += len(offsets)
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Archive:
+    """Read-only memory-mapped archive; archive[i] decodes only character i"""
+
+    def __init__(self, path):
+        self.path = path
+        self._data_file = open(path, 'rb')
+        self._index_file = open(path + INDEX_SUFFIX, 'rb')
+        metadata, zdict = _read_header(self._data_file, path)
+        _check_index(self._index_file, path + INDEX_SUFFIX, zdict)
+        self._zdict = _foreign(zdict)
+        # The skill tables the archived characters were rolled on, keyed by table id
+        self.skill_table_catalog_version = metadata['skill_table_catalog_version']
+        self.skill_table_catalog = rules.skill_table_catalog_from_json(metadata['skill_table_catalog'])
+        self._data = self._index = None
+        self.count = 0
+        self.refresh()
+
+    def refresh(self):
+        """Map records appended since the archive was opened; returns the new count"""
+        # Size the index first: every offset in it points at data already written
+        index_size = os.fstat(self._index_file.fileno()).st_size
+        count = (index_size - _INDEX_HEADER.size) // _OFFSET.size
+        if count != self.count or self._data is None:
+            self._unmap()
+            self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.count = count
+        return count
+
+    def _unmap(self):
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+
+    def __len__(self):
+        return self.count
+
+    def record(self, i):
+        """The raw to_bytes() record of character i"""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(f"Character {i} is not in the archive ({self.count} characters)")
+        offset, = _OFFSET.unpack_from(self._index, _INDEX_HEADER.size + i * _OFFSET.size)
+        length, = _LENGTH.unpack_from(self._data, offset)
+        start = offset + _LENGTH.size
+        return self._data[start:start + length]
+
+    def __getitem__(self, i):
+        """Character i as a CompactCharacter"""
+        return CompactCharacter.from_bytes(self.record(i), self._zdict)
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def to_json(self, i):
+        """Character i as the to_json() dict it was archived from"""
+        return self[i].to_json()
+
+    def character(self, i):
+        """Character i as a full Character"""
+        return Character.from_json(self.to_json(i))
+
+    def resolve_skill_roll(self, detail):
+        """rules.resolve_skill_roll() against this archive's skill tables"""
+        return rules.resolve_skill_roll(detail, self.skill_table_catalog)
+
+    def close(self):
+        self._unmap()
+        self._data = self._index = None
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
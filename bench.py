@@ -0,0 +1,128 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+
+import rules
+from character_generator import ENGINE_VERSION, Character, generate_batch
+from instrumentation import PHASES, Instrumentation
+
+# Throughput benchmark for the character engine.
+#
+# Every scenario (each career, death rule off and on) generates the same
+# seeded characters each run. End-to-end throughput is the best of several
+# uninstrumented runs of generation plus to_json(); per-phase costs come from
+# one more run under an instrumentation.Instrumentation. Runs are
+# appended to a JSON history file and compared with a baseline run, so a
+# throughput drop beyond the threshold can fail a build.
+
+BENCH_SEED = 'bench'
+DEFAULT_COUNT = 300
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10  # a scenario regresses if it gets this much slower
+DEFAULT_HISTORY = 'bench_history.json'
+
+
+def scenarios():
+    """(name, service_choice, death_rule_enabled) for every benchmarked combination"""
+    return [(f"{career}/death-{'on' if death else 'off'}", career, death)
+            for career in Character.get_available_careers() for death in (False, True)]
+
+
+def _generate(count, career, death):
+    return list(generate_batch(count, seed=BENCH_SEED, service_choice=career, death_rule_enabled=death,
+                               output_format='object'))
+
+
+def bench_scenario(career, death, count=DEFAULT_COUNT, repeat=DEFAULT_REPEAT):
+    """Throughput and per-phase microseconds per character for one scenario"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for c in _generate(count, career, death):
+            c.to_json()
+        best = min(best, time.perf_counter() - start)
+
+    with Instrumentation() as instrumentation:
+        start = time.perf_counter()
+        characters = _generate(count, career, death)
+        generation = time.perf_counter() - start
+        for c in characters:
+            c.to_json()
+
+    seconds = instrumentation.phase_seconds
+    phases = {phase: total / count * 1e6 for phase, total in seconds.items()}
+    # Generation time outside the timed phases: term bookkeeping, logging, names
+    phases['other'] = (generation - sum(seconds.values()) + seconds['to_json']) / count * 1e6
+    return {
+        'chars_per_sec': count / best,
+        'us_per_char': best / count * 1e6,
+        'phases_us': {phase: round(us, 2) for phase, us in phases.items()},
+    }
+
+
+def run_bench(count=DEFAULT_COUNT, repeat=DEFAULT_REPEAT, progress=None):
+    """Benchmark every scenario; returns one history entry"""
+    results = {}
+    for name, career, death in scenarios():
+        results[name] = bench_scenario(career, death, count, repeat)
+        if progress:
+            progress(name, results[name])
+    total_us = sum(r['us_per_char'] for r in results.values())
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'engine_version': ENGINE_VERSION,
+        'rules_hash': rules.RULES_HASH,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'count': count,
+        'repeat': repeat,
+        'chars_per_sec': len(results) / total_us * 1e6,
+        'results': results,
+    }
+
+
+def load_history(path):
+    """Runs recorded in a history file, oldest first ([] if it does not exist)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def append_history(path, run):
+    """Add a run to a history file, replacing the file atomically"""
+    history = load_history(path) + [run]
+    temp = f'{path}.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(temp, path)
+    return history
+
+
+def compare(run, baseline, threshold=DEFAULT_THRESHOLD):
+    """[(scenario, baseline chars/s, current chars/s, relative change)] for scenarios slower by more than threshold"""
+    regressions = []
+    for name, result in run['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        change = result['chars_per_sec'] / before['chars_per_sec'] - 1
+        if change < -threshold:
+            regressions.append((name, before['chars_per_sec'], result['chars_per_sec'], change))
+    return regressions
+
+
+def format_run(run, baseline=None):
+    """Text table of a run, with the change against baseline if given"""
+    phases = list(PHASES) + ['other']
+    lines = [f"{'scenario':<22}{'chars/s':>9}{'vs base':>9}  " + ' '.join(f'{p[:11]:>11}' for p in phases)]
+    for name, result in run['results'].items():
+        before = baseline and baseline['results'].get(name)
+        change = f"{result['chars_per_sec'] / before['chars_per_sec'] - 1:+.1%}" if before else '-'
+        lines.append(f"{name:<22}{result['chars_per_sec']:>9.0f}{change:>9}  "
+                     + ' '.join(f"{result['phases_us'][p]:>11.1f}" for p in phases))
+    lines.append(f"Overall: {run['chars_per_sec']:.0f} chars/s (phase columns in us per character)")
+    return '\n'.join(lines)
@@ -0,0 +1,389 @@
+from itertools import product
+from math import prod
+
+import numpy as np
+
+from rules import ENLISTMENT_BONUSES, SURVIVAL_BONUSES, Career
+from population_engine import (
+    STATS, CAREERS, SKILL_NAMES, SKILL_TABLE_CODES,
+    ENLISTMENT_TARGET, SURVIVAL_TARGET, REENLISTMENT_TARGET,
+    COMMISSION_TARGET, COMMISSION_MOD_STAT, COMMISSION_MOD_REQ,
+    PROMOTION_TARGET, PROMOTION_MOD_STAT, PROMOTION_MOD_REQ, MAX_RANK,
+    CASH_TABLE, BENEFIT_TABLE, BENEFIT_ITEMS, AGEING_PHASES,
+)
+
+# Exact outcome distributions for the career loop of generate_character.
+#
+# A career is a Markov chain over (rank, drafted, gambling level, relevant
+# characteristics), where a characteristic is relevant if the survival,
+# commission or promotion roll or the EDU 8+ skill table compares it against a
+# threshold. The chain is held as a dense probability tensor with one axis per
+# state component and advanced term by term, so results have zero variance.
+# Drafted only matters for the first term's commission roll, so it is carried
+# as a separate tensor for that term instead of an axis.
+
+# Probability of each 2d6 total
+P_2D6 = {total: (6 - abs(total - 7)) / 36 for total in range(2, 13)}
+_P_AT_LEAST = {target: sum(p for total, p in P_2D6.items() if total >= target) for target in range(2, 13)}
+
+# Most skill gambling can usefully reach: d6 + 6 always hits the top cash row
+MAX_GAMBLING = 6
+# Headroom kept above the highest requirement for characteristics that ageing
+# can lower; falling back below a requirement from there takes more ageing
+# losses than any career survives with non-negligible probability
+AGEING_HEADROOM = 12
+
+# Tensor axes: rank, gambling, then one per tracked characteristic
+RANK_AXIS, GAMBLING_AXIS, FIRST_STAT_AXIS = 0, 1, 2
+
+
+def p_at_least(target):
+    """Probability that 2d6 >= target"""
+    if target <= 2:
+        return 1.0
+    return _P_AT_LEAST.get(target, 0.0)
+
+
+class _CareerRules:
+    """The rule parameters one career's chain needs, as plain Python values"""
+
+    def __init__(self, career):
+        i = CAREERS.index(career)
+        self.career = career
+        self.index = i
+        (self.survival_stat, (self.survival_req, self.survival_bonus)), = SURVIVAL_BONUSES[Career.parse(career)].items()
+        self.survival_target = int(SURVIVAL_TARGET[i])
+        self.commission_target = int(COMMISSION_TARGET[i])
+        self.commission_stat = STATS[COMMISSION_MOD_STAT[i]]
+        self.commission_req = int(COMMISSION_MOD_REQ[i])
+        self.promotion_target = int(PROMOTION_TARGET[i])
+        self.promotion_stat = STATS[PROMOTION_MOD_STAT[i]]
+        self.promotion_req = int(PROMOTION_MOD_REQ[i])
+        self.max_rank = int(MAX_RANK[i])
+        self.reenlistment_target = int(REENLISTMENT_TARGET[i])
+
+        reqs = {'edu': [8]}
+        reqs.setdefault(self.survival_stat, []).append(self.survival_req)
+        if self.commission_target:
+            reqs.setdefault(self.commission_stat, []).append(self.commission_req)
+            reqs.setdefault(self.promotion_stat, []).append(self.promotion_req)
+        self.tracked = tuple(reqs)
+        self.axis = {stat: FIRST_STAT_AXIS + k for k, stat in enumerate(self.tracked)}
+
+        results = [SKILL_NAMES[c] if c >= 0 else f"+1 {STATS[-c - 1]}" for c in SKILL_TABLE_CODES[i].ravel()]
+        raised = {r.split()[1] for r in results if r.startswith('+1')}
+        if career == 'Navy':
+            raised.add('soc')  # Automatic +1 SOC at ranks 5 and 6
+        self.tracks_gambling = 'Gambling' in results
+
+        # Largest value kept per characteristic; higher values land in the top bin.
+        # A characteristic that never falls is equivalent to its highest requirement
+        # once it reaches it; one that never rises is bounded by the 2d6 maximum.
+        ageing_stats = {STATS[stat] for start, end, checks in AGEING_PHASES for stat, target, loss in checks}
+        self.caps = {}
+        for stat in self.tracked:
+            if stat not in ageing_stats:
+                self.caps[stat] = max(reqs[stat])
+            elif stat not in raised:
+                self.caps[stat] = 12
+            else:
+                self.caps[stat] = max(reqs[stat]) + AGEING_HEADROOM
+
+        self.shape = (self.max_rank + 1, MAX_GAMBLING + 1 if self.tracks_gambling else 1) + \
+            tuple(self.caps[stat] + 1 for stat in self.tracked)
+
+        # One skill roll as [(axis it raises or None, weight along the EDU axis)]
+        edu = np.arange(self.caps['edu'] + 1)
+        effects = {}
+        for num_tables in (3, 4):
+            for table in range(num_tables):
+                for code in SKILL_TABLE_CODES[i, table]:
+                    if code < 0 and STATS[-code - 1] in self.axis:
+                        axis = self.axis[STATS[-code - 1]]
+                    elif code >= 0 and SKILL_NAMES[code] == 'Gambling':
+                        axis = GAMBLING_AXIS
+                    else:
+                        axis = None
+                    weight = effects.setdefault(axis, np.zeros(edu.size))
+                    # advanced_education (the 4th table) is only on offer with EDU 8+
+                    weight += np.where((edu >= 8) == (num_tables == 4), 1 / (6 * num_tables), 0)
+        self.skill_effects = [(axis, self.along('edu', weight)) for axis, weight in effects.items()]
+
+    def along(self, stat, vector):
+        """Reshape a per-value vector so it broadcasts along a characteristic's axis"""
+        shape = [1] * len(self.shape)
+        shape[self.axis[stat]] = -1
+        return np.asarray(vector, dtype=float).reshape(shape)
+
+    def threshold_probability(self, stat, target, req, bonus=1):
+        """P(2d6 + (bonus if stat >= req) >= target) for every value of a characteristic"""
+        values = range(self.caps[stat] + 1)
+        return self.along(stat, [p_at_least(target - (bonus if v >= req else 0)) for v in values])
+
+
+class CareerOutcome:
+    """Exact outcome distribution for characters who serve in one career"""
+
+    def __init__(self, career, probability):
+        self.career = career
+        self.probability = probability  # P(serving in this career)
+        self.outcome = {}               # 'died' / 'injured' / 'discharged' -> p
+        self.terms_served = {}          # terms (x.5 for injury) -> p
+        self.final_rank = {}            # rank -> p
+        self.mustering_out_rolls = {}   # number of rolls -> p
+        self.cash = {}                  # total mustering-out cash -> p
+        self.expected_benefits = {}     # benefit -> expected count
+        self.truncated = 0.0            # probability mass still serving after max_terms
+
+    def probability_rank_at_least(self, rank):
+        """P(final rank >= rank)"""
+        return sum(p for r, p in self.final_rank.items() if r >= rank)
+
+    @property
+    def expected_cash(self):
+        return sum(amount * p for amount, p in self.cash.items())
+
+    @property
+    def expected_terms(self):
+        return sum(terms * p for terms, p in self.terms_served.items())
+
+    def to_json(self):
+        """Convert to a JSON-friendly dict"""
+        return {
+            'career': self.career,
+            'probability': self.probability,
+            'outcome': self.outcome,
+            'terms_served': {str(k): v for k, v in sorted(self.terms_served.items())},
+            'final_rank': {str(k): v for k, v in sorted(self.final_rank.items())},
+            'mustering_out_rolls': {str(k): v for k, v in sorted(self.mustering_out_rolls.items())},
+            'expected_cash': self.expected_cash,
+            'expected_terms': self.expected_terms,
+            'expected_benefits': self.expected_benefits,
+            'truncated': self.truncated,
+        }
+
+
+def _add(dist, key, p):
+    dist[key] = dist.get(key, 0.0) + p
+
+
+def _initial_tensors(service_choice, rules):
+    """Starting (enlisted, drafted) distributions for one career after an enlistment attempt in service_choice"""
+    bonuses = ENLISTMENT_BONUSES[Career.parse(service_choice)]
+    target = int(ENLISTMENT_TARGET[CAREERS.index(service_choice)])
+    enlisted = np.zeros(rules.shape)
+    drafted = np.zeros(rules.shape)
+
+    # Tracked characteristics need exact values; the others only matter
+    # through whether they meet an enlistment requirement
+    stats = tuple(dict.fromkeys(rules.tracked + tuple(bonuses)))
+    options = []
+    for stat in stats:
+        if stat in rules.axis:
+            options.append(list(P_2D6.items()))
+        else:
+            req = bonuses[stat][0]
+            options.append([(req, p_at_least(req)), (0, 1 - p_at_least(req))])
+
+    for combo in product(*options):
+        values = dict(zip(stats, (v for v, p in combo)))
+        p = prod(pv for v, pv in combo)
+        modifier = sum(bonus for stat, (req, bonus) in bonuses.items() if values[stat] >= req)
+        p_enlist = p_at_least(target - modifier)
+        index = tuple(min(values[stat], rules.caps[stat]) for stat in rules.tracked)
+        if rules.career == service_choice:
+            enlisted[(0, 0) + index] += p * p_enlist
+        # Drafted into a random career (which may be the one applied for)
+        drafted[(0, 0) + index] += p * (1 - p_enlist) / len(CAREERS)
+    return enlisted, drafted
+
+
+def _shift_down(dist, axis, amount):
+    """Lower the component on axis by amount (floored at zero)"""
+    result = np.zeros_like(dist)
+    index = [slice(None)] * dist.ndim
+    for value in range(dist.shape[axis]):
+        source, dest = list(index), list(index)
+        source[axis], dest[axis] = value, max(0, value - amount)
+        result[tuple(dest)] += dist[tuple(source)]
+    return result
+
+
+def _raise(dist, axis):
+    """Raise the component on axis by one (clamped to the top bin)"""
+    result = np.zeros_like(dist)
+    lower, upper, top = ([slice(None)] * dist.ndim for _ in range(3))
+    lower[axis], upper[axis], top[axis] = slice(None, -1), slice(1, None), -1
+    result[tuple(upper)] = dist[tuple(lower)]
+    result[tuple(top)] += dist[tuple(top)]
+    return result
+
+
+def _apply_ageing(rules, dist, age):
+    """Apply the ageing checks for the age just reached"""
+    for start, end, checks in AGEING_PHASES:
+        if age < start or (end is not None and age > end):
+            continue
+        for stat_index, target, loss in checks:
+            axis = rules.axis.get(STATS[stat_index])
+            if axis is not None:
+                p_loss = 1 - p_at_least(target)
+                dist = dist * (1 - p_loss) + _shift_down(dist, axis, loss) * p_loss
+    return dist
+
+
+def _roll_skills(rules, dist, num_skills):
+    """Apply num_skills skill rolls"""
+    for _ in range(num_skills):
+        rolled = np.zeros_like(dist)
+        for axis, weight in rules.skill_effects:
+            rolled += dist * weight if axis is None else _raise(dist * weight, axis)
+        dist = rolled
+    return dist
+
+
+def _promote(rules, dist):
+    """Split dist into (not promoted, promoted) after the promotion roll"""
+    promoted = np.zeros_like(dist)
+    if not rules.commission_target:
+        return dist, promoted
+    p = rules.threshold_probability(rules.promotion_stat, rules.promotion_target, rules.promotion_req)[0]
+    stay = dist.copy()
+    for rank in range(1, rules.max_rank):
+        promoted[rank + 1] = dist[rank] * p
+        stay[rank] = dist[rank] * (1 - p)
+    if rules.career == 'Navy':
+        # Automatic +1 SOC on reaching ranks 5 and 6
+        promoted[5:7] = _raise(promoted[5:7], rules.axis['soc'])
+    return stay, promoted
+
+
+def _run_chain(rules, enlisted, drafted, death_rule_enabled, max_terms, tolerance):
+    """Propagate one career's chain; return {(outcome, terms_half, rank, gambling): p} and truncated mass"""
+    finals = {}
+    survival = rules.threshold_probability(rules.survival_stat, rules.survival_target,
+                                           rules.survival_req, rules.survival_bonus)
+    if rules.commission_target:
+        commission = rules.threshold_probability(rules.commission_stat, rules.commission_target,
+                                                 rules.commission_req)[0]
+    stat_axes = tuple(range(FIRST_STAT_AXIS, len(rules.shape)))
+    p_continue = p_at_least(min(12, rules.reenlistment_target))
+
+    def record(outcome, terms_half, mass):
+        for (rank, gambling), p in np.ndenumerate(mass.sum(axis=stat_axes)):
+            if p:
+                _add(finals, (outcome, terms_half, rank, gambling), float(p))
+
+    dist = enlisted + drafted
+    for term in range(max_terms):
+        # Survival
+        if death_rule_enabled:
+            record('died', 2 * term, dist * (1 - survival))
+        else:
+            record('injured', 2 * term + 1, dist * (1 - survival))
+        dist = dist * survival
+
+        # Complete the term and apply ageing
+        terms = term + 1
+        dist = _apply_ageing(rules, dist, 18 + 4 * terms)
+
+        # Commission (never while drafted), then promotion
+        commissioned = np.zeros_like(dist)
+        if rules.commission_target:
+            eligible = dist[0]
+            if drafted is not None:
+                eligible = eligible - _apply_ageing(rules, drafted * survival, 18 + 4 * terms)[0]
+            commissioned[1] = eligible * commission
+            dist[0] = dist[0] - commissioned[1]
+        # Continuing past the first term clears the drafted flag
+        drafted = None
+        plain, promoted = _promote(rules, dist)
+        commissioned_only, commissioned_promoted = _promote(rules, commissioned)
+
+        # Skill rolls, plus one for each of commission and promotion. Rolls are
+        # linear and commute, so the extra ones are folded in from the inside out.
+        num_skills = 2 if rules.career == 'Scouts' or terms == 1 else 1
+        extra = _roll_skills(rules, commissioned_promoted, 1)
+        extra = _roll_skills(rules, promoted + commissioned_only + extra, 1)
+        dist = _roll_skills(rules, plain + extra, num_skills)
+
+        # Reenlistment: 12 always continues, otherwise roll the career target
+        record('discharged', 2 * terms, dist * (1 - p_continue))
+        dist = dist * p_continue
+        if dist.sum() < tolerance:
+            break
+
+    return finals, float(dist.sum())
+
+
+def _mustering_out(rules, outcome, finals):
+    """Fill mustering-out rolls, cash and benefit distributions from final states"""
+    cash_cache = {}
+    for (result, terms_half, rank, gambling), p in finals.items():
+        total_rolls = terms_half // 2 + (3 if rank >= 5 else 2 if rank >= 3 else 1 if rank >= 1 else 0)
+        _add(outcome.mustering_out_rolls, total_rolls, p)
+        cash_rolls = min(3, total_rolls)
+        benefit_rolls = total_rolls - cash_rolls
+        rank_bonus = 1 if rank >= 5 else 0
+
+        key = (cash_rolls, rank_bonus, gambling)
+        if key not in cash_cache:
+            cash = {0: 1.0}
+            for _ in range(cash_rolls):
+                rolled = {}
+                for amount, pa in cash.items():
+                    for d6 in range(1, 7):
+                        value = int(CASH_TABLE[rules.index, min(7, d6 + rank_bonus + gambling) - 1])
+                        _add(rolled, amount + value, pa / 6)
+                cash = rolled
+            cash_cache[key] = cash
+        for amount, pa in cash_cache[key].items():
+            _add(outcome.cash, amount, p * pa)
+
+        for d6 in range(1, 7):
+            code = int(BENEFIT_TABLE[rules.index, min(7, d6 + rank_bonus) - 1])
+            if code >= 0:
+                benefit = BENEFIT_ITEMS[code]
+            elif code <= -10:
+                benefit = f"{STATS[-code // 10 - 1].upper()} +{-code % 10}"
+            else:
+                continue
+            _add(outcome.expected_benefits, benefit, p * benefit_rolls / 6)
+
+
+def career_outcomes(service_choice=None, death_rule_enabled=False, max_terms=60, tolerance=1e-12):
+    """Exact outcome distributions per career for characters attempting to enlist in service_choice.
+
+    service_choice=None averages over a random choice of service, as
+    generate_character does. Returns {career: CareerOutcome}; each outcome's
+    distributions are conditional on serving in that career. A career stops
+    being followed once less than tolerance of its probability is still serving.
+    """
+    if service_choice is not None and Career.get(service_choice) is None:
+        raise ValueError(f"Invalid career '{service_choice}'")
+    if service_choice is not None:
+        service_choice = Career.parse(service_choice).label
+    choices = [service_choice] if service_choice else list(CAREERS)
+
+    outcomes = {}
+    for career in CAREERS:
+        rules = _CareerRules(career)
+        enlisted, drafted = np.zeros(rules.shape), np.zeros(rules.shape)
+        for choice in choices:
+            e, d = _initial_tensors(choice, rules)
+            enlisted += e / len(choices)
+            drafted += d / len(choices)
+        total = float(enlisted.sum() + drafted.sum())
+        if not total:
+            continue
+        finals, truncated = _run_chain(rules, enlisted / total, drafted / total,
+                                       death_rule_enabled, max_terms, tolerance)
+        outcome = CareerOutcome(career, total)
+        outcome.truncated = truncated
+        for (result, terms_half, rank, gambling), p in finals.items():
+            _add(outcome.outcome, result, p)
+            _add(outcome.terms_served, terms_half / 2 if terms_half % 2 else terms_half // 2, p)
+            _add(outcome.final_rank, rank, p)
+        _mustering_out(rules, outcome, finals)
+        outcomes[career] = outcome
+    return outcomes
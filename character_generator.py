@@ -1,7 +1,26 @@
 import random
 import json
+import os
 from typing import Literal
 
+import dice
+import rules
+from codes import EventType, labelled
+from event_store import EventStore
+from rules import Benefit, Career, Skill, SkillLevels, SkillTable
+
+# generation_log verbosity: 'off' records nothing, 'summary' only the events
+# that change the character (enlistment result, commission, promotion, death,
+# injury, status change, ageing losses, mustering out), 'full' every roll and check
+LOG_LEVELS = ('off', 'summary', 'full')
+LOG_OFF, LOG_SUMMARY, LOG_FULL = range(len(LOG_LEVELS))
+
+# Bump whenever a change makes a seed produce a different character (recipe.py relies on it)
+ENGINE_VERSION = 1
+
+# The enabled instrumentation.Instrumentation, if any (hot paths only test it against None)
+_instrumentation = None
+
 
 def set_random_seed(seed=None):
     """Set a random seed for reproducible results during testing"""
@@ -15,24 +34,64 @@ def set_random_seed(seed=None):
         print("Using random seed based on current time")
 
 class Character:
-    def __init__(self):
+    def __init__(self, rng=None, log_level='full'):
+        # Dice source: anything with randint(a, b) and choice(seq); defaults to the global random module
+        self.rng = rng if rng is not None else random
+        if _instrumentation is not None:
+            self.rng = _instrumentation.dice(self.rng)
+        if log_level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{log_level}'. Available: {', '.join(LOG_LEVELS)}")
+        self.log_level = log_level
+        # Call sites compare against LOG_SUMMARY/LOG_FULL before building an event
+        self.log_verbosity = LOG_LEVELS.index(log_level)
         self.age = 18  # Starting age (Traveller standard)
         self.terms_served: int | float = 0
         self.characteristics = {}
-        self.career : Literal["Navy", "Marines", "Army", "Scouts", "Merchants", "Others"] | None = None
-        self.name = self.get_random_name()
+        self.career: Career | None = None
+        self.name = self.get_random_name(self.rng)
         self.career_history = []
-        self.skills = {}  # Dict of skill_name: level
+        self.skills = SkillLevels()  # Dict of Skill (or an unlisted skill's name): level; names work as keys
         self.mustering_out_benefits = {'cash': 0, 'items': []}
-        self.ageing_log = []  # List of dicts: {'term': int, 'age': int, 'effects': [str]}
-        self.term_log = []  # List of dicts: {'term': int, 'age': int, 'skills': [(table, result)], 'ageing': [str]}
-        self.skill_acquisition_log = []  # List of dicts: {'term': int, 'event': str, 'skill': str, 'level': int}
         self.automatic_skills_granted = set()  # Track which automatic skills have been granted
         self.commissioned = False  # Officer status
         self.rank = 0  # 0 = enlisted, 1+ = officer ranks
         self.drafted = False  # Track if drafted in first term
         self.promotions = 0  # Number of promotions (after commission)
-        self.generation_log = []  # Track all generation events for JSON output
+        self.died = False  # Killed in service (death rule); recorded whatever the log level
+        # Every event, skill gain and ageing result; the logs below are views of it
+        self.events = EventStore()
+
+    @property
+    def generation_log(self):
+        """List of dicts: {'event_type': EventType, 'term': int, 'age': int, 'data': dict}"""
+        return self.events.generation_log()
+
+    @property
+    def ageing_log(self):
+        """List of dicts: {'term': int, 'age': int, 'effects': [str]}"""
+        return self.events.ageing_log()
+
+    @property
+    def term_log(self):
+        """List of dicts: {'term': int, 'age': int, 'skills': [(table, result)], 'ageing': [str]}"""
+        return self.events.term_log()
+
+    @property
+    def skill_acquisition_log(self):
+        """List of dicts: {'term': int, 'event': str, 'table': SkillTable, 'roll': int | None, 'skill': Skill | str, 'level': int, 'description': str}"""
+        return self.events.skill_acquisition_log()
+
+    def events_for_term(self, term):
+        """generation_log entries logged with this term number, without scanning the others"""
+        return self.events.generation_log(term=term)
+
+    def state_at_term(self, term):
+        """Age, rank, commission, characteristics and skills at the end of a term (None if not recorded)"""
+        return self.events.state_at(term)
+
+    def record_term_state(self):
+        """Checkpoint the character for state_at_term() at the end of the current term"""
+        self.events.state(self.terms_served, self.age, self.rank, self.commissioned, self.characteristics, self.skills)
 
     def complete_term(self):
         """Complete a 4-year term of service"""
@@ -42,28 +101,16 @@ class Character:
         # Check for ageing effects
         ageing_effects = self.check_ageing()
         if ageing_effects:
-            self.ageing_log.append({
-                'term': self.terms_served,  # The term just completed
-                'age': self.age,
-                'effects': ageing_effects
-            })
-            # Log ageing event in generation log
-            self.log_event('ageing', {
-                'term': self.terms_served,
-                'age': self.age,
-                'effects': ageing_effects
-            })
-        # Add ageing effects to the latest term_log entry (if any)
-        if self.term_log and self.term_log[-1]['term'] == self.terms_served:
-            self.term_log[-1]['ageing'] = ageing_effects
+            # One record serves ageing_log, term_log and (from 'summary' up) the 'ageing' event
+            self.events.ageing(self.terms_served, self.age, ageing_effects, self.log_verbosity >= LOG_SUMMARY)
 
     def get_age(self):
         return self.age
 
     def check_ageing(self):
         """Check for ageing effects when crossing age thresholds"""
-        ageing_thresholds = [34, 38, 42, 46, 50, 54, 58, 62]
-        advanced_ageing_start = 66
+        ageing_thresholds = rules.AGEING_THRESHOLDS
+        advanced_ageing_start = rules.ADVANCED_AGEING_AGE
     
         # Check which thresholds we've crossed this term
         previous_age = self.age - 4
@@ -73,84 +120,91 @@ class Character:
         checks_performed = []  # Track all checks performed
 
         # Log the ageing check start
-        self.log_event('ageing_check_start', {
-            'term': self.terms_served,
-            'previous_age': previous_age,
-            'current_age': current_age,
-            'age_increase': 4
-        })
+        if self.log_verbosity >= LOG_FULL:
+            self.log_event(EventType.AGEING_CHECK_START, {
+                'term': self.terms_served,
+                'previous_age': previous_age,
+                'current_age': current_age,
+                'age_increase': 4
+            })
 
         # Check standard thresholds (34 - 62)
         for threshold in ageing_thresholds:
             if previous_age < threshold <= current_age:
 #               print(f"\n⏰ Ageing check at age {threshold}:")
                 # Log that we're performing an ageing check
-                self.log_event('ageing_threshold_check', {
-                    'age': threshold,
-                    'previous_age': previous_age,
-                    'current_age': current_age,
-                    'phase': 'standard',
-                    'threshold_crossed': True
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_THRESHOLD_CHECK, {
+                        'age': threshold,
+                        'previous_age': previous_age,
+                        'current_age': current_age,
+                        'phase': 'standard',
+                        'threshold_crossed': True
+                    })
                 checks_performed.append(threshold)
                 effects = self.apply_ageing_effects(threshold)
                 ageing_effects.extend(effects)
             else:
                 # Log that this threshold was not crossed
-                self.log_event('ageing_threshold_check', {
-                    'age': threshold,
-                    'previous_age': previous_age,
-                    'current_age': current_age,
-                    'phase': 'standard',
-                    'threshold_crossed': False,
-                    'reason': f'Threshold {threshold} not crossed (previous_age={previous_age}, current_age={current_age})'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_THRESHOLD_CHECK, {
+                        'age': threshold,
+                        'previous_age': previous_age,
+                        'current_age': current_age,
+                        'phase': 'standard',
+                        'threshold_crossed': False,
+                        'reason': f'Threshold {threshold} not crossed (previous_age={previous_age}, current_age={current_age})'
+                    })
 
         # Check advanced ageing (66+)
         if current_age >= advanced_ageing_start:
-            for age in range(max(66, ((previous_age // 4) + 1) * 4), current_age + 1, 4):
+            for age in range(max(advanced_ageing_start, ((previous_age // 4) + 1) * 4), current_age + 1, 4):
                 if age >= advanced_ageing_start:
 #                   print(f"\n⚰️  Advanced ageing check at age {age}:")
                     # Log that we're performing an advanced ageing check
-                    self.log_event('ageing_threshold_check', {
-                        'age': age,
-                        'previous_age': previous_age,
-                        'current_age': current_age,
-                        'phase': 'advanced',
-                        'threshold_crossed': True
-                    })
+                    if self.log_verbosity >= LOG_FULL:
+                        self.log_event(EventType.AGEING_THRESHOLD_CHECK, {
+                            'age': age,
+                            'previous_age': previous_age,
+                            'current_age': current_age,
+                            'phase': 'advanced',
+                            'threshold_crossed': True
+                        })
                     checks_performed.append(age)
                     effects = self.apply_advanced_ageing_effects(age)
                     ageing_effects.extend(effects)
         else:
             # Log that advanced ageing was not reached
-            self.log_event('ageing_threshold_check', {
-                'age': advanced_ageing_start,
-                'previous_age': previous_age,
-                'current_age': current_age,
-                'phase': 'advanced',
-                'threshold_crossed': False,
-                'reason': f'Advanced ageing not reached (current_age={current_age} < {advanced_ageing_start})'
-            })
+            if self.log_verbosity >= LOG_FULL:
+                self.log_event(EventType.AGEING_THRESHOLD_CHECK, {
+                    'age': advanced_ageing_start,
+                    'previous_age': previous_age,
+                    'current_age': current_age,
+                    'phase': 'advanced',
+                    'threshold_crossed': False,
+                    'reason': f'Advanced ageing not reached (current_age={current_age} < {advanced_ageing_start})'
+                })
 
         # Log if no ageing checks were performed this term
         if not checks_performed:
-            self.log_event('ageing_threshold_check', {
-                'age': current_age,
-                'previous_age': previous_age,
-                'current_age': current_age,
-                'phase': 'none',
-                'threshold_crossed': False,
-                'note': 'No ageing thresholds crossed this term'
-            })
+            if self.log_verbosity >= LOG_FULL:
+                self.log_event(EventType.AGEING_THRESHOLD_CHECK, {
+                    'age': current_age,
+                    'previous_age': previous_age,
+                    'current_age': current_age,
+                    'phase': 'none',
+                    'threshold_crossed': False,
+                    'note': 'No ageing thresholds crossed this term'
+                })
 
         # Log the ageing check completion
-        self.log_event('ageing_check_complete', {
-            'term': self.terms_served,
-            'checks_performed': checks_performed,
-            'ageing_effects': ageing_effects,
-            'total_effects': len(ageing_effects)
-        })
+        if self.log_verbosity >= LOG_FULL:
+            self.log_event(EventType.AGEING_CHECK_COMPLETE, {
+                'term': self.terms_served,
+                'checks_performed': checks_performed,
+                'ageing_effects': ageing_effects,
+                'total_effects': len(ageing_effects)
+            })
 
         return ageing_effects
 
@@ -158,19 +212,15 @@ class Character:
         """Apply ageing effects at a specific age"""
         effects = []
 
-        if age in [34, 38, 42, 46]:
+        if age in rules.AGEING_PHASE_1_AGES:
             # Phase 1: Early ageing
-            checks = [
-                ('str', 8, 1), ('dex', 7, 1), ('end', 8, 1)
-            ]
-        elif age in [50, 54, 58, 62]:
-            # Phase 2: Advanced ageing  
-            checks = [
-                ('str', 9, 1), ('dex', 8, 1), ('end', 9, 1)  # Using 'end' to match your existing code
-            ]
+            checks = rules.AGEING_PHASE_1_CHECKS
+        elif age in rules.AGEING_PHASE_2_AGES:
+            # Phase 2: Advanced ageing
+            checks = rules.AGEING_PHASE_2_CHECKS
         
         for stat, target, loss in checks:
-            roll = self.roll_2d6()
+            roll = self.roll_2d6(self.rng)
             if roll < target:
                 old_value = self.characteristics[stat]
                 self.characteristics[stat] = max(0, self.characteristics[stat] - loss)  # Prevent negative
@@ -178,29 +228,31 @@ class Character:
 #               print(f"  {stat.upper()}: Roll {roll} < {target} → Lost {actual_loss} point(s) ({old_value} → {self.characteristics[stat]})")
                 effects.append(f"-{actual_loss} {stat.upper()}")
                 # Log individual ageing check
-                self.log_event('ageing_check', {
-                    'age': age,
-                    'stat': stat.upper(),
-                    'roll': roll,
-                    'target': target,
-                    'old_value': old_value,
-                    'new_value': self.characteristics[stat],
-                    'loss': actual_loss,
-                    'phase': 'standard'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_CHECK, {
+                        'age': age,
+                        'stat': stat.upper(),
+                        'roll': roll,
+                        'target': target,
+                        'old_value': old_value,
+                        'new_value': self.characteristics[stat],
+                        'loss': actual_loss,
+                        'phase': 'standard'
+                    })
             else:
 #               print(f"  {stat.upper()}: Roll {roll} ≥ {target} → No loss")
                 # Log individual ageing check (no loss)
-                self.log_event('ageing_check', {
-                    'age': age,
-                    'stat': stat.upper(),
-                    'roll': roll,
-                    'target': target,
-                    'old_value': self.characteristics[stat],
-                    'new_value': self.characteristics[stat],
-                    'loss': 0,
-                    'phase': 'standard'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_CHECK, {
+                        'age': age,
+                        'stat': stat.upper(),
+                        'roll': roll,
+                        'target': target,
+                        'old_value': self.characteristics[stat],
+                        'new_value': self.characteristics[stat],
+                        'loss': 0,
+                        'phase': 'standard'
+                    })
         
         return effects
 
@@ -209,12 +261,10 @@ class Character:
         effects = []
         
         # Advanced ageing affects STR, DEX, END, and INT
-        checks = [
-            ('str', 9, 2), ('dex', 9, 2), ('end', 9, 2), ('int', 9, 1)
-        ]
+        checks = rules.ADVANCED_AGEING_CHECKS
         
         for stat, target, loss in checks:
-            roll = self.roll_2d6()
+            roll = self.roll_2d6(self.rng)
             if roll < target:
                 old_value = self.characteristics[stat]
                 self.characteristics[stat] = max(0, self.characteristics[stat] - loss)  # Prevent negative
@@ -222,29 +272,31 @@ class Character:
 #                print(f"  {stat.upper()}: Roll {roll} < {target} → Lost {actual_loss} point(s) ({old_value} → {self.characteristics[stat]})")
                 effects.append(f"-{actual_loss} {stat.upper()}")
                 # Log individual advanced ageing check
-                self.log_event('ageing_check', {
-                    'age': age,
-                    'stat': stat.upper(),
-                    'roll': roll,
-                    'target': target,
-                    'old_value': old_value,
-                    'new_value': self.characteristics[stat],
-                    'loss': actual_loss,
-                    'phase': 'advanced'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_CHECK, {
+                        'age': age,
+                        'stat': stat.upper(),
+                        'roll': roll,
+                        'target': target,
+                        'old_value': old_value,
+                        'new_value': self.characteristics[stat],
+                        'loss': actual_loss,
+                        'phase': 'advanced'
+                    })
             else:
 #                print(f"  {stat.upper()}: Roll {roll} ≥ {target} → No loss")
                 # Log individual advanced ageing check (no loss)
-                self.log_event('ageing_check', {
-                    'age': age,
-                    'stat': stat.upper(),
-                    'roll': roll,
-                    'target': target,
-                    'old_value': self.characteristics[stat],
-                    'new_value': self.characteristics[stat],
-                    'loss': 0,
-                    'phase': 'advanced'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.AGEING_CHECK, {
+                        'age': age,
+                        'stat': stat.upper(),
+                        'roll': roll,
+                        'target': target,
+                        'old_value': self.characteristics[stat],
+                        'new_value': self.characteristics[stat],
+                        'loss': 0,
+                        'phase': 'advanced'
+                    })
         
         return effects
 
@@ -252,15 +304,14 @@ class Character:
         return self.terms_served
 
     @staticmethod
-    def roll_2d6():
+    def roll_2d6(rng=random):
         """Roll 2d6 (standard Traveller dice mechanic)"""
-        return random.randint(1, 6) + random.randint(1, 6)
+        return rng.randint(1, 6) + rng.randint(1, 6)
 
     @staticmethod
-    def generate_characteristics():
+    def generate_characteristics(rng=random):
         """Generate the six basic characteristics"""
-        characteristics_order = ['str', 'dex', 'end', 'int', 'edu', 'soc']
-        return {attr: Character.roll_2d6() for attr in characteristics_order}
+        return {attr: Character.roll_2d6(rng) for attr in rules.STATS}
 
     @staticmethod
     def convert_characteristics_to_hex(characteristics):
@@ -274,46 +325,29 @@ class Character:
     def create_hex_string(hex_values):
         """Create UPP (Universal Personality Profile) string"""
         # Use the correct order: STR, DEX, END, INT, EDU, SOC
-        characteristic_order = ['str', 'dex', 'end', 'int', 'edu', 'soc']
-        return ''.join(hex_values[attr] for attr in characteristic_order)
+        return ''.join(hex_values[attr] for attr in rules.STATS)
 
     # --- CAREER LOGIC ---
 
     @staticmethod
     def get_available_careers() -> list[Literal["Navy", "Marines", "Army", "Scouts", "Merchants", "Others"]]:
         """Return list of available careers"""
-        return ['Navy', 'Marines', 'Army', 'Scouts', 'Merchants', 'Others']
+        return [career.label for career in rules.CAREERS]
 
     @staticmethod
-    def get_random_career():
+    def get_random_career(rng=random):
         """Get a random career for testing"""
-        return random.choice(Character.get_available_careers())
+        return rng.choice(rules.CAREERS).label
 
     @staticmethod
     def enlistment_roll(service_choice):
         """Get the target number for enlistment in a career"""
-        career_dict = {
-            'Navy': 8,
-            'Marines': 9,
-            'Army': 5,
-            'Scouts': 7,
-            'Merchants': 7,
-            'Others': 3
-        }
-        return career_dict.get(service_choice, 5)
+        return rules.ENLISTMENT_TARGET.get(Career.get(service_choice), rules.DEFAULT_ENLISTMENT_TARGET)
 
     @staticmethod
     def get_career_bonuses(service_choice):
         """Get characteristic requirements and bonuses for enlistment"""
-        career_choice_bonuses = {
-            'Navy': {'int': (8, 1), 'edu': (9, 2)},
-            'Marines': {'int': (8, 1), 'str': (8, 2)},
-            'Army': {'dex': (6, 1), 'end': (5, 2)},
-            'Scouts': {'int': (6, 1), 'str': (8, 2)},
-            'Merchants': {'str': (7, 1), 'int': (6, 2)},
-            'Others': {}
-        }
-        return career_choice_bonuses.get(service_choice, {})
+        return rules.ENLISTMENT_BONUSES.get(Career.get(service_choice), rules.NO_BONUSES)
 
     @staticmethod
     def get_career_choice_modifiers(characteristics, service_choice):
@@ -325,65 +359,49 @@ class Character:
         )
 
     @staticmethod
-    def attempt_enlistment(characteristics, service_choice) -> tuple[Literal["Navy", "Marines", "Army", "Scouts", "Merchants", "Others"], str, int, int, int]:
-    # existing code...
-        """Attempt to enlist in chosen career"""
+    def attempt_enlistment(characteristics, service_choice, rng=random) -> tuple[Literal["Navy", "Marines", "Army", "Scouts", "Merchants", "Others"], str, int, int, int]:
+        """Attempt to enlist in chosen career (a Career or its name)"""
+        service_choice = Career.parse(service_choice)
         required_roll = Character.enlistment_roll(service_choice)
-        enlistment_roll = Character.roll_2d6()
+        enlistment_roll = Character.roll_2d6(rng)
         modifier = Character.get_career_choice_modifiers(characteristics, service_choice)
         successful = enlistment_roll + modifier >= required_roll
 
         if successful:
             enlistment_status = 'enlisted'
-            career = service_choice
+            career = service_choice.label
         else:
             enlistment_status = 'drafted'
-            career = Character.get_draft_career()
+            career = Character.get_draft_career(rng)
 
         return career, enlistment_status, required_roll, enlistment_roll, modifier
 
     @staticmethod
-    def get_draft_career():
+    def get_draft_career(rng=random):
         """Get randomly assigned career when enlistment fails"""
-        return random.choice(Character.get_available_careers()) 
+        return rng.choice(rules.CAREERS).label
 
     # --- SURVIVAL LOGIC ---
 
     @staticmethod
     def survival_roll(career):
         """Get the target number for survival in a career"""
-        survival_dict = {
-            'Navy': 5,
-            'Marines': 6,
-            'Army': 5,
-            'Scouts': 7,
-            'Merchants': 5,
-            'Others': 5
-        }
-
-        if career not in survival_dict:
+        career = Career.get(career, career)
+        if career not in rules.SURVIVAL_TARGET:
             print(f"WARNING: Unknown career '{career}' in survival_roll")
 
-        return survival_dict.get(career, 5)
+        return rules.SURVIVAL_TARGET.get(career, rules.DEFAULT_SURVIVAL_TARGET)
 
     @staticmethod
     def survival_bonuses(career):
         """Get characteristic requirements and bonuses for survival"""
-        survival_bonuses = {
-            'Navy': {'int': (7, 2)},
-            'Marines': {'end': (8, 2)},
-            'Army': {'edu': (6, 2)},
-            'Scouts': {'end': (9, 2)},
-            'Merchants': {'int': (7, 2)},
-            'Others': {'int': (9, 2)}
-        }
-        return survival_bonuses.get(career, {})
+        return rules.SURVIVAL_BONUSES.get(Career.get(career), rules.NO_BONUSES)
 
     @staticmethod
-    def check_survival_detailed(career, characteristics, death_rule_enabled=False):
+    def check_survival_detailed(career, characteristics, death_rule_enabled=False, rng=random):
         """Check if character survives the term with detailed roll information"""
         required_roll = Character.survival_roll(career)
-        roll = Character.roll_2d6()
+        roll = Character.roll_2d6(rng)
         bonus = 0
         bonus_details = []
 
@@ -409,39 +427,31 @@ class Character:
         return result
 
     @staticmethod
-    def check_commission_detailed(career, characteristics):
+    def _characteristic_modifier(modifiers, career, characteristics):
+        """Return (+1 or 0, details) for a career's {career: (stat, requirement)} roll modifier"""
+        if career not in modifiers:
+            return 0, []
+        stat, req = modifiers[career]
+        value = characteristics.get(stat, 0)
+        if value >= req:
+            return 1, [f"{stat.upper()} {value}≥{req} (+1)"]
+        return 0, []
+
+    @staticmethod
+    def check_commission_detailed(career, characteristics, rng=random):
         """Check if character receives commission with detailed roll information"""
-        if career in ['Scouts', 'Others']:
+        career = Career.get(career, career)
+        if career in (Career.SCOUTS, Career.OTHERS):
             return {
                 'applicable': False,
                 'reason': f'{career} does not have commissions'
             }
             
-        commission_target = {
-            'Navy': 10,
-            'Marines': 9,
-            'Army': 5,
-            'Merchants': 4
-        }
-        
-        roll = Character.roll_2d6()
-        target = commission_target.get(career, 12)
+        roll = Character.roll_2d6(rng)
+        target = rules.COMMISSION_TARGET.get(career, 12)
         
         # Add modifiers based on characteristics
-        modifier = 0
-        modifier_details = []
-        if career == 'Navy' and characteristics.get('soc', 0) >= 9:
-            modifier += 1
-            modifier_details.append(f"SOC {characteristics.get('soc', 0)}≥9 (+1)")
-        elif career == 'Marines' and characteristics.get('edu', 0) >= 7:
-            modifier += 1
-            modifier_details.append(f"EDU {characteristics.get('edu', 0)}≥7 (+1)")
-        elif career == 'Army' and characteristics.get('end', 0) >= 7:
-            modifier += 1
-            modifier_details.append(f"END {characteristics.get('end', 0)}≥7 (+1)")
-        elif career == 'Merchants' and characteristics.get('int', 0) >= 9:
-            modifier += 1
-            modifier_details.append(f"INT {characteristics.get('int', 0)}≥9 (+1)")
+        modifier, modifier_details = Character._characteristic_modifier(rules.COMMISSION_MODIFIER, career, characteristics)
             
         total = roll + modifier
         success = total >= target
@@ -459,10 +469,10 @@ class Character:
         return result
 
     @staticmethod
-    def check_survival(career, characteristics, death_rule_enabled=False):
+    def check_survival(career, characteristics, death_rule_enabled=False, output_format='text', rng=random):
         """Check if character survives the term"""
         required_roll = Character.survival_roll(career)
-        roll = Character.roll_2d6()
+        roll = Character.roll_2d6(rng)
         bonus = 0
 
         bonuses = Character.survival_bonuses(career)
@@ -474,34 +484,29 @@ class Character:
         survived = total >= required_roll
 
         if survived:
-            print(f"❤️  [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → SURVIVED")
+            if output_format == 'text':
+                print(f"❤️  [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → SURVIVED")
             return 'survived'
         else:
             if death_rule_enabled:
-                print(f"💀 [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → DIED")
+                if output_format == 'text':
+                    print(f"💀 [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → DIED")
                 return 'died'
             else:
-                print(f"🩹 [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → INJURED")
+                if output_format == 'text':
+                    print(f"🩹 [SURVIVAL] {career} | Roll: {roll}+{bonus}={total} (need {required_roll}) → INJURED")
                 return 'injured'
 
     @staticmethod
     def reenlistment_roll(career):
         """Get the target number for reenlistment"""
-        reenlistment_targets = {
-            'Navy': 6,
-            'Marines': 6,
-            'Army': 7,
-            'Scouts': 3,
-            'Merchants': 4,
-            'Others': 5
-        }
-        return reenlistment_targets.get(career, 5)
+        return rules.REENLISTMENT_TARGET.get(Career.get(career), rules.DEFAULT_REENLISTMENT_TARGET)
 
     @staticmethod
-    def attempt_reenlistment(career, age, preference='reenlist'):
+    def attempt_reenlistment(career, age, preference='reenlist', output_format='text', rng=random):
         """Attempt to reenlist for another term with character preference"""
         target = Character.reenlistment_roll(career)
-        roll = Character.roll_2d6()
+        roll = Character.roll_2d6(rng)
     
         # Determine outcome based on preference and roll
         if roll == 12:
@@ -531,7 +536,8 @@ class Character:
                 continue_career = False
     
     # Print the result
-        print(f"🔄 [REENLISTMENT] {career} | {preference} | Roll: {roll} (need {target}) → {status_text}")
+        if output_format == 'text':
+            print(f"🔄 [REENLISTMENT] {career} | {preference} | Roll: {roll} (need {target}) → {status_text}")
     
     # Return values that match what the main loop expects
         if continue_career:
@@ -540,7 +546,7 @@ class Character:
             return 'denied'
 
     @staticmethod
-    def get_random_name():
+    def get_random_name(rng=random):
         """Generate a random sci-fi name"""
         sci_fi_names = [
             "Zara Xylo", "Orion Pax", "Nova Kin", "Elexis Vortex",
@@ -549,7 +555,7 @@ class Character:
             "Aurora Hyperdrive", "Cassius Meteor", "Astra Comet", "Kaius Eclipse",
             "Seren Andromeda", "Altair Nebular", "Selene Astraeus", "Maximus Ion"
         ]
-        return random.choice(sci_fi_names)
+        return rng.choice(sci_fi_names)
 
     def add_career_term(self, career, term_number, partial_term=False):
         """Add a career term to history"""
@@ -562,8 +568,10 @@ class Character:
             'partial_term': partial_term
         })
 
-    def add_skill(self, skill_name, levels=1, reason='term', table='automatic', roll=None, description='Skill gain', term_override=None):
-        """Add or increase a skill with logging"""
+    def add_skill(self, skill_name, levels=1, reason='term', table=SkillTable.AUTOMATIC, roll=None, description='Skill gain', term_override=None):
+        """Add or increase a skill (a Skill or its name) with logging; unlisted names are kept as strings"""
+        skill_name = Skill.get(skill_name, skill_name)
+        table = SkillTable.get(table, table)
         if skill_name in self.skills:
             self.skills[skill_name] += levels
         else:
@@ -576,115 +584,64 @@ class Character:
         """Log a skill acquisition with full metadata"""
         # Use provided term or current term (enlistment skills go in term 1)
         term = term_override if term_override is not None else self.terms_served
-        
-        self.skill_acquisition_log.append({
-            'term': term,
-            'event': reason,
-            'table': table,
-            'roll': roll,
-            'skill': skill,
-            'level': modifier,
-            'description': description
-        })
+        self.events.skill(term, reason, table, roll, skill, modifier, description)
 
     # --- SKILL TABLES ---
     
     @staticmethod
     def get_skill_tables(career):
-        """Get all skill tables for a career"""
-        # Personal Development tables (same structure for all careers, values differ)
-        personal_development = {
-            'Navy': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: '+1 INT', 5: '+1 EDU', 6: '+1 SOC'},
-            'Marines': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Gambling', 5: 'Brawling', 6: 'Blade Combat'},
-            'Army': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Gambling', 5: '+1 EDU', 6: 'Brawling'},
-            'Scouts': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: '+1 INT', 5: '+1 EDU', 6: 'Gun Combat'},
-            'Merchants': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Blade Combat', 5: 'Bribery', 6: '+1 INT'},
-            'Others': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Blade Combat', 5: 'Brawling', 6: '+1 SOC'}
-        }
-        
-        # Service Skills
-        service_skills = {
-            'Navy': {1: 'Ship\'s Boat', 2: 'Vacc Suit', 3: 'Forward Observer', 4: 'Gunnery', 5: 'Blade Combat', 6: 'Gun Combat'},
-            'Marines': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Blade Combat', 4: 'Gun Combat', 5: 'Blade Combat', 6: 'Gun Combat'},
-            'Army': {1: 'Vehicle', 2: 'Air/Raft', 3: 'Gun Combat', 4: 'Forward Observer', 5: 'Blade Combat', 6: 'Gun Combat'},
-            'Scouts': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Mechanical', 4: 'Navigation', 5: 'Electronics', 6: 'Jack-o-T'},
-            'Merchants': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Jack-o-T', 4: 'Steward', 5: 'Electronics', 6: 'Gun Combat'},
-            'Others': {1: 'Vehicle', 2: 'Gambling', 3: 'Brawling', 4: 'Bribery', 5: 'Blade Combat', 6: 'Gun Combat'}
-        }
-        
-        # Advanced (Specialist) Skills
-        advanced = {
-            'Navy': {1: 'Vacc Suit', 2: 'Mechanical', 3: 'Electronics', 4: 'Engineering', 5: 'Gunnery', 6: 'Computer'},
-            'Marines': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Tactics', 5: 'Blade Combat', 6: 'Gun Combat'},
-            'Army': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Tactics', 5: 'Blade Combat', 6: 'Gun Combat'},
-            'Scouts': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Jack-o-T', 5: 'Gunnery', 6: 'Medical'},
-            'Merchants': {1: 'Streetwise', 2: 'Mechanical', 3: 'Electronics', 4: 'Navigation', 5: 'Engineering', 6: 'Computer'},
-            'Others': {1: 'Streetwise', 2: 'Mechanical', 3: 'Electronics', 4: 'Gambling', 5: 'Brawling', 6: 'Forgery'}
-        }
-        
-        # Advanced Education (EDU 8+)
-        advanced_education = {
-            'Navy': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Admin'},
-            'Marines': {1: 'Medical', 2: 'Tactics', 3: 'Tactics', 4: 'Computer', 5: 'Leader', 6: 'Admin'},
-            'Army': {1: 'Medical', 2: 'Tactics', 3: 'Tactics', 4: 'Computer', 5: 'Leader', 6: 'Admin'},
-            'Scouts': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Jack-o-T'},
-            'Merchants': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Admin'},
-            'Others': {1: 'Medical', 2: 'Forgery', 3: 'Electronics', 4: 'Computer', 5: 'Streetwise', 6: 'Jack-o-T'}
-        }
-        
-        return {
-            'personal': personal_development,
-            'service': service_skills,
-            'advanced': advanced,
-            'advanced_education': advanced_education
-        }
-    
+        """Get all skill tables ({table name: {career name: {d6: result}}}); the career argument is kept for callers"""
+        return rules.SKILL_TABLES
+    
+    def _apply_skill_result(self, career, table, roll, reason):
+        """Apply the result of a d6 roll on a skill table: a skill level or a +1 characteristic"""
+        result = rules.SKILL_RESULTS[career][table][roll - 1]
+        if type(result) is str:
+            # Characteristic increase
+            if result in self.characteristics:
+                self.characteristics[result] += 1
+                self.log_skill_acquisition(reason, table, roll, f'+1 {result.upper()}', 1, 'Characteristic boost')
+        else:
+            # Skill gain
+            self.add_skill(result, 1, reason, table, roll, 'Skill gain')
+
     def roll_for_skills_detailed(self, career, num_skills=2, reason='term'):
         """Roll for skills during a term with detailed logging and return results"""
-        tables = self.get_skill_tables(career)
-        skill_rolls_this_term = []
+        career = Career.parse(career)
+        tables = rules.SKILL_TABLES
+        table_ids = rules.SKILL_TABLE_IDS[career]
         detailed_rolls = []
         
         for i in range(num_skills):
-            # All characters may roll on personal, service, and advanced
-            available_tables = ['personal', 'service', 'advanced']
-            # Only add advanced_education if EDU >= 8
-            if self.characteristics.get('edu', 0) >= 8:
-                available_tables.append('advanced_education')
+            # All characters may roll on personal, service, and advanced;
+            # advanced_education only with EDU >= 8
+            if self.characteristics.get('edu', 0) >= rules.ADVANCED_EDUCATION_MIN_EDU:
+                available_tables = rules.SKILL_TABLE_NAMES
+            else:
+                available_tables = rules.BASIC_SKILL_TABLES
             
             # Choose a random table
-            chosen_table = random.choice(available_tables)
-            table = tables[chosen_table][career]
+            chosen_table = self.rng.choice(available_tables)
+            table = tables[chosen_table.label][career.label]
             
             # Roll on the table
-            roll = random.randint(1, 6)
-            result = table.get(roll, 'No skill')
+            roll = self.rng.randint(1, 6)
+            result = table[roll]
             
-            # Record detailed roll information
+            # Record detailed roll information; rules.resolve_skill_roll() adds the table back
             roll_detail = {
                 'roll_number': i + 1,
                 'table': chosen_table,
                 'roll': roll,
                 'result': result,
-                'table_contents': table
+                'table_id': table_ids[chosen_table]
             }
             detailed_rolls.append(roll_detail)
             
-            skill_rolls_this_term.append((chosen_table, result))
-            
-            # Apply the result
-            if result.startswith('+1'):
-                # Characteristic increase
-                stat = result.split()[1].lower()
-                if stat in self.characteristics:
-                    self.characteristics[stat] += 1
-                    self.log_skill_acquisition(reason, chosen_table, roll, f'+1 {stat.upper()}', 1, 'Characteristic boost')
-            else:
-                # Skill gain
-                self.add_skill(result, 1, reason, chosen_table, roll, 'Skill gain')
+            self._apply_skill_result(career, chosen_table, roll, reason)
         
-        # Store skill rolls for this term in term_log
-        self.term_log.append({'term': self.terms_served, 'age': self.age, 'skills': skill_rolls_this_term, 'ageing': []})
+        # Close this batch of rolls (a term_log entry)
+        self.events.rolls(self.terms_served, self.age)
         
         return detailed_rolls
 
@@ -710,7 +667,7 @@ class Character:
         
         if self.skills:
             print(f"\nFinal Skills:")
-            for skill, level in sorted(self.skills.items()):
+            for skill, level in sorted(self.skills.items(), key=lambda item: str(item[0])):
                 print(f"  {skill}-{level}")
         else:
             print(f"\nNo skills acquired")
@@ -742,7 +699,7 @@ class Character:
                 boosts = self.mustering_out_benefits['characteristic_boosts']
                 print(f"  Characteristic Boosts: {', '.join(f'{k.upper()} +{v}' for k, v in boosts.items())}")
             if self.mustering_out_benefits.get('items'):
-                print(f"  Items: {', '.join(self.mustering_out_benefits['items'])}")
+                print(f"  Items: {', '.join(map(str, self.mustering_out_benefits['items']))}")
             else:
                 print(f"  Items: None")
         
@@ -750,47 +707,37 @@ class Character:
 
     def grant_automatic_enlistment_skill(self, career, output_format='text'):
         """Grant automatic skill on enlistment or draft, only once per character"""
-        if career == 'Army' and 'army_enlist' not in self.automatic_skills_granted:
-            self.add_skill('Rifle', 1, 'enlistment', 'automatic', None, f'{career} basic training', term_override=1)
-            self.automatic_skills_granted.add('army_enlist')
-            # Display skills acquired this term
-            self.display_current_term_skills(output_format)
-        elif career == 'Marines' and 'marines_enlist' not in self.automatic_skills_granted:
-            self.add_skill('Cutlass', 1, 'enlistment', 'automatic', None, f'{career} basic training', term_override=1)
-            self.automatic_skills_granted.add('marines_enlist')
-            # Display skills acquired this term
-            self.display_current_term_skills(output_format)
-        elif career == 'Scouts' and 'scouts_enlist' not in self.automatic_skills_granted:
-            self.add_skill('Pilot', 1, 'enlistment', 'automatic', None, f'{career} basic training', term_override=1)
-            self.automatic_skills_granted.add('scouts_enlist')
+        career = Career.parse(career)
+        key = f'{career.label.lower()}_enlist'
+        if career in rules.ENLISTMENT_SKILL and key not in self.automatic_skills_granted:
+            self.add_skill(rules.ENLISTMENT_SKILL[career], 1, 'enlistment', SkillTable.AUTOMATIC, None, f'{career} basic training', term_override=1)
+            self.automatic_skills_granted.add(key)
             # Display skills acquired this term
             self.display_current_term_skills(output_format)
 
     def grant_automatic_commission_skill(self, career, output_format='text'):
         """Grant automatic skill on commission, only once per character"""
-        if career == 'Army' and 'army_commission' not in self.automatic_skills_granted:
-            self.add_skill('SMG', 1, 'commission', 'automatic', None, f'{career} commission')
-            self.automatic_skills_granted.add('army_commission')
-            # Display skills acquired this term
-            self.display_current_term_skills(output_format)
-        elif career == 'Marines' and 'marines_commission' not in self.automatic_skills_granted:
-            self.add_skill('Revolver', 1, 'commission', 'automatic', None, f'{career} commission')
-            self.automatic_skills_granted.add('marines_commission')
+        career = Career.parse(career)
+        key = f'{career.label.lower()}_commission'
+        if career in rules.COMMISSION_SKILL and key not in self.automatic_skills_granted:
+            self.add_skill(rules.COMMISSION_SKILL[career], 1, 'commission', SkillTable.AUTOMATIC, None, f'{career} commission')
+            self.automatic_skills_granted.add(key)
             # Display skills acquired this term
             self.display_current_term_skills(output_format)
 
     def grant_automatic_rank_skill(self, career, rank, output_format='text'):
         """Grant automatic skill for specific ranks, only once per character/rank"""
-        if career == 'Merchants' and rank == 4 and 'merchants_rank4' not in self.automatic_skills_granted:
-            self.add_skill('Pilot', 1, f'rank_{rank}', 'automatic', None, f'Merchant rank {rank}')
+        career = Career.get(career, career)
+        if career == Career.MERCHANTS and rank == 4 and 'merchants_rank4' not in self.automatic_skills_granted:
+            self.add_skill(Skill.PILOT, 1, f'rank_{rank}', SkillTable.AUTOMATIC, None, f'Merchant rank {rank}')
             self.automatic_skills_granted.add('merchants_rank4')
-        elif career == 'Navy' and rank == 5 and 'navy_rank5' not in self.automatic_skills_granted:
+        elif career == Career.NAVY and rank == 5 and 'navy_rank5' not in self.automatic_skills_granted:
             self.characteristics['soc'] += 1
-            self.log_skill_acquisition(f'rank_{rank}', 'automatic', None, '+1 SOC', 1, f'Navy rank {rank}')
+            self.log_skill_acquisition(f'rank_{rank}', SkillTable.AUTOMATIC, None, '+1 SOC', 1, f'Navy rank {rank}')
             self.automatic_skills_granted.add('navy_rank5')
-        elif career == 'Navy' and rank == 6 and 'navy_rank6' not in self.automatic_skills_granted:
+        elif career == Career.NAVY and rank == 6 and 'navy_rank6' not in self.automatic_skills_granted:
             self.characteristics['soc'] += 1
-            self.log_skill_acquisition(f'rank_{rank}', 'automatic', None, '+1 SOC', 1, f'Navy rank {rank}')
+            self.log_skill_acquisition(f'rank_{rank}', SkillTable.AUTOMATIC, None, '+1 SOC', 1, f'Navy rank {rank}')
             self.automatic_skills_granted.add('navy_rank6')
 
     def calculate_mustering_out_rolls(self):
@@ -874,14 +821,8 @@ class Character:
         print("└─────────────┴─────────────┴──────┴─────────────┴─────────┴─────────────┘")
 
     def log_event(self, event_type, data):
-        """Log an event during character generation"""
-        event = {
-            'event_type': event_type,
-            'term': self.terms_served,
-            'age': self.age,
-            'data': data
-        }
-        self.generation_log.append(event)
+        """Log an event during character generation (callers check log_verbosity first)"""
+        self.events.event(event_type, self.terms_served, self.age, data)
 
     def to_json(self):
         """Convert character to JSON format"""
@@ -893,48 +834,51 @@ class Character:
             upp = "------"  # Placeholder for unrolled characteristics
         
         # Convert skills dict to list format for better JSON structure
-        skills_list = [{'name': skill, 'level': level} for skill, level in self.skills.items()]
+        skills_list = [{'name': str(skill), 'level': level} for skill, level in self.skills.items()]
         
         # Convert career history to more detailed format
         career_history_detailed = []
         for term in self.career_history:
             career_history_detailed.append({
                 'term': term['term'],
-                'career': term['career'],
+                'career': str(term['career']),
                 'age_start': term['age_start'],
                 'age_end': term['age_end'],
                 'partial_term': term.get('partial_term', False)
             })
         
+        # Codes become names here, at the JSON boundary; str() leaves names as they are
         character_data = {
             'name': self.name,
             'age': self.age,
             'terms_served': self.terms_served,
             'characteristics': self.characteristics,
             'upp': upp,
-            'career': self.career,
+            'career': None if self.career is None else str(self.career),
             'commissioned': self.commissioned,
             'rank': self.rank,
             'drafted': self.drafted,
+            'died': self.died,
             'promotions': self.promotions,
             'skills': skills_list,
             'career_history': career_history_detailed,
-            'ageing_log': self.ageing_log,
-            'skill_acquisition_log': self.skill_acquisition_log,
-            'generation_log': self.generation_log,
+            'ageing_log': self.events.ageing_log(),
+            'skill_acquisition_log': self.events.skill_acquisition_log(labels=True),
+            'generation_log': self.events.generation_log(labels=True),
+            'log_level': self.log_level,
             'mustering_out_rolls': self.calculate_mustering_out_rolls(),
-            'mustering_out_benefits': self.mustering_out_benefits
+            'mustering_out_benefits': labelled(self.mustering_out_benefits)
         }
         
         return character_data
 
     def display_current_term_skills(self, output_format='text'):
         """Display skill acquisitions for the current term"""
-        if not self.skill_acquisition_log:
+        if output_format != 'text':
             return
         
         # Get skills for the current term
-        current_term_skills = [entry for entry in self.skill_acquisition_log if entry['term'] == self.terms_served]
+        current_term_skills = self.events.skill_acquisition_log(term=self.terms_served)
         
         if not current_term_skills:
             return
@@ -960,8 +904,8 @@ class Character:
             return
     
         # Check for ageing checks in the generation log (this captures all checkprint(f"🎖️ [Promotion Check] {career}: Roll {roll} + {modifier} = {roll + modifier} (Need {target}) → {'PROMOTED' if success else 'FAILED'}")s, not just losses)
-        ageing_checks = [event for event in self.generation_log 
-                  if event['event_type'] == 'ageing_check' and event['term'] == self.terms_served]
+        ageing_checks = [event for event in self.events_for_term(self.terms_served)
+                         if event['event_type'] == EventType.AGEING_CHECK]
     
         if ageing_checks:
             print(f"⏰ [AGEING]")
@@ -991,28 +935,13 @@ class Character:
             total_rolls += 3
 
         # 2. Decide how many cash rolls (max 3)
-        cash_rolls = min(3, total_rolls)
+        cash_rolls = min(rules.MAX_CASH_ROLLS, total_rolls)
         benefit_rolls = total_rolls - cash_rolls
 
         # 3. Get tables
-        cash_table = {
-            'Navy':     {1: 1000, 2: 5000, 3: 5000, 4: 10000, 5: 20000, 6: 50000, 7: 50000},
-            'Marines':  {1: 2000, 2: 5000, 3: 5000, 4: 10000, 5: 20000, 6: 30000, 7: 40000},
-            'Army':     {1: 2000, 2: 5000, 3: 10000, 4: 10000, 5: 10000, 6: 20000, 7: 30000},
-            'Scouts':   {1: 20000, 2: 20000, 3: 30000, 4: 30000, 5: 50000, 6: 50000, 7: 50000},
-            'Merchant': {1: 1000, 2: 5000, 3: 10000, 4: 20000, 5: 20000, 6: 40000, 7: 40000},
-            'Other':    {1: 1000, 2: 5000, 3: 10000, 4: 10000, 5: 10000, 6: 50000, 7: 100000},
-        }
-        benefit_table = {
-            'Navy':     {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +2', 4: 'Blade', 5: 'Travellers', 6: 'High Psg', 7: 'SOC +2'},
-            'Marines':  {1: 'Low Psg', 2: 'INT +2', 3: 'EDU +1', 4: 'Blade', 5: 'Traveller', 6: 'High Psg', 7: 'SOC +2'},
-            'Army':     {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +2', 4: 'Gun', 5: 'High Psg', 6: 'Mid Psg', 7: 'SOC +1'},
-            'Scouts':   {1: 'Low Psg', 2: 'INT +2', 3: 'EDU +2', 4: 'Blade', 5: 'Gun', 6: 'Scout Ship'},
-            'Merchant': {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +1', 4: 'Gun', 5: 'Blade', 6: 'Low Psg', 7: 'Free Trader'},
-            'Other':    {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +1', 4: 'Gun', 5: 'High Psg', 6: '-'},
-        }
-        cash_table = cash_table.get(career, cash_table['Other'])
-        benefit_table = benefit_table.get(career, benefit_table['Other'])
+        career = Career.get(career, career)
+        cash_table = rules.CASH_TABLE.get(career, rules.DEFAULT_CASH_TABLE)
+        benefit_table = rules.BENEFIT_TABLE.get(career, rules.DEFAULT_BENEFIT_TABLE)
 
         # 4. Roll for cash
         cash_total = 0
@@ -1024,83 +953,63 @@ class Character:
             print(f'\n💰 [MUSTERING OUT]: {career} |{total_rolls} rolls ({cash_rolls} cash, {benefit_rolls} benefits)')
 
         for i in range(cash_rolls):
-            roll = random.randint(1, 6) + rank_bonus + gambling_skill
+            roll = self.rng.randint(1, 6) + rank_bonus + gambling_skill
             roll = min(7, roll)  # Max table value is 7
             amount = cash_table.get(roll, 0)
             cash_total += amount
             if output_format == 'text':
                 print(f' [cash] Roll {i+1}: {roll} → Cr{amount:,}')
             # Log cash roll
-            self.log_event('mustering_out_cash_roll', {
-                'roll_number': i + 1,
-                'base_roll': roll - rank_bonus - gambling_skill,
-                'rank_bonus': rank_bonus,
-                'gambling_bonus': gambling_skill,
-                'total_roll': roll,
-                'amount': amount,
-                'career': career
-            })
+            if self.log_verbosity >= LOG_FULL:
+                self.log_event(EventType.MUSTERING_OUT_CASH_ROLL, {
+                    'roll_number': i + 1,
+                    'base_roll': roll - rank_bonus - gambling_skill,
+                    'rank_bonus': rank_bonus,
+                    'gambling_bonus': gambling_skill,
+                    'total_roll': roll,
+                    'amount': amount,
+                    'career': career
+                })
 
         # 5. Roll for benefits
         for i in range(benefit_rolls):
-            roll = random.randint(1, 6) + rank_bonus
+            roll = self.rng.randint(1, 6) + rank_bonus
             roll = min(7, roll)
-            benefit = benefit_table.get(roll, 'Low Psg')
+            benefit = benefit_table.get(roll, rules.DEFAULT_BENEFIT)
             if output_format == 'text':
                 print(f' [benefit] Roll {i+1}: {roll} → {benefit}')
             # Log benefit roll
-            self.log_event('mustering_out_benefit_roll', {
-                'roll_number': i + 1,
-                'base_roll': roll - rank_bonus,
-                'rank_bonus': rank_bonus,
-                'total_roll': roll,
-                'benefit': benefit,
-                'career': career
-            })
-            # Apply characteristic boosts
-            if benefit.startswith('INT +'):
-                boost = int(benefit.split('+')[1])
-                char_boosts['int'] = char_boosts.get('int', 0) + boost
-                self.characteristics['int'] += boost
-                # Log characteristic boost
-                self.log_event('mustering_out_characteristic_boost', {
-                    'stat': 'INT',
-                    'boost': boost,
-                    'old_value': self.characteristics['int'] - boost,
-                    'new_value': self.characteristics['int'],
-                    'source': 'mustering_out_benefit'
-                })
-            elif benefit.startswith('EDU +'):
-                boost = int(benefit.split('+')[1])
-                char_boosts['edu'] = char_boosts.get('edu', 0) + boost
-                self.characteristics['edu'] += boost
-                # Log characteristic boost
-                self.log_event('mustering_out_characteristic_boost', {
-                    'stat': 'EDU',
-                    'boost': boost,
-                    'old_value': self.characteristics['edu'] - boost,
-                    'new_value': self.characteristics['edu'],
-                    'source': 'mustering_out_benefit'
+            if self.log_verbosity >= LOG_FULL:
+                self.log_event(EventType.MUSTERING_OUT_BENEFIT_ROLL, {
+                    'roll_number': i + 1,
+                    'base_roll': roll - rank_bonus,
+                    'rank_bonus': rank_bonus,
+                    'total_roll': roll,
+                    'benefit': benefit,
+                    'career': career
                 })
-            elif benefit.startswith('SOC +'):
-                boost = int(benefit.split('+')[1])
-                char_boosts['soc'] = char_boosts.get('soc', 0) + boost
-                self.characteristics['soc'] += boost
+            # Apply characteristic boosts
+            if benefit in rules.BENEFIT_BOOST:
+                stat, boost = rules.BENEFIT_BOOST[benefit]
+                char_boosts[stat] = char_boosts.get(stat, 0) + boost
+                self.characteristics[stat] += boost
                 # Log characteristic boost
-                self.log_event('mustering_out_characteristic_boost', {
-                    'stat': 'SOC',
-                    'boost': boost,
-                    'old_value': self.characteristics['soc'] - boost,
-                    'new_value': self.characteristics['soc'],
-                    'source': 'mustering_out_benefit'
-                })
-            elif benefit != '-':
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.MUSTERING_OUT_CHARACTERISTIC_BOOST, {
+                        'stat': stat.upper(),
+                        'boost': boost,
+                        'old_value': self.characteristics[stat] - boost,
+                        'new_value': self.characteristics[stat],
+                        'source': 'mustering_out_benefit'
+                    })
+            elif benefit != Benefit.NONE:
                 items.append(benefit)
                 # Log item acquisition
-                self.log_event('mustering_out_item', {
-                    'item': benefit,
-                    'source': 'mustering_out_benefit'
-                })
+                if self.log_verbosity >= LOG_FULL:
+                    self.log_event(EventType.MUSTERING_OUT_ITEM, {
+                        'item': benefit,
+                        'source': 'mustering_out_benefit'
+                    })
 
         self.mustering_out_benefits = {
             'cash': cash_total,
@@ -1109,138 +1018,114 @@ class Character:
         }
 
         # Log final mustering out summary
-        self.log_event('mustering_out_summary', {
-            'career': career,
-            'total_rolls': total_rolls,
-            'cash_rolls': cash_rolls,
-            'benefit_rolls': benefit_rolls,
-            'total_cash': cash_total,
-            'items': items,
-            'characteristic_boosts': char_boosts,
-            'rank_bonus': rank_bonus,
-            'gambling_skill': gambling_skill
-        })
+        if self.log_verbosity >= LOG_SUMMARY:
+            self.log_event(EventType.MUSTERING_OUT_SUMMARY, {
+                'career': career,
+                'total_rolls': total_rolls,
+                'cash_rolls': cash_rolls,
+                'benefit_rolls': benefit_rolls,
+                'total_cash': cash_total,
+                'items': items,
+                'characteristic_boosts': char_boosts,
+                'rank_bonus': rank_bonus,
+                'gambling_skill': gambling_skill
+            })
 
         if output_format == 'text':
-        # Build summary parts
+            # Build summary parts
             summary_parts = [f'Cr{cash_total:,} cash']
-        if char_boosts:
-            boosts_str = ', '.join(f'{k.upper()} +{v}' for k, v in char_boosts.items())
-            summary_parts.append(f'{boosts_str} boosts')
-        if items:
-            summary_parts.append(f'{", ".join(items)} items')
-    
-        print(f'✅ [MUSTERING OUT] {career} | {", ".join(summary_parts)}')
+            if char_boosts:
+                boosts_str = ', '.join(f'{k.upper()} +{v}' for k, v in char_boosts.items())
+                summary_parts.append(f'{boosts_str} boosts')
+            if items:
+                summary_parts.append(f'{", ".join(map(str, items))} items')
+
+            print(f'✅ [MUSTERING OUT] {career} | {", ".join(summary_parts)}')
 
     @staticmethod
-    def check_commission(career, characteristics):
+    def check_commission(career, characteristics, output_format='text', rng=random):
         """Check if character receives commission (simplified)"""
-        if career in ['Scouts', 'Others']:
+        career = Career.get(career, career)
+        if career in (Career.SCOUTS, Career.OTHERS):
             return False
             
-        commission_target = {
-            'Navy': 10,
-            'Marines': 9,
-            'Army': 5,
-            'Merchants': 4
-        }
-        
-        roll = Character.roll_2d6()
-        target = commission_target.get(career, 12)
+        roll = Character.roll_2d6(rng)
+        target = rules.COMMISSION_TARGET.get(career, 12)
         
         # Add modifiers based on characteristics
-        modifier = 0
-        if career == 'Navy' and characteristics.get('soc', 0) >= 9:
-            modifier += 1
-        elif career == 'Marines' and characteristics.get('edu', 0) >= 7:
-            modifier += 1
-        elif career == 'Army' and characteristics.get('end', 0) >= 7:
-            modifier += 1
-        elif career == 'Merchants' and characteristics.get('int', 0) >= 9:
-            modifier += 1
+        stat, req = rules.COMMISSION_MODIFIER.get(career, (None, None))
+        modifier = 1 if stat and characteristics.get(stat, 0) >= req else 0
             
         success = (roll + modifier) >= target
-        if success:
-            print(f"🗡️  [COMMISSION] {career} | Roll: {roll}+{modifier}={roll + modifier} (need {target}) → COMMISSIONED (Rank 1)")
-        else:
-            print(f"🗡️  [COMMISSION] {career} | Roll: {roll}+{modifier}={roll + modifier} (need {target}) → FAILED")
+        if output_format == 'text':
+            if success:
+                print(f"🗡️  [COMMISSION] {career} | Roll: {roll}+{modifier}={roll + modifier} (need {target}) → COMMISSIONED (Rank 1)")
+            else:
+                print(f"🗡️  [COMMISSION] {career} | Roll: {roll}+{modifier}={roll + modifier} (need {target}) → FAILED")
         
         return success
 
+    @staticmethod
+    def check_promotion(career, characteristics, output_format='text', rng=random):
+        """Promotion roll for a commissioned character: returns (success, roll, modifier, target).
+
+        Careers without promotions (Scouts, Others) return (False, None, 0, None) without rolling.
+        """
+        career = Career.parse(career)
+        if career not in rules.PROMOTION_TARGET:
+            return False, None, 0, None
+        roll = Character.roll_2d6(rng)
+        target = rules.PROMOTION_TARGET[career]
+        stat, req = rules.PROMOTION_MODIFIER[career]
+        modifier = 1 if characteristics.get(stat, 0) >= req else 0
+        success = (roll + modifier) >= target
+        if output_format == 'text':
+            print(f"⭐ [PROMOTION] {career}: Roll {roll} + {modifier} = {roll + modifier} (Need {target}) → {'PROMOTED' if success else 'FAILED'}")
+        return success, roll, modifier, target
+
     def roll_for_skills(self, career, num_skills=2, reason='term'):
         """Roll for skills during a term with enhanced logging"""
-        tables = self.get_skill_tables(career)
-        skill_rolls_this_term = []
+        career = Career.parse(career)
         
         for i in range(num_skills):
-            # All characters may roll on personal, service, and advanced
-            available_tables = ['personal', 'service', 'advanced']
-            # Only add advanced_education if EDU >= 8
-            if self.characteristics.get('edu', 0) >= 8:
-                available_tables.append('advanced_education')
-            # Choose a random table
-            chosen_table = random.choice(available_tables)
-            table = tables[chosen_table][career]
-            # Roll on the table
-            roll = random.randint(1, 6)
-            result = table.get(roll, 'No skill')
-            skill_rolls_this_term.append((chosen_table, result))
-            
-            # Apply the result
-            if result.startswith('+1'):
-                # Characteristic increase
-                stat = result.split()[1].lower()
-                if stat in self.characteristics:
-                    self.characteristics[stat] += 1
-                    self.log_skill_acquisition(reason, chosen_table, roll, f'+1 {stat.upper()}', 1, 'Characteristic boost')
+            # All characters may roll on personal, service, and advanced;
+            # advanced_education only with EDU >= 8
+            if self.characteristics.get('edu', 0) >= rules.ADVANCED_EDUCATION_MIN_EDU:
+                available_tables = rules.SKILL_TABLE_NAMES
             else:
-                # Skill gain
-                self.add_skill(result, 1, reason, chosen_table, roll, 'Skill gain')
+                available_tables = rules.BASIC_SKILL_TABLES
+            # Choose a random table and roll on it
+            chosen_table = self.rng.choice(available_tables)
+            roll = self.rng.randint(1, 6)
+            self._apply_skill_result(career, chosen_table, roll, reason)
         
-        # Store skill rolls for this term in term_log
-        self.term_log.append({'term': self.terms_served, 'age': self.age, 'skills': skill_rolls_this_term, 'ageing': []})
+        # Close this batch of rolls (a term_log entry)
+        self.events.rolls(self.terms_served, self.age)
 
     @staticmethod
-    def check_promotion_detailed(career, characteristics, current_rank):
+    def check_promotion_detailed(career, characteristics, current_rank, rng=random):
         """Check if character receives promotion with detailed roll information"""
-        if career in ['Scouts', 'Others']:
+        career = Career.get(career, career)
+        if career in (Career.SCOUTS, Career.OTHERS):
             return {
                 'applicable': False,
                 'reason': f'{career} does not have promotions'
             }
         
         # Promotion targets by career and current rank
-        promotion_targets = {
-            'Navy': {1: 10, 2: 9, 3: 8, 4: 7, 5: 6},
-            'Marines': {1: 9, 2: 8, 3: 7, 4: 6, 5: 5},
-            'Army': {1: 5, 2: 5, 3: 5, 4: 5, 5: 5},
-            'Merchants': {1: 4, 2: 4, 3: 4, 4: 4, 5: 4}
-        }
+        promotion_targets = rules.RANK_PROMOTION_TARGET
         
-        if current_rank not in promotion_targets.get(career, {}):
+        if current_rank not in promotion_targets.get(career, rules.NO_BONUSES):
             return {
                 'applicable': False,
                 'reason': f'No promotion available for {career} rank {current_rank}'
             }
         
-        roll = Character.roll_2d6()
+        roll = Character.roll_2d6(rng)
         target = promotion_targets[career][current_rank]
         
         # Add modifiers based on characteristics
-        modifier = 0
-        modifier_details = []
-        if career == 'Navy' and characteristics.get('soc', 0) >= 9:
-            modifier += 1
-            modifier_details.append(f"SOC {characteristics.get('soc', 0)}≥9 (+1)")
-        elif career == 'Marines' and characteristics.get('edu', 0) >= 7:
-            modifier += 1
-            modifier_details.append(f"EDU {characteristics.get('edu', 0)}≥7 (+1)")
-        elif career == 'Army' and characteristics.get('end', 0) >= 7:
-            modifier += 1
-            modifier_details.append(f"END {characteristics.get('end', 0)}≥7 (+1)")
-        elif career == 'Merchants' and characteristics.get('int', 0) >= 9:
-            modifier += 1
-            modifier_details.append(f"INT {characteristics.get('int', 0)}≥9 (+1)")
+        modifier, modifier_details = Character._characteristic_modifier(rules.COMMISSION_MODIFIER, career, characteristics)
             
         total = roll + modifier
         success = total >= target
@@ -1267,7 +1152,8 @@ class Character:
         obj.age = data.get('age', 18)
         obj.terms_served = data.get('terms_served', 0)
         obj.characteristics = data.get('characteristics', {})
-        obj.career = data.get('career', None)
+        career = data.get('career', None)
+        obj.career = None if career is None else Career.parse(career)
         obj.commissioned = data.get('commissioned', False)
         obj.rank = data.get('rank', 0)
         obj.drafted = data.get('drafted', False)
@@ -1275,14 +1161,19 @@ class Character:
         # Convert skills list back to dict if needed
         skills = data.get('skills', [])
         if isinstance(skills, list):
-            obj.skills = {s['name']: s['level'] for s in skills}
-        else:
-            obj.skills = skills
-        obj.career_history = data.get('career_history', [])
-        obj.ageing_log = data.get('ageing_log', [])
-        obj.skill_acquisition_log = data.get('skill_acquisition_log', [])
-        obj.generation_log = data.get('generation_log', [])
-        obj.term_log = data.get('term_log', [])
+            skills = {s['name']: s['level'] for s in skills}
+        # Skills outside the rules tables (e.g. from other sources) keep their names
+        obj.skills = SkillLevels((Skill.get(name, name), level) for name, level in skills.items())
+        # Names the engine compares become codes again; everything else stays as labels
+        obj.career_history = [{**term, 'career': Career.get(term.get('career'), term.get('career'))}
+                              for term in data.get('career_history', [])]
+        obj.log_level = data.get('log_level', 'full')
+        obj.log_verbosity = LOG_LEVELS.index(obj.log_level)
+        obj.events = EventStore.from_logs(data.get('generation_log', []), data.get('ageing_log', []),
+                                          data.get('skill_acquisition_log', []), data.get('term_log', []))
+        # Older exports carry no 'died' key; their DEATH event is the only record
+        obj.died = data['died'] if 'died' in data else any(
+            EventType.get(entry.get('event_type')) == EventType.DEATH for entry in data.get('generation_log', []))
         obj.mustering_out_benefits = data.get('mustering_out_benefits', {'cash': 0, 'items': []})
         # Handle automatic_skills_granted as set
         auto_skills = data.get('automatic_skills_granted', set())
@@ -1452,8 +1343,68 @@ def test_mustering_out_calculation():
     
     print("✅ Mustering out calculation test passed")
 
-def run_full_character_generation(death_rule_enabled=False, service_choice=None, seed=None, output_format='text'):
-    """Run a complete character generation"""
+def test_batch_generation():
+    """Test headless batch generation"""
+    import io
+    import contextlib
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        first = list(generate_batch(20, seed=7, service_choice='Navy', death_rule_enabled=True))
+        second = list(generate_batch(20, seed=7, service_choice='Navy', death_rule_enabled=True))
+    assert buffer.getvalue() == '', "Batch generation should not print anything"
+    assert len(first) == 20, f"Should generate 20 characters, got {len(first)}"
+    assert first == second, "Same seed should produce the same batch"
+    for data in first:
+        assert data['mustering_out_benefits']['cash'] >= 0, "Cash should not be negative"
+        assert data['career'] in Character.get_available_careers(), f"Invalid career: {data['career']}"
+
+    characters = list(generate_batch(3, seed=7, output_format='object'))
+    assert all(isinstance(c, Character) for c in characters), "output_format='object' should yield Characters"
+
+    print("✅ Batch generation test passed")
+
+def test_parallel_batch_generation():
+    """Test that parallel batches match serial batches and single regeneration"""
+    serial = list(generate_batch(12, seed=99))
+    parallel = list(generate_batch(12, seed=99, workers=2, chunk_size=5))
+    assert serial == parallel, "Parallel batch should match the serial batch"
+
+    single = regenerate_character(99, 7).to_json()
+    assert single == serial[7], "regenerate_character should reproduce character #7"
+
+    print("✅ Parallel batch generation test passed")
+
+def test_log_levels():
+    """Test that log levels change only generation_log, never the dice"""
+    full = list(generate_batch(20, seed=5, log_level='full'))
+    summary = list(generate_batch(20, seed=5, log_level='summary'))
+    off = list(generate_batch(20, seed=5, log_level='off'))
+    for f, s, o in zip(full, summary, off):
+        assert o['generation_log'] == [], "Log level 'off' should record no events"
+        assert s['generation_log'] and [e for e in f['generation_log'] if e in s['generation_log']] == s['generation_log'], \
+            "Summary events should be a subset of the full log, in order"
+        assert (f['log_level'], s['log_level'], o['log_level']) == ('full', 'summary', 'off')
+        for data in (s, o):
+            assert {k: v for k, v in data.items() if k not in ('generation_log', 'log_level')} == \
+                   {k: v for k, v in f.items() if k not in ('generation_log', 'log_level')}, \
+                "Log level should not change the character"
+    assert Character.from_json(summary[0]).to_json() == summary[0]
+    # With no events recorded, a death is still visible through the 'died' key
+    full = list(generate_batch(100, seed=13, death_rule_enabled=True, log_level='full'))
+    off = list(generate_batch(100, seed=13, death_rule_enabled=True, log_level='off'))
+    assert any(o['died'] for o in off), "Seed should produce a death"
+    assert [o['died'] for o in off] == [f['died'] for f in full], "Log level 'off' should not hide deaths"
+    assert all(Character.from_json(o).died == o['died'] for o in off)
+
+    print("✅ Log levels test passed")
+
+def run_full_character_generation(death_rule_enabled=False, service_choice=None, seed=None, output_format='text', instrumentation=None):
+    """Run a complete character generation; an instrumentation.Instrumentation collects counters and phase times"""
+    if instrumentation is not None:
+        with instrumentation:
+            return run_full_character_generation(death_rule_enabled, service_choice, seed, output_format)
+
     # Set seed if provided
     if seed is not None:
         set_random_seed(seed)
@@ -1465,9 +1416,30 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
         print("TRAVELLER CHARACTER GENERATION")
         print("="*60 + "\n")
     
+    c = generate_character(death_rule_enabled, service_choice, output_format)
+    if c is None:
+        return None
+
+    if output_format == 'json':
+        return c.to_json()
+    else:
+        # Display final character sheet
+        c.display_character_sheet()
+        return c
+
+def generate_character(death_rule_enabled=False, service_choice=None, output_format='none', rng=None, log_level='full'):
+    """Engine core: run one complete character generation and return the Character.
+
+    Nothing is printed unless output_format is 'text', so batch callers pay
+    no formatting or console I/O cost. All dice come from rng (default: the
+    global random module). log_level ('off', 'summary' or 'full') sets how
+    much of generation_log is recorded; the dice rolled are the same at every
+    level. Returns None for an invalid career.
+    """
     # Create character
-    c = Character()
-    c.characteristics = c.generate_characteristics()
+    c = Character(rng, log_level)
+    rng = c.rng
+    c.characteristics = c.generate_characteristics(rng)
     
     if output_format == 'text':
         print(f"Character Name: {c.name}")
@@ -1475,53 +1447,57 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
     
     # Use specified service or pick random one
     if service_choice:
-        if service_choice not in Character.get_available_careers():
+        if Career.get(service_choice) is None:
             if output_format == 'text':
                 print(f"Error: Invalid career '{service_choice}'")
                 print(f"Available careers: {', '.join(Character.get_available_careers())}")
             return None
+        service_choice = Career.parse(service_choice)
         if output_format == 'text':
             print(f"\nAttempting to enlist in: {service_choice}")
     else:
-        service_choice = Character.get_random_career()
+        service_choice = Career.parse(Character.get_random_career(rng))
         if output_format == 'text':
             print(f"\nAttempting to enlist in: {service_choice}")
     
     # Log enlistment attempt
-    c.log_event('enlistment_attempt', {
-        'service_choice': service_choice,
-        'characteristics': c.characteristics.copy()
-    })
+    if c.log_verbosity >= LOG_FULL:
+        c.log_event(EventType.ENLISTMENT_ATTEMPT, {
+            'service_choice': service_choice,
+            'characteristics': c.characteristics.copy()
+        })
     
     # Attempt enlistment
-    career, status, required_roll, roll, modifier = Character.attempt_enlistment(c.characteristics, service_choice)
+    career, status, required_roll, roll, modifier = Character.attempt_enlistment(c.characteristics, service_choice, rng)
+    career = Career.parse(career)  # the engine works with codes
     
     if output_format == 'text':
         print(f"🎯 [ENLISTMENT] {service_choice} | Roll: {roll}+{modifier}={roll + modifier} (need {required_roll}) → {status.upper()} as {career}")
     
     # Log enlistment result
-    c.log_event('enlistment_result', {
-        'service_choice': service_choice,
-        'career': career,
-        'status': status,
-        'roll': roll,
-        'modifier': modifier,
-        'required_roll': required_roll,
-        'total': roll + modifier
-    })
+    if c.log_verbosity >= LOG_SUMMARY:
+        c.log_event(EventType.ENLISTMENT_RESULT, {
+            'service_choice': service_choice,
+            'career': career,
+            'status': status,
+            'roll': roll,
+            'modifier': modifier,
+            'required_roll': required_roll,
+            'total': roll + modifier
+        })
     
     if status == "drafted":          
         c.drafted = True
     
     c.career = career
-    print()
+    if output_format == 'text':
+        print()
     # Grant automatic skill for enlistment/draft
     c.grant_automatic_enlistment_skill(career, output_format)
     
     # Commission and promotion logic
-    MAX_PROMOTIONS = {'Navy': 5, 'Marines': 5, 'Army': 5, 'Merchants': 4}
-    eligible_for_commission = career in ['Navy', 'Marines', 'Army', 'Merchants']
-    eligible_for_promotion = career in ['Navy', 'Marines', 'Army', 'Merchants']
+    eligible_for_commission = career in rules.COMMISSION_TARGET
+    eligible_for_promotion = career in rules.PROMOTION_TARGET
     # Track commission attempt eligibility (not in first term if drafted)
     commission_attempted = False
     # Remove MAX_TERMS limit - characters can continue if they roll 12
@@ -1530,31 +1506,35 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
             print(f"\n--- Term {c.terms_served + 1} in {career} ---")
         
         # Log term start
-        c.log_event('term_start', {
-            'term': c.terms_served + 1,
-            'career': career,
-            'age': c.age
-        })
+        if c.log_verbosity >= LOG_FULL:
+            c.log_event(EventType.TERM_START, {
+                'term': c.terms_served + 1,
+                'career': career,
+                'age': c.age
+            })
         
         # Check survival
-        survived = Character.check_survival(career, c.characteristics, death_rule_enabled)
+        survived = Character.check_survival(career, c.characteristics, death_rule_enabled, output_format, rng)
         
         # Log survival check
-        c.log_event('survival_check', {
-            'career': career,
-            'outcome': survived,
-            'characteristics': c.characteristics.copy()
-        })
+        if c.log_verbosity >= LOG_FULL:
+            c.log_event(EventType.SURVIVAL_CHECK, {
+                'career': career,
+                'outcome': survived,
+                'characteristics': c.characteristics.copy()
+            })
         
         # Handle different survival outcomes
         if survived == 'died':
+            c.died = True
             if output_format == 'text':
                 print(f"\u2620\ufe0f  Died during term {c.terms_served + 1} in {career}. Final Age: {c.age}")
-            c.log_event('death', {
-                'term': c.terms_served + 1,
-                'career': career,
-                'age': c.age
-            })
+            if c.log_verbosity >= LOG_SUMMARY:
+                c.log_event(EventType.DEATH, {
+                    'term': c.terms_served + 1,
+                    'career': career,
+                    'age': c.age
+                })
             break
         elif survived == 'injured':
             if output_format == 'text':
@@ -1564,14 +1544,16 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
             c.terms_served += 0.5
             # Then add career term with correct ages
             c.add_career_term(career, c.terms_served, partial_term=True)
+            c.record_term_state()
             if output_format == 'text':
                 print(f"Final Age: {c.age}, Terms Served: {c.terms_served}")
-            c.log_event('injury', {
-                'term': c.terms_served,
-                'career': career,
-                'age': c.age,
-                'partial_term': True
-            })
+            if c.log_verbosity >= LOG_SUMMARY:
+                c.log_event(EventType.INJURY, {
+                    'term': c.terms_served,
+                    'career': career,
+                    'age': c.age,
+                    'partial_term': True
+                })
             break
         else:  # survived == 'survived'
             # Complete the term normally
@@ -1581,58 +1563,43 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
             # 2.1 Commission attempt (if not already commissioned, not first term if drafted, and eligible career)
             commission_this_term = False
             if eligible_for_commission and not c.commissioned and not c.drafted:
-                # Explicitly prevent commission for Scouts and Others
-                if career in ['Navy', 'Marines', 'Army', 'Merchants']:
-                    commission_this_term = Character.check_commission(career, c.characteristics)
-                    if commission_this_term:
-                        c.commissioned = True
-                        c.rank = 1
-                        c.log_event('commission', {
+                commission_this_term = Character.check_commission(career, c.characteristics, output_format, rng)
+                if commission_this_term:
+                    c.commissioned = True
+                    c.rank = 1
+                    if c.log_verbosity >= LOG_SUMMARY:
+                        c.log_event(EventType.COMMISSION, {
                             'career': career,
                             'rank': c.rank
                         })
-                    else:
-                        c.log_event('commission_failed', {
+                else:
+                    if c.log_verbosity >= LOG_FULL:
+                        c.log_event(EventType.COMMISSION_FAILED, {
                             'career': career
                         })
-                    commission_attempted = True
+                commission_attempted = True
             
             # 2.2 Promotion attempt (if commissioned, not at max promotions)
             promotion_this_term = False
-            max_rank = {'Navy': 6, 'Marines': 6, 'Army': 6, 'Merchants': 5}
-            current_max_rank = max_rank.get(career, 0)
+            current_max_rank = rules.MAX_RANK.get(career, 0)
             
             if eligible_for_promotion and c.commissioned and c.rank < current_max_rank:
-                # Explicitly prevent promotion for Scouts and Others
-                if career in ['Navy', 'Marines', 'Army', 'Merchants']:
-                    promotion_target = {'Navy': 8, 'Marines': 9, 'Army': 6, 'Merchants': 10}
-                    roll = Character.roll_2d6()
-                    target = promotion_target.get(career, 12)
-                    modifier = 0
-                    if career == 'Navy' and c.characteristics.get('edu', 0) >= 8:
-                        modifier += 1
-                    elif career == 'Marines' and c.characteristics.get('int', 0) >= 8:
-                        modifier += 1
-                    elif career == 'Army' and c.characteristics.get('edu', 0) >= 7:
-                        modifier += 1
-                    elif career == 'Merchants' and c.characteristics.get('int', 0) >= 9:
-                        modifier += 1
-                    success = (roll + modifier) >= target
-                    if output_format == 'text':
-                        print(f"⭐ [PROMOTION] {career}: Roll {roll} + {modifier} = {roll + modifier} (Need {target}) → {'PROMOTED' if success else 'FAILED'}")
-                    if success:
-                        c.promotions += 1
-                        c.rank += 1
-                        c.log_event('promotion', {
+                success, roll, modifier, target = Character.check_promotion(career, c.characteristics, output_format, rng)
+                if success:
+                    c.promotions += 1
+                    c.rank += 1
+                    if c.log_verbosity >= LOG_SUMMARY:
+                        c.log_event(EventType.PROMOTION, {
                             'career': career,
                             'rank': c.rank,
                             'roll': roll,
                             'modifier': modifier,
                             'target': target
                         })
-                        promotion_this_term = True
-                    else:
-                        c.log_event('promotion_failed', {
+                    promotion_this_term = True
+                else:
+                    if c.log_verbosity >= LOG_FULL:
+                        c.log_event(EventType.PROMOTION_FAILED, {
                             'career': career,
                             'roll': roll,
                             'modifier': modifier,
@@ -1641,7 +1608,7 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
             
             # 3. Determine skills (service + commission + promotion + automatic)
             # 3a) Service skills
-            if career == 'Scouts':
+            if career == Career.SCOUTS:
                 num_skills = 2
             else:
                 num_skills = 2 if c.terms_served == 1 else 1
@@ -1667,17 +1634,18 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
 
             if output_format == 'text':
                 print(f"✅ [TERM COMPLETED] Term: {c.terms_served}. Age: {c.age}")
+            c.record_term_state()
 
             # Roll to re-enlist
-            if output_format == 'text':
-                preference = 'reenlist'
-                reenlistment_result = Character.attempt_reenlistment(career, c.age, preference)
+            preference = 'reenlist'
+            reenlistment_result = Character.attempt_reenlistment(career, c.age, preference, output_format, rng)
 
-            c.log_event('reenlistment_attempt', {
-                'career': career,
-                'age': c.age,
-                'result': reenlistment_result
-            })
+            if c.log_verbosity >= LOG_FULL:
+                c.log_event(EventType.REENLISTMENT_ATTEMPT, {
+                    'career': career,
+                    'age': c.age,
+                    'result': reenlistment_result
+                })
             
             # Report outcome of re-enlistment attempt
             if reenlistment_result == 'denied':
@@ -1698,30 +1666,158 @@ def run_full_character_generation(death_rule_enabled=False, service_choice=None,
                 if output_format == 'text':
                     print(f"[Status Change] {career}: Drafted → Enlisted (successful re-enlistment)")
                 c.drafted = False
-                c.log_event('status_change', {
-                    'career': career,
-                    'from': 'drafted',
-                    'to': 'enlisted'
-                })
+                if c.log_verbosity >= LOG_SUMMARY:
+                    c.log_event(EventType.STATUS_CHANGE, {
+                        'career': career,
+                        'from': 'drafted',
+                        'to': 'enlisted'
+                    })
     
     # Calculate mustering out rolls at the very end
     mustering_rolls = c.calculate_mustering_out_rolls()
-    c.log_event('mustering_out', {
-        'total_rolls': mustering_rolls,
-        'term_rolls': int(c.terms_served),
-        'rank_rolls': mustering_rolls - int(c.terms_served)
-    })
+    if c.log_verbosity >= LOG_SUMMARY:
+        c.log_event(EventType.MUSTERING_OUT, {
+            'total_rolls': mustering_rolls,
+            'term_rolls': int(c.terms_served),
+            'rank_rolls': mustering_rolls - int(c.terms_served)
+        })
 
     # Perform mustering out process
-    gambling_skill = c.skills.get('Gambling', 0)
+    gambling_skill = c.skills.get(Skill.GAMBLING, 0)
     c.roll_mustering_out(career, gambling_skill=gambling_skill, output_format=output_format)
 
-    if output_format == 'json':
-        return c.to_json()
-    else:
-        # Display final character sheet
-        c.display_character_sheet()
-        return c
+    if _instrumentation is not None:
+        _instrumentation.character_done(c)
+    return c
+
+def character_seed(seed, index):
+    """Derive the seed for character #index of a batch from the master seed"""
+    # String seeds are hashed with SHA-512 by random.seed, so the stream is
+    # stable across processes and independent of PYTHONHASHSEED
+    return f"{seed}:{index}"
+
+def character_rng(seed, index, backend='random'):
+    """Independent dice stream for character #index of a batch, derived in O(1) from the master seed"""
+    if backend == 'random':
+        return random.Random(character_seed(seed, index))
+    # Keyed substream of the run's generator; no need to replay earlier characters
+    return dice.make_rng(backend, seed).substream(index)
+
+def regenerate_character(seed, index, service_choice=None, death_rule_enabled=False, backend='random', log_level='full'):
+    """Reproduce character #index of a batch run with the given master seed"""
+    return generate_character(death_rule_enabled, service_choice, output_format='none',
+                              rng=character_rng(seed, index, backend), log_level=log_level)
+
+def _generate_chunk(seed, start, stop, service_choice, death_rule_enabled, output_format, backend, log_level, instrumented=False):
+    """Generate characters [start, stop) of a batch (runs inside a worker process).
+
+    With instrumented=True, returns (results, stats) with the worker's instrumentation stats.
+    """
+    if instrumented:
+        from instrumentation import Instrumentation
+        if _instrumentation is not None:
+            # A forked worker inherits a copy of the parent's instrumentation; count into a fresh one
+            _instrumentation.disable()
+        with Instrumentation() as worker_instrumentation:
+            results = _generate_chunk(seed, start, stop, service_choice, death_rule_enabled, output_format, backend, log_level)
+        return results, worker_instrumentation.stats()
+    results = []
+    for index in range(start, stop):
+        c = regenerate_character(seed, index, service_choice, death_rule_enabled, backend, log_level)
+        results.append(c if output_format == 'object' else c.to_json())
+    return results
+
+def generate_batch(n, seed=None, service_choice=None, death_rule_enabled=False, output_format='json', workers=1, chunk_size=None, backend='random', log_level='full'):
+    """Generate n characters without any console output, yielding each one as it is produced.
+
+    Yields to_json() dicts by default, or Character objects with output_format='object'.
+    Every character is seeded from (seed, index), so a batch comes out identical
+    for any workers/chunk_size and character #index can be rebuilt on its own
+    with regenerate_character(). workers=None uses every CPU. backend picks
+    the dice generator (one of dice.BACKENDS); each character gets its own
+    instance, so no global random state is touched. log_level is passed to
+    each Character ('off' skips generation_log entirely).
+    """
+    if service_choice is not None and Career.get(service_choice) is None:
+        raise ValueError(f"Invalid career '{service_choice}'")
+    if backend not in dice.BACKENDS:
+        raise ValueError(f"Unknown RNG backend '{backend}'")
+    if log_level not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level '{log_level}'")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for index in range(n):
+            c = regenerate_character(seed, index, service_choice, death_rule_enabled, backend, log_level)
+            yield c if output_format == 'object' else c.to_json()
+        return
+
+    if chunk_size is None:
+        # Enough chunks to balance long and short careers across workers,
+        # but large enough to amortise the inter-process round trip
+        chunk_size = max(1, min(1000, n // (workers * 8)))
+
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+
+    # Workers instrument themselves and send their stats back with each chunk
+    instrumentation = _instrumentation
+    instrumented = instrumentation is not None
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight so memory stays flat for large n
+        pending = deque()
+        starts = iter(range(0, n, chunk_size))
+        for start in starts:
+            pending.append(executor.submit(_generate_chunk, seed, start, min(start + chunk_size, n),
+                                           service_choice, death_rule_enabled, output_format, backend, log_level,
+                                           instrumented))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            results = pending.popleft().result()
+            if instrumented:
+                results, stats = results
+                instrumentation.merge(stats)
+            start = next(starts, None)
+            if start is not None:
+                pending.append(executor.submit(_generate_chunk, seed, start, min(start + chunk_size, n),
+                                               service_choice, death_rule_enabled, output_format, backend, log_level,
+                                               instrumented))
+            yield from results
+
+def write_jsonl(out, n, buffer_size=1 << 20, **options):
+    """Write n characters from generate_batch(n, **options) to out as JSON Lines, returning the count.
+
+    Each character is one compact JSON line. Characters are encoded as they are
+    generated and written in chunks of about buffer_size characters, so memory
+    stays flat for any n.
+    """
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    chunk = []
+    size = count = 0
+    for data in generate_batch(n, **options):
+        line = encode(data)
+        chunk.append(line)
+        size += len(line) + 1
+        count += 1
+        if size >= buffer_size:
+            chunk.append('')
+            out.write('\n'.join(chunk))
+            if _instrumentation is not None:
+                _instrumentation.serialised(size)
+            chunk = []
+            size = 0
+    if chunk:
+        chunk.append('')
+        out.write('\n'.join(chunk))
+        if _instrumentation is not None:
+            _instrumentation.serialised(size)
+    out.flush()
+    return count
 
 def run_all_tests():
     """Run all unit tests"""
@@ -1738,7 +1834,10 @@ def run_all_tests():
         test_skill_acquisition,
         test_commission_and_promotion,
         test_reenlistment_logic,
-        test_mustering_out_calculation
+        test_mustering_out_calculation,
+        test_batch_generation,
+        test_parallel_batch_generation,
+        test_log_levels
     ]
     
     passed = 0
@@ -1775,7 +1874,11 @@ if __name__ == "__main__":
     # Set the random seed for reproducible results
     # Change this number to get different but reproducible results
     # Set to None for truly random results
-    set_random_seed(42)  # Use seed=42 for testing, or seed=None for random
+    # (not for --jsonl, report or library: they seed each character themselves or generate nothing,
+    # and stdout may need to hold only JSON)
+    if not (mode == "generate" and ("--jsonl" in sys.argv[2:] or "--library" in sys.argv[2:])
+            or mode in ("report", "library")):
+        set_random_seed(42)  # Use seed=42 for testing, or seed=None for random
     
     if mode == "test" or mode == "tests":
         # Run all unit tests
@@ -1789,6 +1892,11 @@ if __name__ == "__main__":
         seed = None
         death_rule = False
         output_format = 'text'  # Default to text output
+        count = 1
+        out_path = None
+        show_stats = False
+        trace_path = None
+        library_path = None
         
         # Parse arguments
         i = 2
@@ -1818,6 +1926,44 @@ if __name__ == "__main__":
             elif arg == "--json" or arg == "-j":
                 output_format = 'json'
                 i += 1
+            elif arg == "--jsonl":
+                output_format = 'jsonl'
+                i += 1
+            elif arg == "--stats":
+                show_stats = True
+                i += 1
+            elif arg == "--library":
+                if i + 1 < len(sys.argv):
+                    library_path = sys.argv[i + 1]
+                    i += 2
+                else:
+                    print("Error: --library requires a database file name")
+                    sys.exit(1)
+            elif arg == "--trace":
+                if i + 1 < len(sys.argv):
+                    trace_path = sys.argv[i + 1]
+                    i += 2
+                else:
+                    print("Error: --trace requires a file name")
+                    sys.exit(1)
+            elif arg == "--count" or arg == "-n":
+                if i + 1 < len(sys.argv):
+                    try:
+                        count = int(sys.argv[i + 1])
+                        i += 2
+                    except ValueError:
+                        print("Error: --count requires a number")
+                        sys.exit(1)
+                else:
+                    print("Error: --count requires a number")
+                    sys.exit(1)
+            elif arg == "--out" or arg == "-o":
+                if i + 1 < len(sys.argv):
+                    out_path = sys.argv[i + 1]
+                    i += 2
+                else:
+                    print("Error: --out requires a file name")
+                    sys.exit(1)
             elif arg == "--help" or arg == "-h":
                 print("Traveller Character Generator - Generate Mode Options:")
                 print("  python character_generator.py generate                    # Generate random character")
@@ -1826,6 +1972,11 @@ if __name__ == "__main__":
                 print("  python character_generator.py generate -c Marines -s 456 # Generate Marine with seed 456")
                 print("  python character_generator.py generate --death           # Enable death rule")
                 print("  python character_generator.py generate --json            # Output in JSON format")
+                print("  python character_generator.py generate -n 1000 --jsonl   # Stream 1000 characters as JSON Lines")
+                print("  python character_generator.py generate -n 1000 --jsonl --out chars.jsonl  # ... to a file")
+                print("  python character_generator.py generate --stats           # Also print engine counters and phase times")
+                print("  python character_generator.py generate --trace trace.json  # Save a Chrome trace of the generation spans")
+                print("  python character_generator.py generate -n 1000 --library chars.db  # Save characters to a SQLite library")
                 print("\nAvailable careers: Navy, Marines, Army, Scouts, Merchants, Others")
                 sys.exit(0)
             else:
@@ -1833,11 +1984,65 @@ if __name__ == "__main__":
                 print("Use --help for usage information")
                 sys.exit(1)
         
+        # Instrumentation hooks the importable module, which is not this __main__ one
+        import character_generator as engine
+        instrumentation = None
+        if trace_path is not None:
+            from tracing import Tracer
+            instrumentation = Tracer()
+        elif show_stats:
+            from instrumentation import Instrumentation
+            instrumentation = Instrumentation()
+        if library_path is not None:
+            from library import Library
+            try:
+                with Library(library_path) as library:
+                    saved = library.save_batch(count, seed=seed, service_choice=service_choice,
+                                               death_rule_enabled=death_rule)
+                    total = len(library)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"Saved {saved} characters to {library_path} ({total} in the library)")
+            sys.exit(0)
+        if output_format == 'jsonl':
+            if service_choice is not None and Career.get(service_choice) is None:
+                print(f"Error: Invalid career '{service_choice}'", file=sys.stderr)
+                sys.exit(1)
+            options = {'seed': seed, 'service_choice': service_choice, 'death_rule_enabled': death_rule}
+            if instrumentation is not None:
+                instrumentation.enable()
+            if out_path is None:
+                engine.write_jsonl(sys.stdout, count, **options)
+            else:
+                with open(out_path, 'w', encoding='utf-8') as out:
+                    written = engine.write_jsonl(out, count, **options)
+                print(f"Wrote {written} characters to {out_path}", file=sys.stderr)
+            if instrumentation is not None:
+                instrumentation.disable()
+            if show_stats:
+                print(json.dumps(instrumentation.stats(), indent=2), file=sys.stderr)
+            if trace_path is not None:
+                spans = instrumentation.write(trace_path)
+                print(f"Wrote {spans} spans to {trace_path}", file=sys.stderr)
+            sys.exit(0)
+        if count != 1 or out_path is not None:
+            print("Error: --count needs --jsonl or --library, and --out needs --jsonl")
+            sys.exit(1)
+
         # Run full character generation
-        result = run_full_character_generation(death_rule_enabled=death_rule, service_choice=service_choice, seed=seed, output_format=output_format)
+        result = engine.run_full_character_generation(death_rule_enabled=death_rule, service_choice=service_choice, seed=seed, output_format=output_format, instrumentation=instrumentation)
         
         if output_format == 'json' and result:
-            print(json.dumps(result, indent=2))
+            text = json.dumps(result, indent=2)
+            print(text)
+            if instrumentation is not None:
+                instrumentation.serialised(len(text.encode()) + 1)
+        if show_stats:
+            print(json.dumps(instrumentation.stats(), indent=2), file=sys.stderr)
+        if trace_path is not None:
+            spans = instrumentation.write(trace_path)
+            print(f"Wrote {spans} spans to {trace_path}", file=sys.stderr)
     
     elif mode == "test-single":
         # Run a specific test function
@@ -1852,7 +2057,10 @@ if __name__ == "__main__":
                 'skills': test_skill_acquisition,
                 'commission': test_commission_and_promotion,
                 'reenlistment': test_reenlistment_logic,
-                'mustering': test_mustering_out_calculation
+                'mustering': test_mustering_out_calculation,
+                'batch': test_batch_generation,
+                'parallel': test_parallel_batch_generation,
+                'logging': test_log_levels
             }
             
             if test_name in test_functions:
@@ -1863,8 +2071,173 @@ if __name__ == "__main__":
                 print(f"Available tests: {', '.join(test_functions.keys())}")
         else:
             print("Usage: python character_generator.py test-single <test_name>")
-            print("Available tests: stats, career, enlistment, survival, ageing, skills, commission, reenlistment, mustering")
-    
+            print("Available tests: stats, career, enlistment, survival, ageing, skills, commission, reenlistment, mustering, batch, parallel, logging")
+    
+    elif mode == "library":
+        from library import DEFAULT_PATH, Library
+        args = sys.argv[2:]
+        if args and args[0] in ("--help", "-h"):
+            print("Traveller Character Generator - Library Mode Options:")
+            print("  python character_generator.py library chars.db 42         # Print character 42 as JSON")
+            print("  python character_generator.py library chars.db            # List the first 50 characters")
+            print("  python character_generator.py library chars.db --career Navy --min-rank 5 --limit 10")
+            print("  ... --min-terms N --min-cash N --upp 789A98 --strength 10  # More filters (any characteristic)")
+            sys.exit(0)
+        path = args.pop(0) if args and not args[0].startswith('-') else DEFAULT_PATH
+        if not os.path.exists(path):
+            print(f"Error: no library at {path}")
+            sys.exit(1)
+        filters = {}
+        character_id = None
+        i = 0
+        while i < len(args):
+            arg = args[i].lower()
+            if not arg.startswith('--'):
+                try:
+                    character_id = int(arg)
+                except ValueError:
+                    print(f"Error: character id must be a number, not {args[i]}")
+                    sys.exit(1)
+                i += 1
+                continue
+            if i + 1 >= len(args):
+                print(f"Error: {args[i]} requires a value")
+                sys.exit(1)
+            name = arg[2:].replace('-', '_')
+            value = args[i + 1]
+            if name not in ('career', 'upp'):
+                try:
+                    value = float(value) if name == 'min_terms' else int(value)
+                except ValueError:
+                    print(f"Error: {args[i]} requires a number")
+                    sys.exit(1)
+            filters[name] = value
+            i += 2
+        with Library(path) as library:
+            if character_id is not None:
+                data = library.get(character_id)
+                if data is None:
+                    print(f"Error: no character {character_id} in {path}")
+                    sys.exit(1)
+                print(json.dumps(data, indent=2))
+                sys.exit(0)
+            try:
+                rows = library.find(**filters)
+            except (TypeError, ValueError) as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"{'id':>8}  {'name':<24}{'career':<11}{'rank':>5}{'terms':>7}{'age':>5}  {'upp':<8}{'cash':>8}")
+            for row in rows:
+                print(f"{row['id']:>8}  {row['name']:<24}{row['career'] or '-':<11}{row['rank']:>5}"
+                      f"{row['terms_served']:>7}{row['age']:>5}  {row['upp']:<8}{row['cash']:>8}")
+            print(f"{len(rows)} of {len(library)} characters")
+
+    elif mode == "report":
+        import aggregate
+        count, seed, service_choice, death_rule, workers, as_json = 10000, None, None, False, 1, False
+        i = 2
+        while i < len(sys.argv):
+            arg = sys.argv[i].lower()
+            if arg in ("--help", "-h"):
+                print("Traveller Character Generator - Report Mode Options:")
+                print("  python character_generator.py report                      # Balance statistics over 10000 characters")
+                print("  python character_generator.py report -n 100000 -w 4       # 100000 characters on 4 worker processes")
+                print("  python character_generator.py report -c Navy -d -s 7      # Only Navy, death rule on, seed 7")
+                print("  python character_generator.py report --json              # Full statistics as JSON")
+                sys.exit(0)
+            if arg in ("--death", "-d"):
+                death_rule = True
+                i += 1
+                continue
+            if arg == "--json":
+                as_json = True
+                i += 1
+                continue
+            if arg not in ("--count", "-n", "--seed", "-s", "--career", "-c", "--workers", "-w") or i + 1 >= len(sys.argv):
+                print(f"Unknown or incomplete argument: {sys.argv[i]}")
+                print("Use --help for usage information")
+                sys.exit(1)
+            value = sys.argv[i + 1]
+            if arg in ("--career", "-c"):
+                service_choice = value
+            else:
+                try:
+                    number = int(value)
+                except ValueError:
+                    print(f"Error: {arg} requires a number")
+                    sys.exit(1)
+                if arg in ("--count", "-n"):
+                    count = number
+                elif arg in ("--seed", "-s"):
+                    seed = number
+                else:
+                    workers = number
+            i += 2
+
+        try:
+            result = aggregate.aggregate_batch(count, seed, workers=workers, service_choice=service_choice,
+                                               death_rule_enabled=death_rule)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(json.dumps(result.to_dict(), indent=2) if as_json else result.format_report())
+
+    elif mode == "bench":
+        import bench
+        count, repeat, threshold = bench.DEFAULT_COUNT, bench.DEFAULT_REPEAT, bench.DEFAULT_THRESHOLD
+        history_path, baseline_path = bench.DEFAULT_HISTORY, None
+        options = {'--count': 'count', '-n': 'count', '--repeat': 'repeat', '--threshold': 'threshold',
+                   '--history': 'history', '--baseline': 'baseline'}
+        i = 2
+        while i < len(sys.argv):
+            arg = sys.argv[i].lower()
+            if arg in ("--help", "-h"):
+                print("Traveller Character Generator - Bench Mode Options:")
+                print("  python character_generator.py bench                       # Benchmark every career, death rule off/on")
+                print("  python character_generator.py bench --count 1000          # Characters per scenario (default 300)")
+                print("  python character_generator.py bench --repeat 5            # Timed runs per scenario, best kept (default 3)")
+                print("  python character_generator.py bench --history FILE        # History file (default bench_history.json)")
+                print("  python character_generator.py bench --baseline FILE       # Compare with the last run in FILE")
+                print("  python character_generator.py bench --threshold 5         # Fail if a scenario is 5% slower (default 10)")
+                sys.exit(0)
+            if arg not in options or i + 1 >= len(sys.argv):
+                print(f"Unknown or incomplete argument: {sys.argv[i]}")
+                print("Use --help for usage information")
+                sys.exit(1)
+            value = sys.argv[i + 1]
+            try:
+                if options[arg] == 'count':
+                    count = int(value)
+                elif options[arg] == 'repeat':
+                    repeat = int(value)
+                elif options[arg] == 'threshold':
+                    threshold = float(value) / 100
+            except ValueError:
+                print(f"Error: {arg} requires a number")
+                sys.exit(1)
+            if options[arg] == 'history':
+                history_path = value
+            elif options[arg] == 'baseline':
+                baseline_path = value
+            i += 2
+
+        # Compare with the given baseline, or else the previous run in the history
+        previous = bench.load_history(baseline_path or history_path)
+        baseline = previous[-1] if previous else None
+        run = bench.run_bench(count, repeat, progress=lambda name, result: print(
+            f"  {name:<22} {result['chars_per_sec']:>8.0f} chars/s", file=sys.stderr))
+        bench.append_history(history_path, run)
+        print(bench.format_run(run, baseline))
+        if baseline is None:
+            print(f"No baseline yet; recorded this run in {history_path}")
+        else:
+            regressions = bench.compare(run, baseline, threshold)
+            for name, before, after, change in regressions:
+                print(f"REGRESSION {name}: {before:.0f} -> {after:.0f} chars/s ({change:+.1%})")
+            if regressions:
+                sys.exit(1)
+            print(f"No scenario more than {threshold:.0%} slower than the baseline ({baseline['timestamp']})")
+
     elif mode == "help":
         print("Traveller Character Generator - Usage Options:")
         print("  python character_generator.py                                    # Generate a character (default)")
@@ -1872,11 +2245,16 @@ if __name__ == "__main__":
         print("  python character_generator.py generate --career Navy            # Generate Navy character")
         print("  python character_generator.py generate --seed 123               # Generate with seed 123")
         print("  python character_generator.py generate --json                   # Output in JSON format")
+        print("  python character_generator.py generate --count 1000 --jsonl    # Stream characters as JSON Lines")
+        print("  python character_generator.py generate -n 1000 --library chars.db  # Save characters to a SQLite library")
+        print("  python character_generator.py library chars.db 42              # Look up a saved character")
+        print("  python character_generator.py report -n 10000                  # Balance statistics per career")
+        print("  python character_generator.py bench                             # Benchmark throughput and per-phase costs")
         print("  python character_generator.py test                              # Run all unit tests")
         print("  python character_generator.py test-single <test>                # Run specific test")
         print("  python character_generator.py help                              # Show this help")
         print("\nAvailable careers: Navy, Marines, Army, Scouts, Merchants, Others")
-        print("Available single tests: stats, career, enlistment, survival, ageing, skills, commission, reenlistment, mustering")
+        print("Available single tests: stats, career, enlistment, survival, ageing, skills, commission, reenlistment, mustering, batch, parallel, logging")
     
     else:
         print(f"Unknown mode: {mode}")
@@ -0,0 +1,96 @@
+import re
+from enum import IntEnum
+
+# Integer codes for the values the engine compares and hashes constantly.
+#
+# Careers, skills, skill tables, benefits and event types travel through the
+# engine and its logs as small IntEnum members; str() and format() give the
+# rulebook label, so text output reads as before. to_labels() converts them
+# back to strings at the JSON boundary.
+
+
+class Coded(IntEnum):
+    """IntEnum whose str() and format() give the member's label"""
+
+    @property
+    def label(self):
+        return type(self)._labels[self]
+
+    def __str__(self):
+        return type(self)._labels[self]
+
+    def __format__(self, spec):
+        return format(type(self)._labels[self], spec)
+
+    @classmethod
+    def parse(cls, value):
+        """Member for a member or label; ValueError for anything else"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls._by_label[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown {cls.__name__.lower()} {value!r}") from None
+
+    @classmethod
+    def get(cls, value, default=None):
+        """Member for a member or label, or default"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls._by_label.get(value, default)
+        except TypeError:
+            return default
+
+
+# Coded enum class -> its labels tuple, for exact-type lookups in to_labels
+_LABELS = {}
+
+
+def _identifier(label):
+    return re.sub(r'[^A-Za-z0-9]+', '_', label.replace("'", '')).strip('_').upper() or 'NONE'
+
+
+def coded(name, labels, module=None):
+    """Create a Coded enum with one member per label, numbered from 0 in order"""
+    enum = Coded(name, [(_identifier(label), i) for i, label in enumerate(labels)], module=module or __name__)
+    enum._labels = tuple(labels)
+    enum._by_label = {label: member for label, member in zip(labels, enum)}
+    _LABELS[enum] = enum._labels
+    return enum
+
+
+EventType = coded('EventType', (
+    'enlistment_attempt', 'enlistment_result', 'term_start', 'survival_check', 'death', 'injury',
+    'commission', 'commission_failed', 'promotion', 'promotion_failed', 'reenlistment_attempt',
+    'status_change', 'ageing', 'ageing_check_start', 'ageing_threshold_check', 'ageing_check',
+    'ageing_check_complete', 'mustering_out', 'mustering_out_cash_roll', 'mustering_out_benefit_roll',
+    'mustering_out_characteristic_boost', 'mustering_out_item', 'mustering_out_summary',
+))
+
+
+def labelled(mapping):
+    """Dict with Coded values (and lists of them) replaced by their labels; returned as is if it has none"""
+    result = mapping
+    for key, value in mapping.items():
+        kind = type(value)
+        if kind in _LABELS or kind is list:
+            if result is mapping:
+                result = dict(mapping)
+            result[key] = _LABELS[kind][value] if kind in _LABELS else to_labels(value)
+    return result
+
+
+def to_labels(value):
+    """Replace Coded members anywhere in nested dicts, lists and tuples with their labels"""
+    kind = type(value)
+    labels = _LABELS.get(kind)
+    if labels is not None:
+        return labels[value]
+    if kind is dict:
+        return {to_labels(k): to_labels(v) for k, v in value.items()}
+    if kind is list:
+        return [to_labels(v) for v in value]
+    if kind is tuple:
+        return tuple(to_labels(v) for v in value)
+    return value
@@ -0,0 +1,181 @@
+import json
+import os
+from collections import Counter
+from functools import partial
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+import rules
+from rules import STATS, Career, Skill
+
+# Columnar export of generated populations for NumPy/pandas analysis.
+#
+# A population is written to a directory as two .npy files plus a manifest:
+# characters.npy holds one fixed-width structured record per character and
+# skills.npy a dense (characters, skills) matrix of skill levels, columns in
+# rules.SKILL_NAMES order. Careers are stored as their Career codes (-1 for
+# none); the manifest lists the career and skill names those codes index.
+# Skills outside the rules tables (kept by Character.from_json) have no
+# column: they are skipped, and the manifest counts the characters that had
+# each one under 'unlisted_skills'.
+# load_columns() memory-maps both files, so opening a population costs the
+# same however many characters it holds.
+
+FORMAT = 'traveller-columns'
+VERSION = 1
+MANIFEST = 'manifest.json'
+CHARACTERS_FILE = 'characters.npy'
+SKILLS_FILE = 'skills.npy'
+
+NO_CAREER = -1
+
+CHARACTER_DTYPE = np.dtype([(stat, np.int8) for stat in STATS] + [
+    ('career', np.int8),
+    ('rank', np.int8),
+    ('terms_served', np.float32),  # injured terms count as half
+    ('age', np.int16),
+    ('cash', np.int32),
+    ('drafted', np.bool_),
+    ('commissioned', np.bool_),
+])
+SKILL_DTYPE = np.int8
+
+# Rows converted and written per slice, so memory stays flat for any population size
+CHUNK_SIZE = 65536
+
+
+def _row(character):
+    """(record tuple, {skill id: level}, [unlisted skill names]) for a Character or a to_json() dict"""
+    if isinstance(character, dict):
+        career = character['career']
+        skill_levels = ((s['name'], s['level']) for s in character['skills'])
+        cash = character['mustering_out_benefits'].get('cash', 0)
+        get = character.get
+    else:
+        career = character.career
+        skill_levels = character.skills.items()
+        cash = character.mustering_out_benefits.get('cash', 0)
+        get = partial(getattr, character)
+    skills, unlisted = {}, []
+    for name, level in skill_levels:
+        skill = Skill.get(name)
+        if skill is None:
+            unlisted.append(str(name))
+        else:
+            skills[skill] = level
+    stats = get('characteristics') or {}
+    return (*(stats.get(stat, 0) for stat in STATS),
+            NO_CAREER if career is None else Career.parse(career), get('rank', 0), get('terms_served', 0),
+            get('age', 0), cash, get('drafted', False), get('commissioned', False)), skills, unlisted
+
+
+def _manifest(count, unlisted_skills):
+    return {
+        'format': FORMAT,
+        'version': VERSION,
+        'count': count,
+        'files': {'characters': CHARACTERS_FILE, 'skills': SKILLS_FILE},
+        'characters_dtype': CHARACTER_DTYPE.descr,
+        'careers': [career.label for career in rules.CAREERS],
+        'skills': list(rules.SKILL_NAMES),
+        'skill_table_catalog_version': rules.SKILL_TABLE_CATALOG_VERSION,
+        'unlisted_skills': dict(sorted(unlisted_skills.items())),
+    }
+
+
+def _open_files(directory, count):
+    os.makedirs(directory, exist_ok=True)
+    records = np.lib.format.open_memmap(os.path.join(directory, CHARACTERS_FILE), mode='w+',
+                                        dtype=CHARACTER_DTYPE, shape=(count,))
+    skills = np.lib.format.open_memmap(os.path.join(directory, SKILLS_FILE), mode='w+',
+                                       dtype=SKILL_DTYPE, shape=(count, len(rules.SKILL_NAMES)))
+    return records, skills
+
+
+def _finish(directory, records, skills, unlisted_skills=None):
+    records.flush()
+    skills.flush()
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(_manifest(len(records), unlisted_skills or {}), f, indent=2)
+
+
+def write_columns(directory, characters, count):
+    """Write count characters (Character objects or to_json() dicts, e.g. from generate_batch) as columns"""
+    records, skills = _open_files(directory, count)
+    unlisted_skills = Counter()  # unlisted skill name -> characters that had it (skipped)
+    written = 0
+    rows = []
+    levels = np.zeros((min(CHUNK_SIZE, count), len(rules.SKILL_NAMES)), dtype=SKILL_DTYPE)
+    for character in characters:
+        if written + len(rows) >= count:
+            raise ValueError(f"More than {count} characters given")
+        row, character_skills, unlisted = _row(character)
+        for skill, level in character_skills.items():
+            levels[len(rows), skill] = level
+        unlisted_skills.update(unlisted)
+        rows.append(row)
+        if len(rows) == len(levels):
+            records[written:written + len(rows)] = rows
+            skills[written:written + len(rows)] = levels
+            written += len(rows)
+            rows = []
+            levels[:] = 0
+    if rows:
+        records[written:written + len(rows)] = rows
+        skills[written:written + len(rows)] = levels[:len(rows)]
+        written += len(rows)
+    if written != count:
+        raise ValueError(f"Expected {count} characters, got {written}")
+    _finish(directory, records, skills, unlisted_skills)
+    return written
+
+
+def write_population(directory, population):
+    """Write a population_engine.Population as columns"""
+    records, skills = _open_files(directory, len(population))
+    for stat_index, stat in enumerate(STATS):
+        records[stat] = population.characteristics[:, stat_index]
+    for field in ('career', 'rank', 'age', 'cash', 'drafted', 'commissioned'):
+        records[field] = getattr(population, field)
+    records['terms_served'] = population.terms_served
+    skills[:] = population.skills
+    _finish(directory, records, skills)
+    return len(population)
+
+
+class Columns:
+    """A population loaded by load_columns(): structured records plus the skill matrix"""
+
+    def __init__(self, manifest, characters, skills):
+        self.manifest = manifest
+        self.characters = characters
+        self.skills = skills
+        self.career_names = tuple(manifest['careers'])
+        self.skill_names = tuple(manifest['skills'])
+
+    def __len__(self):
+        return len(self.characters)
+
+    def __getitem__(self, field):
+        """One column of the character records, or a skill's levels by skill name"""
+        if field in self.characters.dtype.names:
+            return self.characters[field]
+        return self.skills[:, self.skill_names.index(field)]
+
+    def upp(self):
+        """(n, 6) int8 characteristics in UPP order"""
+        return structured_to_unstructured(self.characters[list(STATS)])
+
+
+def load_columns(directory, mmap_mode='r'):
+    """Open a population written by write_columns()/write_population(), memory-mapped by default"""
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT or manifest.get('version') != VERSION:
+        raise ValueError(f"Not a {FORMAT} v{VERSION} directory: {directory}")
+    characters = np.load(os.path.join(directory, manifest['files']['characters']), mmap_mode=mmap_mode)
+    skills = np.load(os.path.join(directory, manifest['files']['skills']), mmap_mode=mmap_mode)
+    if len(characters) != manifest['count'] or len(skills) != manifest['count']:
+        raise ValueError(f"Column files in {directory} do not match the manifest count")
+    return Columns(manifest, characters, skills)
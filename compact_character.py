@@ -0,0 +1,289 @@
+import json
+import struct
+import sys
+import zlib
+
+import rules
+from character_generator import LOG_LEVELS, Character, generate_batch
+
+# Memory-compact representation of a finished character.
+#
+# A Character holds two dicts, five growing log lists and a set; a
+# CompactCharacter keeps only small ints and three short bytes objects in
+# __slots__, plus the logs as one zlib blob compressed against a shared
+# dictionary. Conversion to and from the to_json() format is lossless.
+#
+# Footprint target per character, as measured with tracemalloc in
+# test_compact_character.py: <= 1024 bytes with logs (~930 typical) and
+# <= 384 bytes with keep_logs=False (~340 typical), versus ~42 KB for a full
+# Character. A million characters therefore fit in about 1 GB, or 350 MB
+# without logs.
+
+# to_json() keys in output order
+JSON_KEYS = (
+    'name', 'age', 'terms_served', 'characteristics', 'upp', 'career', 'commissioned',
+    'rank', 'drafted', 'died', 'promotions', 'skills', 'career_history', 'ageing_log',
+    'skill_acquisition_log', 'generation_log', 'log_level', 'mustering_out_rolls', 'mustering_out_benefits',
+)
+LOG_KEYS = ('career_history', 'ageing_log', 'skill_acquisition_log', 'generation_log')
+
+_COMMISSIONED = 1
+_DRAFTED = 2
+# Bits 2-3 of _flags hold LOG_LEVELS.index(log_level) + 1, or 0 if the key is absent
+_LOG_SHIFT = 2
+# Bits 4-5 hold died + 1, or 0 if the key is absent (exports made before it was added)
+_DIED_SHIFT = 4
+_NO_CAREER = 255
+
+# to_bytes() record: age, terms x2, name length, cash, blob length, rank, promotions,
+# career, flags, characteristics length, skill count; then the name, characteristics,
+# skill ids in acquisition order, their levels, and the blob
+_RECORD = struct.Struct('<HHHIIBBBBBB')
+
+_zdict = None
+
+
+def dictionary():
+    """Shared zlib dictionary: the logs of a fixed sample of characters, so it changes with the engine"""
+    global _zdict
+    if _zdict is None:
+        sample = generate_batch(32, seed='compact-dictionary')
+        logs = b''.join(json.dumps({k: c[k] for k in LOG_KEYS}, separators=(',', ':')).encode() for c in sample)
+        _zdict = logs[-32768:]  # zlib only uses the last 32 KiB
+    return _zdict
+
+
+def dictionary_id():
+    """CRC-32 of the shared zlib dictionary; blobs only decompress with the dictionary they were made with"""
+    return zlib.crc32(dictionary())
+
+
+def _upp(characteristics):
+    if not characteristics:
+        return "------"  # Placeholder for unrolled characteristics, as in to_json
+    return Character.create_hex_string(Character.convert_characteristics_to_hex(characteristics))
+
+
+def _pack(extra, zdict=None):
+    compressor = zlib.compressobj(9, zdict=zdict or dictionary())
+    return compressor.compress(json.dumps(extra, separators=(',', ':')).encode()) + compressor.flush()
+
+
+def _unpack(blob, zdict=None):
+    decompressor = zlib.decompressobj(zdict=zdict or dictionary())
+    return json.loads(decompressor.decompress(blob) + decompressor.flush())
+
+
+class CompactCharacter:
+    """A finished character in ~1 KB: slots, a 6-byte characteristics array and a skill counter array"""
+
+    __slots__ = ('name', 'age', 'rank', 'promotions', 'cash', '_terms_half', '_career', '_flags',
+                 '_characteristics', '_skill_levels', '_skill_order', '_blob')
+
+    @classmethod
+    def from_json(cls, data, keep_logs=True):
+        """Build from a to_json() dict; keep_logs=False drops the four logs (to_json then returns them empty)"""
+        obj = cls()
+        extra = {}  # anything that does not fit the compact fields, stored in the blob
+        obj.name = sys.intern(data['name'])
+        obj.age = data['age']
+        obj.rank = data['rank']
+        obj.promotions = data['promotions']
+
+        terms = data['terms_served']
+        obj._terms_half = int(terms * 2)
+        if obj._terms_half / 2 != terms or type(terms) is not type(obj.terms_served):
+            extra['terms_served'] = terms
+
+        career = data['career']
+        obj._career = _NO_CAREER if career is None else rules.Career.parse(career)
+        obj._flags = (_COMMISSIONED if data['commissioned'] else 0) | (_DRAFTED if data['drafted'] else 0)
+        log_level = data.get('log_level')
+        if log_level in LOG_LEVELS:
+            obj._flags |= (LOG_LEVELS.index(log_level) + 1) << _LOG_SHIFT
+        elif 'log_level' in data:
+            extra['log_level'] = log_level
+        died = data.get('died')
+        if type(died) is bool:
+            obj._flags |= (died + 1) << _DIED_SHIFT
+        elif 'died' in data:
+            extra['died'] = died
+
+        chars = data['characteristics']
+        if tuple(chars) == rules.STATS and all(type(v) is int and 0 <= v <= 255 for v in chars.values()):
+            obj._characteristics = bytes(chars.values())
+        else:
+            obj._characteristics = b''
+            extra['characteristics'] = chars
+
+        levels = bytearray(len(rules.SKILL_NAMES))
+        order = bytearray()
+        for skill in data['skills']:
+            skill_id = rules.SKILL_INDEX.get(skill['name'])
+            if skill_id is None or not 0 <= skill['level'] <= 255:
+                extra['skills'] = data['skills']
+                levels, order = bytearray(len(rules.SKILL_NAMES)), bytearray()
+                break
+            levels[skill_id] = skill['level']
+            order.append(skill_id)
+        obj._skill_levels = bytes(levels)
+        obj._skill_order = bytes(order)
+
+        benefits = dict(data['mustering_out_benefits'])
+        obj.cash = benefits.pop('cash', 0)
+        extra['mustering_out_benefits'] = benefits
+        if keep_logs:
+            extra.update((key, data[key]) for key in LOG_KEYS)
+        extra.update((key, value) for key, value in data.items() if key not in JSON_KEYS)
+
+        # Derived fields are only stored if they disagree with the derivation
+        if data.get('upp') != _upp(chars):
+            extra['upp'] = data.get('upp')
+        if data.get('mustering_out_rolls') != obj.mustering_out_rolls:
+            extra['mustering_out_rolls'] = data.get('mustering_out_rolls')
+        obj._blob = _pack(extra)
+        return obj
+
+    @classmethod
+    def from_character(cls, character, keep_logs=True):
+        """Compact a Character"""
+        return cls.from_json(character.to_json(), keep_logs)
+
+    @property
+    def mustering_out_rolls(self):
+        # calculate_mustering_out_rolls only reads terms_served and rank, which this class provides
+        return Character.calculate_mustering_out_rolls(self)
+
+    @property
+    def terms_served(self):
+        """Terms served as in Character (x.5 after an injury)"""
+        return self._terms_half // 2 if self._terms_half % 2 == 0 else self._terms_half / 2
+
+    @property
+    def career(self):
+        return None if self._career == _NO_CAREER else rules.CAREERS[self._career].label
+
+    @property
+    def commissioned(self):
+        return bool(self._flags & _COMMISSIONED)
+
+    @property
+    def drafted(self):
+        return bool(self._flags & _DRAFTED)
+
+    @property
+    def died(self):
+        """Killed in service, or None if not recorded"""
+        code = self._flags >> _DIED_SHIFT & 3
+        return bool(code - 1) if code else None
+
+    @property
+    def log_level(self):
+        """Log level the character was generated at, or None if not recorded"""
+        code = self._flags >> _LOG_SHIFT & 3
+        return LOG_LEVELS[code - 1] if code else None
+
+    @property
+    def characteristics(self):
+        """Characteristics as a {stat: value} dict"""
+        if not self._characteristics:
+            return self.extra['characteristics']
+        return dict(zip(rules.STATS, self._characteristics))
+
+    @property
+    def skills(self):
+        """Skills as a {name: level} dict, in acquisition order"""
+        return {rules.SKILL_NAMES[i]: self._skill_levels[i] for i in self._skill_order}
+
+    @property
+    def upp(self):
+        return _upp(self.characteristics)
+
+    @property
+    def extra(self):
+        """The decompressed blob: logs, items and anything the compact fields could not hold"""
+        return _unpack(self._blob)
+
+    def to_json(self):
+        """Rebuild the exact to_json() dict this character was created from"""
+        extra = self.extra
+        data = {
+            'name': self.name,
+            'age': self.age,
+            'terms_served': self.terms_served,
+            'characteristics': dict(zip(rules.STATS, self._characteristics)),
+            'upp': None,
+            'career': self.career,
+            'commissioned': self.commissioned,
+            'rank': self.rank,
+            'drafted': self.drafted,
+            'died': self.died,
+            'promotions': self.promotions,
+            'skills': [{'name': name, 'level': level} for name, level in self.skills.items()],
+            'career_history': [],
+            'ageing_log': [],
+            'skill_acquisition_log': [],
+            'generation_log': [],
+            'log_level': self.log_level,
+            'mustering_out_rolls': self.mustering_out_rolls,
+            'mustering_out_benefits': {'cash': self.cash, **extra.pop('mustering_out_benefits')},
+        }
+        # Fallback values stored in the blob override the compact fields
+        data.update(extra)
+        if data['log_level'] is None and 'log_level' not in extra:
+            del data['log_level']
+        if data['died'] is None and 'died' not in extra:
+            del data['died']
+        if 'upp' not in extra:
+            data['upp'] = _upp(data['characteristics'])
+        return data
+
+    def to_bytes(self, zdict=None):
+        """Serialise to a byte record (see from_bytes), its blob compressed with zdict if given"""
+        name = self.name.encode()
+        levels = bytes(self._skill_levels[i] for i in self._skill_order)
+        blob = self._blob if zdict is None else _pack(self.extra, zdict)
+        return b''.join((
+            _RECORD.pack(self.age, self._terms_half, len(name), self.cash, len(blob), self.rank,
+                         self.promotions, self._career, self._flags, len(self._characteristics),
+                         len(self._skill_order)),
+            name, self._characteristics, self._skill_order, levels, blob,
+        ))
+
+    @classmethod
+    def from_bytes(cls, record, zdict=None):
+        """Rebuild from a to_bytes() record (bytes or a memoryview, e.g. into an mmap) made with zdict"""
+        obj = cls()
+        (obj.age, obj._terms_half, name_len, obj.cash, blob_len, obj.rank, obj.promotions, obj._career,
+         obj._flags, chars_len, skill_count) = _RECORD.unpack_from(record)
+        at = _RECORD.size
+        obj.name = sys.intern(bytes(record[at:at + name_len]).decode())
+        at += name_len
+        obj._characteristics = bytes(record[at:at + chars_len])
+        at += chars_len
+        obj._skill_order = bytes(record[at:at + skill_count])
+        at += skill_count
+        levels = bytearray(len(rules.SKILL_NAMES))
+        for skill_id, level in zip(obj._skill_order, record[at:at + skill_count]):
+            levels[skill_id] = level
+        obj._skill_levels = bytes(levels)
+        at += skill_count
+        obj._blob = bytes(record[at:at + blob_len])
+        if zdict is not None:
+            obj._blob = _pack(_unpack(obj._blob, zdict))
+        return obj
+
+    def to_character(self):
+        """Expand back into a full Character"""
+        return Character.from_json(self.to_json())
+
+    def nbytes(self):
+        """Bytes owned by this object (the interned name and small ints are shared)"""
+        return sys.getsizeof(self) + sum(sys.getsizeof(b) for b in (
+            self._characteristics, self._skill_levels, self._skill_order, self._blob))
+
+
+def compact_batch(n, keep_logs=True, **batch_options):
+    """generate_batch() yielding CompactCharacter objects; batch_options are passed through"""
+    for data in generate_batch(n, **batch_options):
+        yield CompactCharacter.from_json(data, keep_logs)
@@ -0,0 +1,232 @@
+import hashlib
+import random
+
+# Pluggable dice backends.
+#
+# A Character rolls through any object with randint(a, b) and choice(seq): the
+# random module itself (the default, shared global state), a random.Random
+# instance, or one of the generators below. NumpyDice and CounterDice also
+# support keyed substreams and jump-ahead, so the generator for character #N
+# of a run can be derived in O(1) without replaying characters 0..N-1.
+
+BACKENDS = ('random', 'pcg64', 'philox', 'counter', 'stream')
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def seed_to_int(seed):
+    """Map any seed (non-negative int or anything with a str) to a stable integer"""
+    if isinstance(seed, int) and seed >= 0:
+        return seed
+    return int.from_bytes(hashlib.sha256(str(seed).encode()).digest()[:16], 'little')
+
+
+def _mix64(x):
+    """SplitMix64 finalizer: a bijective avalanche hash of a 64-bit integer"""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+class CounterDice:
+    """Counter-based generator: draw i of a stream is a keyed hash of i, so jumps and substreams are O(1)"""
+
+    def __init__(self, seed=0, key=0, counter=0):
+        self.seed = seed
+        self.key = key
+        self.counter = counter
+        base = seed_to_int(seed)
+        self._k1 = _mix64((base ^ _mix64(key * _GOLDEN_GAMMA & _MASK64)) & _MASK64)
+        self._k2 = _mix64((self._k1 + _GOLDEN_GAMMA + (base >> 64)) & _MASK64)
+
+    def next64(self):
+        """Return the next raw 64-bit output"""
+        x = _mix64(_mix64(self.counter ^ self._k1) + self._k2 & _MASK64)
+        self.counter += 1
+        return x
+
+    def randint(self, a, b):
+        """Uniform integer in [a, b], by rejection so every value is exactly equally likely"""
+        n = b - a + 1
+        limit = (1 << 64) - (1 << 64) % n
+        while True:
+            x = self.next64()
+            if x < limit:
+                return a + x % n
+
+    def choice(self, seq):
+        """Uniformly chosen element of a non-empty sequence"""
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def jump(self, n):
+        """Skip ahead n raw outputs"""
+        self.counter += n
+
+    def substream(self, key):
+        """Independent generator keyed by key (e.g. a character index)"""
+        return CounterDice(self.seed, _mix64((self.key * _GOLDEN_GAMMA + key + 1) & _MASK64))
+
+
+class NumpyDice:
+    """Adapter giving a NumPy PCG64 or Philox Generator the randint/choice interface"""
+
+    BIT_GENERATORS = ('pcg64', 'philox')
+
+    def __init__(self, seed=0, key=(), bit_generator='pcg64'):
+        import numpy as np
+
+        if bit_generator not in self.BIT_GENERATORS:
+            raise ValueError(f"Unknown bit generator '{bit_generator}'")
+        self.seed = seed
+        self.key = tuple(key)
+        self.bit_generator = bit_generator
+        # SeedSequence spawn keys give statistically independent child streams
+        sequence = np.random.SeedSequence(seed_to_int(seed), spawn_key=self.key)
+        bit_class = np.random.PCG64 if bit_generator == 'pcg64' else np.random.Philox
+        self._bits = bit_class(sequence)
+        self._generator = np.random.Generator(self._bits)
+
+    def randint(self, a, b):
+        """Uniform integer in [a, b]"""
+        return int(self._generator.integers(a, b, endpoint=True))
+
+    def choice(self, seq):
+        """Uniformly chosen element of a non-empty sequence"""
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[int(self._generator.integers(len(seq)))]
+
+    def jump(self, n):
+        """Skip ahead n steps of the bit generator (one 64-bit output for PCG64, one 4-output counter block for Philox)"""
+        self._bits.advance(n)
+
+    def substream(self, key):
+        """Independent generator keyed by key (e.g. a character index)"""
+        return NumpyDice(self.seed, self.key + (key,), self.bit_generator)
+
+
+# Byte -> d6 decoding for DiceStream: bytes 0..251 map to 1..6 via b % 6 + 1
+# and 252..255 are rejected (deleted), so every face is exactly 42/252 likely
+_D6_TABLE = bytes(b % 6 + 1 if b < 252 else 0 for b in range(256))
+_D6_REJECT = bytes(range(252, 256))
+
+
+class HashBytes:
+    """Counter-mode BLAKE2b byte source: block i of a stream is BLAKE2b keyed by the seed over i"""
+
+    BLOCK = 64
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self._key = hashlib.blake2b(str(seed).encode(), digest_size=32).digest()
+        self.counter = 0
+
+    def randbytes(self, n):
+        """Return the next n bytes of the stream (whole blocks are consumed)"""
+        start = self.counter
+        self.counter += -(-n // self.BLOCK)
+        return b''.join(hashlib.blake2b(i.to_bytes(8, 'little'), key=self._key).digest()
+                        for i in range(start, self.counter))[:n]
+
+
+class DiceStream:
+    """Dice decoded in bulk from blocks of random bytes instead of one randint call per die.
+
+    source is anything with randbytes(n) (random.Random, the random module,
+    HashBytes) or bytes(n) (a NumPy Generator); by default a HashBytes(seed),
+    which is cheap to key per character. d6 rolls
+    come from a pre-decoded buffer; other ranges use rejection sampling on raw
+    bytes, so every result is exactly uniform. Blocks start small and double
+    up to block_size, so a short-lived per-character stream (~50 dice) does
+    not pay for randomness it never uses.
+    """
+
+    INITIAL_BLOCK = 64
+
+    def __init__(self, seed=None, source=None, block_size=4096):
+        if source is None:
+            source = HashBytes(seed if seed is not None else random.SystemRandom().randrange(2**63))
+        self.seed = seed
+        self.source = source
+        self.block_size = block_size
+        self._read = source.randbytes if hasattr(source, 'randbytes') else source.bytes
+        self._d6_block = self._raw_block = min(self.INITIAL_BLOCK, block_size)
+        self._next_d6 = iter(()).__next__
+        self._raw = b''
+        self._raw_pos = 0
+
+    def _refill_d6(self):
+        data = self._read(self._d6_block)
+        self._d6_block = min(2 * self._d6_block, self.block_size)
+        self._next_d6 = iter(data.translate(_D6_TABLE, _D6_REJECT)).__next__
+
+    def d6(self):
+        """Roll one d6"""
+        try:
+            return self._next_d6()
+        except StopIteration:
+            self._refill_d6()
+            return self._next_d6()
+
+    def roll_2d6(self):
+        """Roll 2d6"""
+        return self.d6() + self.d6()
+
+    def _byte(self):
+        if self._raw_pos >= len(self._raw):
+            self._raw = self._read(self._raw_block)
+            self._raw_block = min(2 * self._raw_block, self.block_size)
+            self._raw_pos = 0
+        b = self._raw[self._raw_pos]
+        self._raw_pos += 1
+        return b
+
+    def _below(self, n):
+        """Uniform integer in [0, n)"""
+        if n <= 256:
+            limit = 256 - 256 % n
+            while True:
+                b = self._byte()
+                if b < limit:
+                    return b % n
+        # Wider ranges (not used by the rules tables) take as many bytes as needed
+        width = (n.bit_length() + 7) // 8
+        limit = (1 << 8 * width) - (1 << 8 * width) % n
+        while True:
+            x = int.from_bytes(bytes(self._byte() for _ in range(width)), 'little')
+            if x < limit:
+                return x % n
+
+    def randint(self, a, b):
+        """Uniform integer in [a, b]"""
+        if a == 1 and b == 6:
+            return self.d6()
+        return a + self._below(b - a + 1)
+
+    def choice(self, seq):
+        """Uniformly chosen element of a non-empty sequence"""
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[self._below(len(seq))]
+
+    def substream(self, key):
+        """Independent stream keyed by key (e.g. a character index)"""
+        return DiceStream(f"{self.seed}:{key}", block_size=self.block_size)
+
+
+def make_rng(backend='random', seed=None):
+    """Create a generator for one of BACKENDS; seed=None draws a fresh seed from the OS"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown RNG backend '{backend}'. Available: {', '.join(BACKENDS)}")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+    if backend == 'random':
+        return random.Random(seed)
+    if backend == 'counter':
+        return CounterDice(seed)
+    if backend == 'stream':
+        return DiceStream(seed)
+    return NumpyDice(seed, bit_generator=backend)
@@ -0,0 +1,194 @@
+from codes import _LABELS, EventType, to_labels
+from rules import Skill, SkillTable
+
+# One append-only store of everything a Character records while it is generated.
+#
+# Every fact is stored once, as a tuple whose first item says what it is:
+# generation events start with their EventType code; skill gains, skill roll
+# batches and ageing results use the private kinds below. Event payload dicts
+# are stored as a shared key tuple plus a tuple of values. generation_log,
+# skill_acquisition_log, ageing_log and term_log are views rebuilt from the
+# records on demand, in exactly the shape the old per-purpose lists had.
+#
+# Records are indexed by term as they are appended: each change of term starts
+# a run, and `terms` maps a term to its runs, so one term's records are sliced
+# out without scanning the rest of the history.
+
+# Record kinds besides EventType codes
+SKILL = 100      # (SKILL, term, event, table, roll, skill, level, description)
+ROLLS = 101      # (ROLLS, term, age): closes one roll_for_skills batch for term_log
+AGEING = 102     # (AGEING, term, age, effects, logged): logged puts it in generation_log too
+TERM_ENTRY = 103  # (TERM_ENTRY, entry): a term_log entry loaded as is by from_logs
+STATE = 104      # (STATE, term, age, rank, commissioned, stats, stat values, skills, skill levels): end of a term
+# Generation events are (EventType, term, age, keys, values)
+
+_EVENT_TYPES = EventType._labels
+_EVENT_CODES = tuple(EventType)
+
+# Shared key tuples, so equal payload shapes are stored once
+_shapes = {}
+
+
+# Value types _labelled_dict() has to convert
+_CONVERTED = frozenset(_LABELS) | {dict, list, tuple}
+
+
+def _labelled_dict(keys, values):
+    """dict(zip(keys, values)) with codes replaced by their names, for JSON"""
+    if _CONVERTED.isdisjoint(map(type, values)):
+        return dict(zip(keys, values))
+    result = dict(zip(keys, values))
+    for key, value in result.items():
+        labels = _LABELS.get(type(value))
+        if labels is not None:
+            result[key] = labels[value]
+        elif type(value) in _CONVERTED:
+            result[key] = to_labels(value)
+    return result
+
+
+def _plain_dict(keys, values):
+    return dict(zip(keys, values))
+
+
+def _same(value):
+    return value
+
+
+class EventStore:
+    """Append-only record of a character's generation, with the old logs as views"""
+
+    __slots__ = ('records', 'terms', '_starts', '_term')
+
+    def __init__(self):
+        self.records = []
+        self.terms = {}     # term -> indexes into _starts of that term's runs
+        self._starts = []   # record offset where each run starts
+        self._term = None   # term of the current run
+
+    def __len__(self):
+        return len(self.records)
+
+    # --- RECORDING ---
+
+    def _add(self, term, record):
+        if term != self._term:
+            self._term = term
+            self.terms.setdefault(term, []).append(len(self._starts))
+            self._starts.append(len(self.records))
+        self.records.append(record)
+
+    def event(self, event_type, term, age, data):
+        """Record a generation_log event"""
+        keys = tuple(data)
+        self._add(term, (event_type, term, age, _shapes.get(keys) or _shapes.setdefault(keys, keys),
+                         tuple(data.values())))
+
+    def skill(self, term, event, table, roll, skill, level, description):
+        """Record a skill or characteristic gain (a skill_acquisition_log entry)"""
+        self._add(term, (SKILL, term, event, table, roll, skill, level, description))
+
+    def rolls(self, term, age):
+        """Close a batch of skill table rolls; the rolls since the last batch form one term_log entry"""
+        self._add(term, (ROLLS, term, age))
+
+    def ageing(self, term, age, effects, logged):
+        """Record ageing losses (an ageing_log entry, and an 'ageing' event if logged)"""
+        self._add(term, (AGEING, term, age, effects, logged))
+
+    def state(self, term, age, rank, commissioned, characteristics, skills):
+        """Record a checkpoint of the character at the end of a term"""
+        keys = tuple(characteristics)
+        self._add(term, (STATE, term, age, rank, commissioned, _shapes.get(keys) or _shapes.setdefault(keys, keys),
+                         tuple(characteristics.values()), tuple(skills), tuple(skills.values())))
+
+    @classmethod
+    def from_logs(cls, generation_log=(), ageing_log=(), skill_acquisition_log=(), term_log=()):
+        """Build a store from logs in the view format (as loaded by Character.from_json)"""
+        store = cls()
+        for event in generation_log:
+            store.event(EventType.get(event['event_type'], event['event_type']), event['term'], event['age'], event['data'])
+        for entry in ageing_log:
+            store.ageing(entry['term'], entry['age'], entry['effects'], False)
+        for entry in skill_acquisition_log:
+            table, skill = entry['table'], entry['skill']
+            store.skill(entry['term'], entry['event'], SkillTable.get(table, table), entry['roll'],
+                        Skill.get(skill, skill), entry['level'], entry['description'])
+        for entry in term_log:
+            store._add(entry.get('term'), (TERM_ENTRY, entry))
+        return store
+
+    def count_events(self):
+        """Number of generation_log entries, without building them"""
+        return sum(1 for record in self.records if record[0] < SKILL or record[0] == AGEING and record[4])
+
+    # --- LOOKUP BY TERM ---
+
+    def for_term(self, term):
+        """The records of one term, in recording order"""
+        starts, records = self._starts, self.records
+        result = []
+        for run in self.terms.get(term, ()):
+            end = starts[run + 1] if run + 1 < len(starts) else len(records)
+            result += records[starts[run]:end]
+        return result
+
+    def state_at(self, term):
+        """{'term', 'age', 'rank', 'commissioned', 'characteristics', 'skills'} checkpointed for a term, or None"""
+        for record in reversed(self.for_term(term)):
+            if record[0] == STATE:
+                _, term, age, rank, commissioned, stats, values, skills, levels = record
+                return {'term': term, 'age': age, 'rank': rank, 'commissioned': commissioned,
+                        'characteristics': dict(zip(stats, values)), 'skills': dict(zip(skills, levels))}
+        return None
+
+    # --- VIEWS ---
+
+    def generation_log(self, labels=False, term=None):
+        """[{'event_type', 'term', 'age', 'data'}]; labels=True gives names instead of codes, term limits it to one term"""
+        if labels:
+            names, build, ageing = _EVENT_TYPES, _labelled_dict, 'ageing'
+        else:
+            names, build, ageing = _EVENT_CODES, _plain_dict, EventType.AGEING
+        result = []
+        append = result.append
+        for record in self.records if term is None else self.for_term(term):
+            kind = record[0]
+            if kind < SKILL:
+                append({'event_type': names[kind], 'term': record[1], 'age': record[2],
+                        'data': build(record[3], record[4])})
+            elif kind == AGEING and record[4]:
+                _, term, age, effects, _ = record
+                append({'event_type': ageing, 'term': term, 'age': age,
+                        'data': {'term': term, 'age': age, 'effects': effects}})
+        return result
+
+    def skill_acquisition_log(self, labels=False, term=None):
+        """[{'term', 'event', 'table', 'roll', 'skill', 'level', 'description'}], optionally for one term"""
+        name = str if labels else _same
+        return [{'term': r[1], 'event': r[2], 'table': name(r[3]), 'roll': r[4],
+                 'skill': name(r[5]), 'level': r[6], 'description': r[7]}
+                for r in (self.records if term is None else self.for_term(term)) if r[0] == SKILL]
+
+    def ageing_log(self):
+        """[{'term', 'age', 'effects'}] for every term with ageing losses"""
+        return [{'term': r[1], 'age': r[2], 'effects': r[3]} for r in self.records if r[0] == AGEING]
+
+    def term_log(self):
+        """[{'term', 'age', 'skills': [(table, result)], 'ageing'}], one entry per batch of skill rolls"""
+        entries = []
+        rolls = []
+        for record in self.records:
+            kind = record[0]
+            if kind == SKILL and record[4] is not None:
+                # The table result as rolled: a Skill, or a characteristic gain such as '+1 END'
+                rolls.append((record[3], record[5]))
+            elif kind == ROLLS:
+                entries.append({'term': record[1], 'age': record[2], 'skills': rolls, 'ageing': []})
+                rolls = []
+            elif kind == AGEING and entries and entries[-1]['term'] == record[1]:
+                # Ageing effects go to the latest entry if it is for the same term
+                entries[-1]['ageing'] = record[3]
+            elif kind == TERM_ENTRY:
+                entries.append(record[1])
+        return entries
@@ -0,0 +1,151 @@
+import time
+
+import character_generator
+from character_generator import Character
+
+# Optional instrumentation of the generation engine.
+#
+# Disabled (the default) it costs one `is None` check per character and per
+# write_jsonl() chunk: nothing is wrapped or counted. While an Instrumentation
+# is enabled, every Character's dice source is wrapped in a counter, the
+# Character phase functions below are wrapped in timers, and finished
+# characters, logged events and serialised bytes are counted. stats() returns
+# the totals as a dict; generate_batch() with workers > 1 merges in the
+# workers' stats.
+
+# phase -> the Character functions whose time and calls it counts (none of them calls another)
+PHASES = {
+    'characteristics': ('generate_characteristics',),
+    'enlistment': ('attempt_enlistment',),
+    'survival': ('check_survival',),
+    'commission_promotion': ('check_commission', 'check_promotion'),
+    'skill_rolls': ('roll_for_skills_detailed', 'grant_automatic_enlistment_skill',
+                    'grant_automatic_commission_skill', 'grant_automatic_rank_skill'),
+    'ageing': ('check_ageing',),
+    'reenlistment': ('attempt_reenlistment',),
+    'mustering_out': ('roll_mustering_out',),
+    'to_json': ('to_json',),
+}
+COUNTERS = ('characters', 'dice_rolls', 'random_choices', 'events_logged', 'bytes_serialised')
+
+
+class CountingDice:
+    """Dice source wrapper that counts randint() and choice() calls"""
+
+    __slots__ = ('rng', 'counters')
+
+    def __init__(self, rng, counters):
+        self.rng = rng
+        self.counters = counters
+
+    def randint(self, a, b):
+        self.counters['dice_rolls'] += 1
+        return self.rng.randint(a, b)
+
+    def choice(self, seq):
+        self.counters['random_choices'] += 1
+        return self.rng.choice(seq)
+
+    def __getattr__(self, name):
+        return getattr(self.rng, name)
+
+
+def _timed(func, seconds, calls, phase):
+    clock = time.perf_counter
+
+    def timed(*args, **kwargs):
+        calls[phase] += 1
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds[phase] += clock() - start
+    return timed
+
+
+class Instrumentation:
+    """Counters and per-phase timers for the engine; use as a context manager or enable()/disable()"""
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.wall_seconds = 0.0
+        self._saved = {}
+        self._started = None
+
+    # --- ENGINE HOOKS ---
+
+    def dice(self, rng):
+        """Wrap a Character's dice source (called from Character.__init__)"""
+        return CountingDice(rng, self.counters)
+
+    def character_done(self, character):
+        """Count a finished character (called at the end of generate_character)"""
+        self.counters['characters'] += 1
+        self.counters['events_logged'] += character.events.count_events()
+
+    def serialised(self, nbytes):
+        """Count bytes of characters written out"""
+        self.counters['bytes_serialised'] += nbytes
+
+    def _wrap(self, func, phase):
+        """Timed replacement for a phase function"""
+        return _timed(func, self.phase_seconds, self.phase_calls, phase)
+
+    # --- CONTROL ---
+
+    def enable(self):
+        if character_generator._instrumentation is not None:
+            raise RuntimeError("Another Instrumentation is already enabled")
+        for phase, names in PHASES.items():
+            for name in names:
+                original = Character.__dict__[name]
+                self._saved[name] = original
+                if isinstance(original, staticmethod):
+                    wrapped = staticmethod(self._wrap(original.__func__, phase))
+                else:
+                    wrapped = self._wrap(original, phase)
+                setattr(Character, name, wrapped)
+        character_generator._instrumentation = self
+        self._started = time.perf_counter()
+        return self
+
+    def disable(self):
+        if self._started is None:
+            return
+        self.wall_seconds += time.perf_counter() - self._started
+        self._started = None
+        character_generator._instrumentation = None
+        for name, original in self._saved.items():
+            setattr(Character, name, original)
+        self._saved.clear()
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    # --- RESULTS ---
+
+    def stats(self):
+        """Totals so far: counters, terms_simulated, per-phase calls and seconds, and wall time enabled"""
+        wall = self.wall_seconds
+        if self._started is not None:
+            wall += time.perf_counter() - self._started
+        return {
+            **self.counters,
+            'terms_simulated': self.phase_calls['survival'],
+            'phase_calls': dict(self.phase_calls),
+            'phase_seconds': dict(self.phase_seconds),
+            'wall_seconds': wall,
+        }
+
+    def merge(self, stats):
+        """Add another stats() dict (e.g. from a worker process) into these totals"""
+        for name in COUNTERS:
+            self.counters[name] += stats[name]
+        for phase in PHASES:
+            self.phase_calls[phase] += stats['phase_calls'][phase]
+            self.phase_seconds[phase] += stats['phase_seconds'][phase]
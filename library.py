@@ -0,0 +1,142 @@
+import json
+import sqlite3
+import threading
+
+import rules
+from character_generator import generate_batch
+
+# Queryable character library in SQLite.
+#
+# One row per character: the full to_json() dict as a compact JSON blob, plus
+# the columns searches filter on (career, rank, terms, age, the six
+# characteristics, UPP, cash), each indexed. The database runs in WAL mode, so
+# readers do not block the writer, and bulk saves go through executemany() in
+# one transaction per batch. Characters are fetched by their integer id (the
+# rowid), so get() is a single primary-key lookup however big the library is.
+#
+# The web app's per-session state dicts can be saved too: they use
+# 'service' for the career and long characteristic names.
+
+DEFAULT_PATH = 'characters.db'
+BATCH_SIZE = 1000
+
+# Characteristic columns, in UPP order; web state uses the long names as keys
+CHARACTERISTICS = ('strength', 'dexterity', 'endurance', 'intelligence', 'education', 'social')
+_STAT_KEYS = dict(zip(CHARACTERISTICS, rules.STATS))
+
+COLUMNS = ('name', 'career', 'rank', 'terms_served', 'age') + CHARACTERISTICS + ('upp', 'cash', 'data')
+INDEXED = ('career, rank', 'rank', 'terms_served', 'upp', 'cash') + CHARACTERISTICS
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS characters ("
+    "id INTEGER PRIMARY KEY, name TEXT, career TEXT, rank INTEGER, terms_served REAL, age INTEGER, "
+    + ''.join(f"{column} INTEGER, " for column in CHARACTERISTICS)
+    + "upp TEXT, cash INTEGER, data TEXT NOT NULL)"
+)
+_INSERT = f"INSERT INTO characters ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def _row(data):
+    """Column values for a to_json() dict (or a web app state dict)"""
+    characteristics = data.get('characteristics') or {}
+    stats = [characteristics.get(short, characteristics.get(long)) for long, short in _STAT_KEYS.items()]
+    upp = data.get('upp')
+    if upp is None:
+        upp = ''.join('-' if v is None else format(v, 'X') for v in stats)
+    career = data.get('career') or data.get('service')
+    benefits = data.get('mustering_out_benefits') or {}
+    return (data.get('name'), career, data.get('rank', 0), data.get('terms_served', 0), data.get('age'),
+            *stats, upp, benefits.get('cash', 0), json.dumps(data, separators=(',', ':')))
+
+
+class Library:
+    """SQLite character library; use as a context manager or call close()"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        # One connection shared by every thread (e.g. Flask's), used under a lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            for columns in INDEXED:
+                name = 'ix_characters_' + columns.replace(', ', '_')
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON characters ({columns})")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+
+    # --- SAVING ---
+
+    def save(self, character):
+        """Store one character (Character or to_json() dict); returns its id"""
+        data = character if isinstance(character, dict) else character.to_json()
+        with self._lock, self._connection as connection:
+            return connection.execute(_INSERT, _row(data)).lastrowid
+
+    def save_many(self, characters, batch_size=BATCH_SIZE):
+        """Store characters (Characters or dicts) in transactions of batch_size rows; returns the count"""
+        count = 0
+        batch = []
+        for character in characters:
+            batch.append(_row(character if isinstance(character, dict) else character.to_json()))
+            if len(batch) >= batch_size:
+                count += self._insert(batch)
+                batch = []
+        if batch:
+            count += self._insert(batch)
+        return count
+
+    def _insert(self, rows):
+        with self._lock, self._connection as connection:
+            connection.executemany(_INSERT, rows)
+        return len(rows)
+
+    def save_batch(self, n, batch_size=BATCH_SIZE, **options):
+        """Generate n characters with generate_batch(n, **options) and store them; returns the count"""
+        return self.save_many(generate_batch(n, **options), batch_size)
+
+    # --- LOOKUP ---
+
+    def get(self, character_id):
+        """The stored dict for an id, or None"""
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM characters WHERE id = ?", (character_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def find(self, career=None, min_rank=None, min_terms=None, min_cash=None, upp=None, limit=50, **min_stats):
+        """Summaries (id, name, career, rank, terms_served, age, upp, cash) of matching characters, by id.
+
+        min_stats are lower bounds on characteristics, e.g. strength=10.
+        """
+        clauses, params = [], []
+        for column, op, value in (('career', '=', career), ('rank', '>=', min_rank),
+                                  ('terms_served', '>=', min_terms), ('cash', '>=', min_cash), ('upp', '=', upp)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        for column, value in min_stats.items():
+            if column not in CHARACTERISTICS:
+                raise ValueError(f"Unknown characteristic '{column}'")
+            clauses.append(f"{column} >= ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        query = ("SELECT id, name, career, rank, terms_served, age, upp, cash FROM characters"
+                 f"{where} ORDER BY id LIMIT ?")
+        with self._lock:
+            cursor = self._connection.execute(query, params + [limit])
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
@@ -0,0 +1,337 @@
+import numpy as np
+
+import rules
+from rules import STATS, Benefit, Career, Skill
+
+# --- LOOKUP ARRAYS ---
+# The tables in rules.py flattened into arrays indexed by the Career, Skill
+# and SkillTable codes, so a whole population can be advanced with masks
+# instead of loops.
+
+STAT_INDEX = {stat: i for i, stat in enumerate(STATS)}
+# Career names by code (population arrays hold the codes)
+CAREERS = tuple(career.label for career in rules.CAREERS)
+CAREER_INDEX = {career: i for i, career in enumerate(CAREERS)}
+SKILL_TABLES = rules.SKILL_TABLE_NAMES
+
+OUTCOME_DISCHARGED = 0
+OUTCOME_INJURED = 1
+OUTCOME_DIED = 2
+OUTCOMES = ('discharged', 'injured', 'died')
+
+# Characteristic requirement that can never be met (pads careers without a bonus)
+NEVER = 127
+
+ENLISTMENT_TARGET = np.array([rules.ENLISTMENT_TARGET[c] for c in rules.CAREERS], dtype=np.int8)
+SURVIVAL_TARGET = np.array([rules.SURVIVAL_TARGET[c] for c in rules.CAREERS], dtype=np.int8)
+REENLISTMENT_TARGET = np.array([rules.REENLISTMENT_TARGET[c] for c in rules.CAREERS], dtype=np.int8)
+
+
+def _modifier_arrays(modifiers):
+    """Pack a {career: (stat, requirement)} +1 modifier table into (stat, req) arrays"""
+    stat = np.array([STAT_INDEX[modifiers[c][0]] if c in modifiers else 0 for c in rules.CAREERS])
+    req = np.array([modifiers[c][1] if c in modifiers else NEVER for c in rules.CAREERS], dtype=np.int8)
+    return stat, req
+
+
+# Commission and promotion targets/modifiers (as in check_commission and the
+# promotion step of generate_character); 0 target = career has no commissions
+COMMISSION_TARGET = np.array([rules.COMMISSION_TARGET.get(c, 0) for c in rules.CAREERS], dtype=np.int8)
+COMMISSION_MOD_STAT, COMMISSION_MOD_REQ = _modifier_arrays(rules.COMMISSION_MODIFIER)
+PROMOTION_TARGET = np.array([rules.PROMOTION_TARGET.get(c, 0) for c in rules.CAREERS], dtype=np.int8)
+PROMOTION_MOD_STAT, PROMOTION_MOD_REQ = _modifier_arrays(rules.PROMOTION_MODIFIER)
+MAX_RANK = np.array([rules.MAX_RANK.get(c, 0) for c in rules.CAREERS], dtype=np.int8)
+
+
+def _bonus_arrays(bonuses, width):
+    """Pack a {career: {stat: (req, bonus)}} table into (careers, width) arrays"""
+    stat = np.zeros((len(CAREERS), width), dtype=np.intp)
+    req = np.full((len(CAREERS), width), NEVER, dtype=np.int8)
+    bonus = np.zeros((len(CAREERS), width), dtype=np.int8)
+    for career in rules.CAREERS:
+        for j, (attr, (r, b)) in enumerate(bonuses[career].items()):
+            stat[career, j], req[career, j], bonus[career, j] = STAT_INDEX[attr], r, b
+    return stat, req, bonus
+
+
+ENLISTMENT_BONUS_STAT, ENLISTMENT_BONUS_REQ, ENLISTMENT_BONUS = _bonus_arrays(rules.ENLISTMENT_BONUSES, 2)
+SURVIVAL_BONUS_STAT, SURVIVAL_BONUS_REQ, SURVIVAL_BONUS = _bonus_arrays(rules.SURVIVAL_BONUSES, 1)
+
+
+def _build_skill_tables():
+    """Encode skill tables as (career, table, d6-1) codes: Skill code >= 0, or -(stat + 1) for '+1 STAT'"""
+    codes = np.zeros((len(CAREERS), len(SKILL_TABLES), 6), dtype=np.int16)
+    for career in rules.CAREERS:
+        for table in SKILL_TABLES:
+            for roll, result in enumerate(rules.SKILL_RESULTS[career][table]):
+                codes[career, table, roll] = -(STAT_INDEX[result] + 1) if type(result) is str else result
+    return codes
+
+
+SKILL_NAMES, SKILL_INDEX = rules.SKILL_NAMES, rules.SKILL_INDEX
+SKILL_TABLE_CODES = _build_skill_tables()
+
+# Automatic skills: (career, skill) on enlistment/draft and on commission
+ENLISTMENT_SKILL = np.array([rules.ENLISTMENT_SKILL.get(c, -1) for c in rules.CAREERS])
+COMMISSION_SKILL = np.array([rules.COMMISSION_SKILL.get(c, -1) for c in rules.CAREERS])
+
+
+def _build_mustering_tables():
+    """Cash and benefit tables indexed by (career, roll - 1)"""
+    benefits_used = {b for t in rules.BENEFIT_TABLE.values() for b in t.values()} | {rules.DEFAULT_BENEFIT}
+    items = sorted(b.label for b in benefits_used if b not in rules.BENEFIT_BOOST and b != Benefit.NONE)
+    item_index = {Benefit.parse(item): i for i, item in enumerate(items)}
+
+    cash = np.zeros((len(CAREERS), 7), dtype=np.int32)
+    # Benefit codes: item id >= 0, -1 for '-', or -(10 * (stat + 1) + boost) for a characteristic boost
+    benefits = np.zeros((len(CAREERS), 7), dtype=np.int16)
+    for career in rules.CAREERS:
+        for roll in range(1, 8):
+            cash[career, roll - 1] = rules.CASH_TABLE[career].get(roll, 0)
+            benefit = rules.BENEFIT_TABLE[career].get(roll, rules.DEFAULT_BENEFIT)
+            if benefit == Benefit.NONE:
+                benefits[career, roll - 1] = -1
+            elif benefit in rules.BENEFIT_BOOST:
+                stat, boost = rules.BENEFIT_BOOST[benefit]
+                benefits[career, roll - 1] = -(10 * (STAT_INDEX[stat] + 1) + boost)
+            else:
+                benefits[career, roll - 1] = item_index[benefit]
+    return tuple(items), cash, benefits
+
+
+BENEFIT_ITEMS, CASH_TABLE, BENEFIT_TABLE = _build_mustering_tables()
+
+ADVANCED_AGEING_AGE = rules.ADVANCED_AGEING_AGE
+
+
+def _indexed_checks(checks):
+    """Replace stat names in (stat, target, loss) ageing checks with STATS indices"""
+    return tuple((STAT_INDEX[stat], target, loss) for stat, target, loss in checks)
+
+
+# (phase start age, phase end age, [(stat, target, loss)]) as in apply_ageing_effects/apply_advanced_ageing_effects
+AGEING_PHASES = (
+    (rules.AGEING_PHASE_1_AGES[0], rules.AGEING_PHASE_1_AGES[-1], _indexed_checks(rules.AGEING_PHASE_1_CHECKS)),
+    (rules.AGEING_PHASE_2_AGES[0], rules.AGEING_PHASE_2_AGES[-1], _indexed_checks(rules.AGEING_PHASE_2_CHECKS)),
+    (ADVANCED_AGEING_AGE, None, _indexed_checks(rules.ADVANCED_AGEING_CHECKS)),
+)
+
+
+# --- POPULATION ---
+
+class Population:
+    """Struct-of-arrays view of N generated characters"""
+
+    def __init__(self, n):
+        self.size = n
+        self.characteristics = np.zeros((n, len(STATS)), dtype=np.int8)
+        self.service_choice = np.zeros(n, dtype=np.int8)
+        self.career = np.zeros(n, dtype=np.int8)
+        self.drafted = np.zeros(n, dtype=bool)
+        self.commissioned = np.zeros(n, dtype=bool)
+        self.rank = np.zeros(n, dtype=np.int8)
+        self.promotions = np.zeros(n, dtype=np.int8)
+        self.terms_half = np.zeros(n, dtype=np.int16)  # Terms served x2 (injury adds half a term)
+        self.age = np.full(n, 18, dtype=np.int16)
+        self.outcome = np.zeros(n, dtype=np.int8)
+        self.skills = np.zeros((n, len(SKILL_NAMES)), dtype=np.int8)
+        self.cash = np.zeros(n, dtype=np.int32)
+        self.items = np.zeros((n, len(BENEFIT_ITEMS)), dtype=np.int16)
+
+    @property
+    def terms_served(self):
+        """Terms served as in Character.terms_served (injured terms count as half)"""
+        return self.terms_half / 2
+
+    def __len__(self):
+        return self.size
+
+    def summary(self):
+        """Per-career headline statistics for balance studies"""
+        result = {}
+        for i, career in enumerate(CAREERS):
+            mask = self.career == i
+            count = int(mask.sum())
+            if not count:
+                continue
+            result[career] = {
+                'count': count,
+                'died': float((self.outcome[mask] == OUTCOME_DIED).mean()),
+                'injured': float((self.outcome[mask] == OUTCOME_INJURED).mean()),
+                'mean_terms': float(self.terms_served[mask].mean()),
+                'mean_cash': float(self.cash[mask].mean()),
+                'rank_distribution': np.bincount(self.rank[mask], minlength=7).tolist(),
+            }
+        return result
+
+
+# --- VECTORIZED DICE ---
+
+def roll_d6(rng, n):
+    """Roll n d6"""
+    return rng.integers(1, 7, size=n, dtype=np.int8)
+
+
+def roll_2d6(rng, n):
+    """Roll n 2d6 (vectorized Character.roll_2d6)"""
+    return roll_d6(rng, n) + roll_d6(rng, n)
+
+
+# --- ENGINE ---
+
+def simulate_population(n, seed=None, service_choice=None, death_rule_enabled=False):
+    """Simulate n complete careers at once and return a Population.
+
+    Follows the same rules as generate_character, applied term by term
+    through boolean masks over the still-serving characters.
+    """
+    if service_choice is not None and Career.get(service_choice) is None:
+        raise ValueError(f"Invalid career '{service_choice}'")
+    rng = np.random.default_rng(seed)
+    pop = Population(n)
+    chars = pop.characteristics
+    everyone = np.arange(n)
+
+    # Characteristics
+    chars[:] = roll_d6(rng, (n, len(STATS))) + roll_d6(rng, (n, len(STATS)))
+
+    # Enlistment (or draft)
+    if service_choice is None:
+        pop.service_choice[:] = rng.integers(0, len(CAREERS), size=n)
+    else:
+        pop.service_choice[:] = Career.parse(service_choice)
+    choice = pop.service_choice
+    modifier = ((chars[everyone[:, None], ENLISTMENT_BONUS_STAT[choice]] >= ENLISTMENT_BONUS_REQ[choice])
+                * ENLISTMENT_BONUS[choice]).sum(axis=1)
+    enlisted = roll_2d6(rng, n) + modifier >= ENLISTMENT_TARGET[choice]
+    pop.career[:] = np.where(enlisted, choice, rng.integers(0, len(CAREERS), size=n))
+    pop.drafted[:] = ~enlisted
+
+    skill = ENLISTMENT_SKILL[pop.career]
+    has_skill = skill >= 0
+    pop.skills[everyone[has_skill], skill[has_skill]] += 1
+
+    active = everyone
+    while active.size:
+        career = pop.career[active]
+        k = active.size
+
+        # Survival
+        bonus = ((chars[active, SURVIVAL_BONUS_STAT[career, 0]] >= SURVIVAL_BONUS_REQ[career, 0])
+                 * SURVIVAL_BONUS[career, 0])
+        survived = roll_2d6(rng, k) + bonus >= SURVIVAL_TARGET[career]
+        failed = active[~survived]
+        if death_rule_enabled:
+            pop.outcome[failed] = OUTCOME_DIED
+        else:
+            pop.outcome[failed] = OUTCOME_INJURED
+            pop.terms_half[failed] += 1
+            pop.age[failed] += 2
+        active, career = active[survived], career[survived]
+        k = active.size
+        if not k:
+            break
+
+        # Complete the term and apply ageing
+        pop.terms_half[active] += 2
+        pop.age[active] += 4
+        _apply_ageing(rng, pop, active)
+
+        # Commission
+        eligible = (COMMISSION_TARGET[career] > 0) & ~pop.commissioned[active] & ~pop.drafted[active]
+        commission_mod = chars[active, COMMISSION_MOD_STAT[career]] >= COMMISSION_MOD_REQ[career]
+        commissioned = eligible & (roll_2d6(rng, k) + commission_mod >= COMMISSION_TARGET[career])
+        pop.commissioned[active[commissioned]] = True
+        pop.rank[active[commissioned]] = 1
+
+        # Promotion
+        eligible = pop.commissioned[active] & (pop.rank[active] < MAX_RANK[career])
+        promotion_mod = chars[active, PROMOTION_MOD_STAT[career]] >= PROMOTION_MOD_REQ[career]
+        promoted = eligible & (roll_2d6(rng, k) + promotion_mod >= PROMOTION_TARGET[career])
+        pop.rank[active[promoted]] += 1
+        pop.promotions[active[promoted]] += 1
+
+        # Skills: term rolls, then commission and promotion rolls with their automatic skills
+        num_skills = np.where((career == Career.SCOUTS) | (pop.terms_half[active] == 2), 2, 1)
+        auto = COMMISSION_SKILL[career]
+        first_commission = commissioned & (auto >= 0)
+        pop.skills[active[first_commission], auto[first_commission]] += 1
+        _apply_rank_skills(pop, active[promoted], career[promoted])
+        num_skills = num_skills + commissioned + promoted
+        _roll_skills(rng, pop, active, career, num_skills)
+
+        # Reenlistment: 12 is mandatory retention, otherwise roll the career target
+        roll = roll_2d6(rng, k)
+        continuing = (roll == 12) | (roll >= REENLISTMENT_TARGET[career])
+        pop.drafted[active[continuing]] = False
+        active = active[continuing]
+
+    _roll_mustering_out(rng, pop)
+    return pop
+
+
+def _apply_ageing(rng, pop, active):
+    """Apply the ageing check for the age each character has just reached"""
+    age = pop.age[active]
+    for start, end, checks in AGEING_PHASES:
+        in_phase = (age >= start) if end is None else ((age >= start) & (age <= end))
+        ageing = active[in_phase]
+        if not ageing.size:
+            continue
+        for stat, target, loss in checks:
+            lost = roll_2d6(rng, ageing.size) < target
+            who = ageing[lost]
+            pop.characteristics[who, stat] = np.maximum(0, pop.characteristics[who, stat] - loss)
+
+
+def _apply_rank_skills(pop, promoted, career):
+    """Automatic rank skills (grant_automatic_rank_skill): Merchants rank 4 Pilot, Navy rank 5/6 +1 SOC"""
+    rank = pop.rank[promoted]
+    merchant = promoted[(career == Career.MERCHANTS) & (rank == 4)]
+    pop.skills[merchant, Skill.PILOT] += 1
+    navy = promoted[(career == Career.NAVY) & ((rank == 5) | (rank == 6))]
+    pop.characteristics[navy, STAT_INDEX['soc']] += 1
+
+
+def _roll_skills(rng, pop, active, career, num_skills):
+    """Roll num_skills skills per character on a random eligible table"""
+    edu = STAT_INDEX['edu']
+    for r in range(int(num_skills.max())):
+        rolling = num_skills > r
+        who, who_career = active[rolling], career[rolling]
+        # advanced_education is only available with EDU 8+ (checked roll by roll)
+        tables = np.where(pop.characteristics[who, edu] >= 8, 4, 3)
+        table = (rng.random(who.size) * tables).astype(np.intp)
+        code = SKILL_TABLE_CODES[who_career, table, roll_d6(rng, who.size) - 1]
+        gains = code >= 0
+        pop.skills[who[gains], code[gains]] += 1
+        boosts = ~gains
+        pop.characteristics[who[boosts], -code[boosts] - 1] += 1
+
+
+def _roll_mustering_out(rng, pop):
+    """Vectorized roll_mustering_out: cash (max 3 rolls) then benefits"""
+    n = pop.size
+    rank = pop.rank
+    total_rolls = pop.terms_half // 2 + np.select([rank >= 5, rank >= 3, rank >= 1], [3, 2, 1], 0)
+    cash_rolls = np.minimum(3, total_rolls)
+    benefit_rolls = total_rolls - cash_rolls
+    rank_bonus = (rank >= 5).astype(np.int16)
+    gambling = pop.skills[:, Skill.GAMBLING].astype(np.int16)
+    career = pop.career.astype(np.intp)
+
+    for r in range(3):
+        rolling = cash_rolls > r
+        roll = np.minimum(7, roll_d6(rng, n) + rank_bonus + gambling)
+        pop.cash += np.where(rolling, CASH_TABLE[career, roll - 1], 0)
+
+    for r in range(int(benefit_rolls.max(initial=0))):
+        who = np.flatnonzero(benefit_rolls > r)
+        roll = np.minimum(7, roll_d6(rng, who.size) + rank_bonus[who])
+        code = BENEFIT_TABLE[career[who], roll - 1]
+        item = code >= 0
+        np.add.at(pop.items, (who[item], code[item]), 1)
+        boost = code <= -10
+        stat = -code[boost] // 10 - 1
+        amount = -code[boost] % 10
+        np.add.at(pop.characteristics, (who[boost], stat), amount.astype(np.int8))
@@ -0,0 +1,103 @@
+import json
+import struct
+import zlib
+from collections import namedtuple
+
+import dice
+import rules
+from character_generator import ENGINE_VERSION, LOG_LEVELS, generate_batch, regenerate_character
+from rules import Career
+
+# Seed-only storage of generated characters.
+#
+# A character made by generate_batch()/regenerate_character() is fully
+# determined by its master seed, its index in the batch and the batch options,
+# given the same engine and rules. A Recipe records exactly that, plus the
+# engine version, the rules hash and a CRC-32 of the character's to_json(), in
+# 24 bytes; regenerate() rebuilds the complete character, logs included, and
+# verify() checks that it still comes out bit-for-bit the same.
+
+FORMAT_VERSION = 1
+# format, engine version, rules hash, seed, index, career (255 = choose), flags, to_json() CRC-32
+_RECIPE = struct.Struct('<BBIQIBBI')
+_NO_CAREER = 255
+# flags: bit 0 death rule, bits 1-2 log level, bits 3-5 backend, bit 6 digest present
+_DEATH = 1
+_LOG_SHIFT = 1
+_BACKEND_SHIFT = 3
+_HAS_DIGEST = 64
+
+RULES_HASH = int(rules.RULES_HASH, 16)
+
+
+def digest(character):
+    """CRC-32 of a Character's (or to_json() dict's) compact JSON"""
+    data = character if isinstance(character, dict) else character.to_json()
+    return zlib.crc32(json.dumps(data, separators=(',', ':')).encode())
+
+
+class Recipe(namedtuple('Recipe', 'seed index service_choice death_rule_enabled backend log_level '
+                                  'engine_version rules_hash digest')):
+    """Everything needed to regenerate one character of a batch"""
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, seed, index, service_choice=None, death_rule_enabled=False, backend='random', log_level='full',
+           character=None):
+        """Recipe for the current engine and rules; pass the character to record its digest for verify()"""
+        if service_choice is not None:
+            service_choice = Career.parse(service_choice).label
+        if backend not in dice.BACKENDS:
+            raise ValueError(f"Unknown RNG backend '{backend}'")
+        if log_level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{log_level}'")
+        return cls(seed, index, service_choice, death_rule_enabled, backend, log_level, ENGINE_VERSION, RULES_HASH,
+                   None if character is None else digest(character))
+
+    def to_bytes(self):
+        """24-byte encoding; needs an integer seed in [0, 2**64) and an index below 2**32"""
+        flags = ((_DEATH if self.death_rule_enabled else 0) | LOG_LEVELS.index(self.log_level) << _LOG_SHIFT
+                 | dice.BACKENDS.index(self.backend) << _BACKEND_SHIFT | (0 if self.digest is None else _HAS_DIGEST))
+        career = _NO_CAREER if self.service_choice is None else Career.parse(self.service_choice)
+        try:
+            return _RECIPE.pack(FORMAT_VERSION, self.engine_version, self.rules_hash, self.seed, self.index, career,
+                                flags, self.digest or 0)
+        except struct.error:
+            raise ValueError(f"Recipe seed {self.seed!r} or index {self.index!r} does not fit the encoding") from None
+
+    @classmethod
+    def from_bytes(cls, record):
+        """Decode a to_bytes() record"""
+        version, engine, rules_hash, seed, index, career, flags, crc = _RECIPE.unpack(record)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unknown recipe format {version}")
+        return cls(seed, index, None if career == _NO_CAREER else rules.CAREERS[career].label,
+                   bool(flags & _DEATH), dice.BACKENDS[flags >> _BACKEND_SHIFT & 7],
+                   LOG_LEVELS[flags >> _LOG_SHIFT & 3], engine, rules_hash, crc if flags & _HAS_DIGEST else None)
+
+    def regenerate(self):
+        """Rebuild the Character; ValueError if the engine or rules have changed since the recipe was made"""
+        if self.engine_version != ENGINE_VERSION or self.rules_hash != RULES_HASH:
+            raise ValueError(f"Recipe is for engine {self.engine_version} / rules {self.rules_hash:08x}, "
+                             f"this is engine {ENGINE_VERSION} / rules {RULES_HASH:08x}")
+        return regenerate_character(self.seed, self.index, self.service_choice, self.death_rule_enabled,
+                                    self.backend, self.log_level)
+
+    def verify(self, expected=None):
+        """True if regenerate() reproduces expected (a to_json() dict) or, by default, the recorded digest"""
+        if expected is None and self.digest is None:
+            raise ValueError("Recipe has no digest; pass the expected to_json() dict")
+        try:
+            data = self.regenerate().to_json()
+        except ValueError:
+            return False
+        return data == expected if expected is not None else digest(data) == self.digest
+
+
+def batch_recipes(n, seed, service_choice=None, death_rule_enabled=False, backend='random', log_level='full'):
+    """Yield (Recipe, to_json() dict) for each character of generate_batch(n, seed, ...)"""
+    options = {'service_choice': service_choice, 'death_rule_enabled': death_rule_enabled, 'backend': backend,
+               'log_level': log_level}
+    for index, data in enumerate(generate_batch(n, seed=seed, **options)):
+        yield Recipe.of(seed, index, character=data, **options), data
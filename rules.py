@@ -0,0 +1,320 @@
+import hashlib
+import json
+from types import MappingProxyType
+
+from codes import coded
+
+# Compiled rules tables for classic Traveller character generation.
+#
+# Every table is built once at import and frozen (dicts become read-only
+# MappingProxyType views, lists become tuples), so the generators can share
+# them freely instead of rebuilding literal dicts on every call. Careers,
+# skills, skill tables and benefits are IntEnum codes (see codes.py), and the
+# per-career tables are keyed by Career members.
+
+
+def _freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _by_career(table):
+    """Freeze a {career label: value} table, keyed by Career members"""
+    return _freeze({Career.parse(career): value for career, value in table.items()})
+
+
+Career = coded('Career', ('Navy', 'Marines', 'Army', 'Scouts', 'Merchants', 'Others'), __name__)
+CAREERS = tuple(Career)
+STATS = ('str', 'dex', 'end', 'int', 'edu', 'soc')
+# Shared empty mapping for careers without bonuses
+NO_BONUSES = _freeze({})
+
+# --- ENLISTMENT ---
+
+ENLISTMENT_TARGET = _by_career({
+    'Navy': 8,
+    'Marines': 9,
+    'Army': 5,
+    'Scouts': 7,
+    'Merchants': 7,
+    'Others': 3
+})
+DEFAULT_ENLISTMENT_TARGET = 5
+
+# career -> {stat: (requirement, bonus)}
+ENLISTMENT_BONUSES = _by_career({
+    'Navy': {'int': (8, 1), 'edu': (9, 2)},
+    'Marines': {'int': (8, 1), 'str': (8, 2)},
+    'Army': {'dex': (6, 1), 'end': (5, 2)},
+    'Scouts': {'int': (6, 1), 'str': (8, 2)},
+    'Merchants': {'str': (7, 1), 'int': (6, 2)},
+    'Others': {}
+})
+
+# --- SURVIVAL AND REENLISTMENT ---
+
+SURVIVAL_TARGET = _by_career({
+    'Navy': 5,
+    'Marines': 6,
+    'Army': 5,
+    'Scouts': 7,
+    'Merchants': 5,
+    'Others': 5
+})
+DEFAULT_SURVIVAL_TARGET = 5
+
+# career -> {stat: (requirement, bonus)}
+SURVIVAL_BONUSES = _by_career({
+    'Navy': {'int': (7, 2)},
+    'Marines': {'end': (8, 2)},
+    'Army': {'edu': (6, 2)},
+    'Scouts': {'end': (9, 2)},
+    'Merchants': {'int': (7, 2)},
+    'Others': {'int': (9, 2)}
+})
+
+REENLISTMENT_TARGET = _by_career({
+    'Navy': 6,
+    'Marines': 6,
+    'Army': 7,
+    'Scouts': 3,
+    'Merchants': 4,
+    'Others': 5
+})
+DEFAULT_REENLISTMENT_TARGET = 5
+
+# --- COMMISSION AND PROMOTION ---
+
+# Careers without an entry (Scouts, Others) have no commissions or promotions
+COMMISSION_TARGET = _by_career({
+    'Navy': 10,
+    'Marines': 9,
+    'Army': 5,
+    'Merchants': 4
+})
+# career -> (stat, requirement) for the +1 commission modifier
+COMMISSION_MODIFIER = _by_career({
+    'Navy': ('soc', 9),
+    'Marines': ('edu', 7),
+    'Army': ('end', 7),
+    'Merchants': ('int', 9)
+})
+
+# Promotion roll used by generate_character
+PROMOTION_TARGET = _by_career({'Navy': 8, 'Marines': 9, 'Army': 6, 'Merchants': 10})
+# career -> (stat, requirement) for the +1 promotion modifier
+PROMOTION_MODIFIER = _by_career({
+    'Navy': ('edu', 8),
+    'Marines': ('int', 8),
+    'Army': ('edu', 7),
+    'Merchants': ('int', 9)
+})
+MAX_RANK = _by_career({'Navy': 6, 'Marines': 6, 'Army': 6, 'Merchants': 5})
+
+# Per-rank promotion targets used by check_promotion_detailed (the web UI),
+# which applies the commission modifiers
+RANK_PROMOTION_TARGET = _by_career({
+    'Navy':  {1: 10, 2: 9, 3: 8, 4: 7, 5: 6},
+    'Marines':  {1: 9, 2: 8, 3: 7, 4: 6, 5: 5},
+    'Army':  {1: 5, 2: 5, 3: 5, 4: 5, 5: 5},
+    'Merchants': {1: 4, 2: 4, 3: 4, 4: 4, 5: 4}
+})
+
+# --- SKILLS ---
+
+# 'automatic' marks skills granted without a roll
+SkillTable = coded('SkillTable', ('personal', 'service', 'advanced', 'advanced_education', 'automatic'), __name__)
+SKILL_TABLE_NAMES = tuple(SkillTable)[:4]
+# Tables rolled on by everyone; advanced_education needs EDU 8+
+BASIC_SKILL_TABLES = SKILL_TABLE_NAMES[:3]
+ADVANCED_EDUCATION_MIN_EDU = 8
+
+# table label -> career label -> {d6: result}, in the shape get_skill_tables has always returned
+SKILL_TABLES = _freeze({
+    # Personal Development tables (same structure for all careers, values differ)
+    'personal': {
+        'Navy': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: '+1 INT', 5: '+1 EDU', 6: '+1 SOC'},
+        'Marines': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Gambling', 5: 'Brawling', 6: 'Blade Combat'},
+        'Army': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Gambling', 5: '+1 EDU', 6: 'Brawling'},
+        'Scouts': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: '+1 INT', 5: '+1 EDU', 6: 'Gun Combat'},
+        'Merchants': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Blade Combat', 5: 'Bribery', 6: '+1 INT'},
+        'Others': {1: '+1 STR', 2: '+1 DEX', 3: '+1 END', 4: 'Blade Combat', 5: 'Brawling', 6: '+1 SOC'}
+    },
+    # Service Skills
+    'service': {
+        'Navy': {1: 'Ship\'s Boat', 2: 'Vacc Suit', 3: 'Forward Observer', 4: 'Gunnery', 5: 'Blade Combat', 6: 'Gun Combat'},
+        'Marines': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Blade Combat', 4: 'Gun Combat', 5: 'Blade Combat', 6: 'Gun Combat'},
+        'Army': {1: 'Vehicle', 2: 'Air/Raft', 3: 'Gun Combat', 4: 'Forward Observer', 5: 'Blade Combat', 6: 'Gun Combat'},
+        'Scouts': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Mechanical', 4: 'Navigation', 5: 'Electronics', 6: 'Jack-o-T'},
+        'Merchants': {1: 'Vehicle', 2: 'Vacc Suit', 3: 'Jack-o-T', 4: 'Steward', 5: 'Electronics', 6: 'Gun Combat'},
+        'Others': {1: 'Vehicle', 2: 'Gambling', 3: 'Brawling', 4: 'Bribery', 5: 'Blade Combat', 6: 'Gun Combat'}
+    },
+    # Advanced (Specialist) Skills
+    'advanced': {
+        'Navy': {1: 'Vacc Suit', 2: 'Mechanical', 3: 'Electronics', 4: 'Engineering', 5: 'Gunnery', 6: 'Computer'},
+        'Marines': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Tactics', 5: 'Blade Combat', 6: 'Gun Combat'},
+        'Army': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Tactics', 5: 'Blade Combat', 6: 'Gun Combat'},
+        'Scouts': {1: 'Vehicle', 2: 'Mechanical', 3: 'Electronics', 4: 'Jack-o-T', 5: 'Gunnery', 6: 'Medical'},
+        'Merchants': {1: 'Streetwise', 2: 'Mechanical', 3: 'Electronics', 4: 'Navigation', 5: 'Engineering', 6: 'Computer'},
+        'Others': {1: 'Streetwise', 2: 'Mechanical', 3: 'Electronics', 4: 'Gambling', 5: 'Brawling', 6: 'Forgery'}
+    },
+    # Advanced Education (EDU 8+)
+    'advanced_education': {
+        'Navy': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Admin'},
+        'Marines': {1: 'Medical', 2: 'Tactics', 3: 'Tactics', 4: 'Computer', 5: 'Leader', 6: 'Admin'},
+        'Army': {1: 'Medical', 2: 'Tactics', 3: 'Tactics', 4: 'Computer', 5: 'Leader', 6: 'Admin'},
+        'Scouts': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Jack-o-T'},
+        'Merchants': {1: 'Medical', 2: 'Navigation', 3: 'Engineering', 4: 'Computer', 5: 'Pilot', 6: 'Admin'},
+        'Others': {1: 'Medical', 2: 'Forgery', 3: 'Electronics', 4: 'Computer', 5: 'Streetwise', 6: 'Jack-o-T'}
+    }
+})
+
+# Automatic skills granted once on enlistment/draft and on commission
+_ENLISTMENT_SKILL_SOURCE = {'Army': 'Rifle', 'Marines': 'Cutlass', 'Scouts': 'Pilot'}
+_COMMISSION_SKILL_SOURCE = {'Army': 'SMG', 'Marines': 'Revolver'}
+
+# Every skill that can be gained, in a fixed order; a skill's id is its index
+SKILL_NAMES = tuple(sorted(
+    {result for table in SKILL_TABLES.values() for career_table in table.values()
+     for result in career_table.values() if not result.startswith('+1')}
+    | set(_ENLISTMENT_SKILL_SOURCE.values()) | set(_COMMISSION_SKILL_SOURCE.values())
+))
+SKILL_INDEX = _freeze({name: i for i, name in enumerate(SKILL_NAMES)})
+# Skill codes number the skills in SKILL_NAMES order, so they sort alphabetically
+Skill = coded('Skill', SKILL_NAMES, __name__)
+
+
+class SkillLevels(dict):
+    """{skill: level} dict keyed by Skill codes that also accepts skill names; unlisted names stay strings"""
+
+    __slots__ = ()
+
+    def __getitem__(self, skill):
+        return super().__getitem__(Skill.get(skill, skill))
+
+    def __setitem__(self, skill, level):
+        super().__setitem__(Skill.get(skill, skill), level)
+
+    def __delitem__(self, skill):
+        super().__delitem__(Skill.get(skill, skill))
+
+    def __contains__(self, skill):
+        return super().__contains__(Skill.get(skill, skill))
+
+    def get(self, skill, default=None):
+        return super().get(Skill.get(skill, skill), default)
+
+    def pop(self, skill, *default):
+        return super().pop(Skill.get(skill, skill), *default)
+
+
+ENLISTMENT_SKILL = _by_career({c: Skill.parse(s) for c, s in _ENLISTMENT_SKILL_SOURCE.items()})
+COMMISSION_SKILL = _by_career({c: Skill.parse(s) for c, s in _COMMISSION_SKILL_SOURCE.items()})
+
+
+def _skill_result(result):
+    """Compile a table entry: a Skill, or the stat raised by a '+1 STAT' entry"""
+    return result.split()[1].lower() if result.startswith('+1') else Skill.parse(result)
+
+
+# career -> table -> the six results indexed by d6 - 1, each a Skill or a stat name
+SKILL_RESULTS = _by_career({
+    career.label: {
+        table: tuple(_skill_result(SKILL_TABLES[table.label][career.label][roll]) for roll in range(1, 7))
+        for table in SKILL_TABLE_NAMES
+    }
+    for career in Career
+})
+
+# Skill table ids, "career/table" (e.g. 'Navy/service'): roll records carry one
+# of these instead of the table, and SKILL_TABLE_CATALOG maps it back
+SKILL_TABLE_IDS = _by_career({
+    career.label: {table: f'{career.label}/{table.label}' for table in SKILL_TABLE_NAMES} for career in Career
+})
+# table id -> {d6: result}, every skill table once
+SKILL_TABLE_CATALOG = _freeze({
+    SKILL_TABLE_IDS[career][table]: SKILL_TABLES[table.label][career.label]
+    for career in Career for table in SKILL_TABLE_NAMES
+})
+
+
+def skill_table_catalog_to_json(catalog=SKILL_TABLE_CATALOG):
+    """The catalog as plain dicts, ready for json.dumps()"""
+    return {table_id: dict(table) for table_id, table in catalog.items()}
+
+
+def skill_table_catalog_from_json(tables):
+    """Inverse of skill_table_catalog_to_json() (JSON turns the d6 keys into strings)"""
+    return {table_id: {int(roll): result for roll, result in table.items()} for table_id, table in tables.items()}
+
+
+# Changes whenever a skill table does; archives store it with their copy of the catalog
+SKILL_TABLE_CATALOG_VERSION = hashlib.sha256(json.dumps(
+    skill_table_catalog_to_json(), sort_keys=True
+).encode()).hexdigest()[:12]
+
+
+def resolve_skill_roll(detail, catalog=SKILL_TABLE_CATALOG):
+    """Expand a roll record's table_id back to the full table, as 'table_contents'"""
+    resolved = {k: v for k, v in detail.items() if k != 'table_id'}
+    resolved['table_contents'] = catalog[detail['table_id']]
+    return resolved
+
+
+# --- AGEING ---
+
+# Ages at which each standard ageing phase applies, with its (stat, target, loss) checks
+AGEING_PHASE_1_AGES = (34, 38, 42, 46)
+AGEING_PHASE_2_AGES = (50, 54, 58, 62)
+AGEING_THRESHOLDS = AGEING_PHASE_1_AGES + AGEING_PHASE_2_AGES
+ADVANCED_AGEING_AGE = 66
+AGEING_PHASE_1_CHECKS = (('str', 8, 1), ('dex', 7, 1), ('end', 8, 1))
+AGEING_PHASE_2_CHECKS = (('str', 9, 1), ('dex', 8, 1), ('end', 9, 1))
+ADVANCED_AGEING_CHECKS = (('str', 9, 2), ('dex', 9, 2), ('end', 9, 2), ('int', 9, 1))
+
+# --- MUSTERING OUT ---
+
+MAX_CASH_ROLLS = 3
+# Source tables keyed by career label
+_CASH_TABLE_SOURCE = {
+    'Navy':      {1: 1000, 2: 5000, 3: 5000, 4: 10000, 5: 20000, 6: 50000, 7: 50000},
+    'Marines':   {1: 2000, 2: 5000, 3: 5000, 4: 10000, 5: 20000, 6: 30000, 7: 40000},
+    'Army':      {1: 2000, 2: 5000, 3: 10000, 4: 10000, 5: 10000, 6: 20000, 7: 30000},
+    'Scouts':    {1: 20000, 2: 20000, 3: 30000, 4: 30000, 5: 50000, 6: 50000, 7: 50000},
+    'Merchants': {1: 1000, 2: 5000, 3: 10000, 4: 20000, 5: 20000, 6: 40000, 7: 40000},
+    'Others':    {1: 1000, 2: 5000, 3: 10000, 4: 10000, 5: 10000, 6: 50000, 7: 100000},
+}
+_BENEFIT_TABLE_SOURCE = {
+    'Navy':      {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +2', 4: 'Blade', 5: 'Travellers', 6: 'High Psg', 7: 'SOC +2'},
+    'Marines':   {1: 'Low Psg', 2: 'INT +2', 3: 'EDU +1', 4: 'Blade', 5: 'Traveller', 6: 'High Psg', 7: 'SOC +2'},
+    'Army':      {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +2', 4: 'Gun', 5: 'High Psg', 6: 'Mid Psg', 7: 'SOC +1'},
+    'Scouts':    {1: 'Low Psg', 2: 'INT +2', 3: 'EDU +2', 4: 'Blade', 5: 'Gun', 6: 'Scout Ship'},
+    'Merchants': {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +1', 4: 'Gun', 5: 'Blade', 6: 'Low Psg', 7: 'Free Trader'},
+    'Others':    {1: 'Low Psg', 2: 'INT +1', 3: 'EDU +1', 4: 'Gun', 5: 'High Psg', 6: '-'},
+}
+# Every benefit in order of first appearance; '-' (nothing) becomes Benefit.NONE
+Benefit = coded('Benefit', tuple(dict.fromkeys(
+    b for table in _BENEFIT_TABLE_SOURCE.values() for b in table.values())), __name__)
+# Characteristic boosts: Benefit -> (stat, amount), e.g. Benefit.EDU_2 -> ('edu', 2)
+BENEFIT_BOOST = _freeze({b: (b.label[:3].lower(), int(b.label.split('+')[1])) for b in Benefit if '+' in b.label})
+
+# career -> {roll: value}; benefit rolls missing from a table give Low Psg
+CASH_TABLE = _by_career(_CASH_TABLE_SOURCE)
+BENEFIT_TABLE = _by_career({
+    career: {roll: Benefit.parse(b) for roll, b in table.items()} for career, table in _BENEFIT_TABLE_SOURCE.items()
+})
+DEFAULT_CASH_TABLE = CASH_TABLE[Career.OTHERS]
+DEFAULT_BENEFIT_TABLE = BENEFIT_TABLE[Career.OTHERS]
+DEFAULT_BENEFIT = Benefit.LOW_PSG
+
+# --- VERSION ---
+
+# Digest of every table above; changes whenever any rule does, so stored
+# seeds can tell whether they still regenerate the same characters
+RULES_HASH = hashlib.sha256(repr(
+    [(name, value) for name, value in sorted(globals().items()) if name.isupper()]
+).encode()).hexdigest()[:8]
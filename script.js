@@ -182,66 +182,50 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    // Fetch and update all UI after any state change
+    // Render a /ui_state (or /term/resolve) response: everything the UI shows
+    function applyUIState(state) {
+        window.lastStatusData = state.status;
+        updatePermanentRecord(state.status);
+        updateCharacteristicButtons(state.status.revealed || [], true);
+        window.skillBreakdown = state.skills.skill_breakdown;
+        updateTermInfo(state.term);
+        updateTermButtons(state.buttons);
+    }
+
+    // Fetch and update all UI after any state change; an unchanged state costs a bodiless 304
+    let uiStateTag = null;
     function refreshAllUI() {
-        fetch('/character_status')
+        const headers = uiStateTag ? { 'If-None-Match': uiStateTag } : {};
+        return fetch('/ui_state', { headers, cache: 'no-store' })
             .then(res => {
+                if (res.status === 304) return null;
                 if (!res.ok) {
+                    uiStateTag = null;
                     updateCharacteristicButtons([], false); // Hide all
-                    // No message shown
                     window.lastStatusData = null;
-                    return {};
+                    updateTermInfo({});
+                    return null;
                 }
-                // No message shown
-                return res.json();
-            })
-            .then(data => {
-                if (data && data.name) {
-                    updatePermanentRecord(data);
-                    updateCharacteristicButtons(data.revealed || [], true);
-                    window.lastStatusData = data;
-                }
-            });
-        fetch('/term_info')
-            .then(res => {
-                if (!res.ok) return {};
-                return res.json();
-            })
-            .then(termData => updateTermInfo(termData));
-        
-        // Fetch button status and update button visibility
-        fetch('/term_button_status')
-            .then(res => {
-                if (!res.ok) return {};
+                uiStateTag = res.headers.get('ETag');
                 return res.json();
             })
-            .then(buttonStatus => {
-                if (buttonStatus && Object.keys(buttonStatus).length > 0) {
-                    updateTermButtons(buttonStatus);
-                }
+            .then(state => {
+                if (state) applyUIState(state);
             });
-        
-        // Calculate skills if term checks are completed
-        calculateTermSkills();
     }
 
-    // Calculate skills based on term outcomes
-    function calculateTermSkills() {
-        fetch('/calculate_term_skills', {
+    // Run term steps server-side; the one response carries the whole updated state
+    async function resolveTerm(steps) {
+        const response = await fetch('/term/resolve', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
-        })
-        .then(res => {
-            if (!res.ok) return {};
-            return res.json();
-        })
-        .then(skillData => {
-            if (skillData && skillData.skill_breakdown) {
-                window.skillBreakdown = skillData.skill_breakdown;
-                // Update the term info display to show skill breakdown
-                updateTermInfo({});
-            }
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ steps })
         });
+        if (!response.ok) throw new Error('Network response was not ok');
+        const state = await response.json();
+        applyUIState(state);
+        uiStateTag = `"${state.revision}"`;  // the next refresh is a 304 until something else changes
+        return state;
     }
 
     // --- Workflow State ---
@@ -390,15 +374,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     if (survivalBtn) survivalBtn.addEventListener('click', async function() {
         try {
-            const response = await fetch('/term_survival', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            });
-            if (!response.ok) throw new Error('Network response was not ok');
+            await resolveTerm(['survival']);
             // Hide the survival button immediately after successful check
             if (survivalBtn) survivalBtn.style.display = 'none';
             updateButtonVisibility();
-            refreshAllUI();
         } catch (err) {
             alert('Error checking survival.');
         }
@@ -406,15 +385,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     if (commissionBtn) commissionBtn.addEventListener('click', async function() {
         try {
-            const response = await fetch('/term_commission', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            });
-            if (!response.ok) throw new Error('Network response was not ok');
+            await resolveTerm(['commission']);
             // Hide the commission button immediately after successful check
             if (commissionBtn) commissionBtn.style.display = 'none';
             updateButtonVisibility();
-            refreshAllUI();
         } catch (err) {
             alert('Error checking commission.');
         }
@@ -422,15 +396,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     if (promotionBtn) promotionBtn.addEventListener('click', async function() {
         try {
-            const response = await fetch('/term_promotion', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            });
-            if (!response.ok) throw new Error('Network response was not ok');
+            await resolveTerm(['promotion']);
             // Hide the promotion button immediately after successful check
             if (promotionBtn) promotionBtn.style.display = 'none';
             updateButtonVisibility();
-            refreshAllUI();
         } catch (err) {
             alert('Error checking promotion.');
         }
@@ -438,13 +407,8 @@ document.addEventListener('DOMContentLoaded', function() {
 
     if (reenlistmentBtn) reenlistmentBtn.addEventListener('click', async function() {
         try {
-            const response = await fetch('/term_reenlistment', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
-            });
-            if (!response.ok) throw new Error('Network response was not ok');
+            await resolveTerm(['reenlistment']);
             updateButtonVisibility();
-            refreshAllUI();
         } catch (err) {
             alert('Error checking re-enlistment.');
         }
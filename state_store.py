@@ -0,0 +1,199 @@
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Per-session character state for the web app.
+#
+# Live states are plain JSON-able dicts held in memory, least recently used
+# first; past capacity the oldest session is evicted. Without a directory
+# that is all (an evicted player has to start again). With one, every session
+# is also snapshotted to DIRECTORY/<session id>.json, written to a temporary
+# file and moved into place with os.replace() so a reader or a crash never
+# sees half a file. Snapshots are written behind by a background thread every
+# flush_interval seconds (evicted sessions included, and served from memory
+# until then), or straight away from put() when flush_interval is 0.
+#
+# Callers mutate a state under lock(session_id); snapshots are taken under the
+# same lock, so they are never serialised mid-update. next_revision() numbers
+# changes for cache validation: it only ever increases, across sessions and
+# (being seeded from the clock) across restarts, so a number never comes back.
+
+LOCK_STRIPES = 64
+SESSION_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+
+class StateStore:
+    """Session id -> state dict, with LRU eviction and optional atomic snapshots on disk"""
+
+    def __init__(self, capacity=1000, directory=None, flush_interval=1.0):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._states = OrderedDict()  # session id -> state, least recently used first
+        self._pending = {}  # evicted but not yet written: session id -> state
+        self._dirty = set()
+        self._mutex = threading.Lock()
+        self._locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self._revisions = itertools.count(time.time_ns() // 1000)
+        self._stop = threading.Event()
+        self._flusher = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            if flush_interval > 0:
+                self._flusher = threading.Thread(target=self._flush_loop, name='state-store-flush', daemon=True)
+                self._flusher.start()
+
+    def lock(self, session_id):
+        """Lock to hold while reading and updating a session's state"""
+        return self._locks[hash(session_id) % LOCK_STRIPES]
+
+    def next_revision(self):
+        """A revision number greater than any handed out before"""
+        return next(self._revisions)
+
+    def _path(self, session_id):
+        if not SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session id {session_id!r}")
+        return os.path.join(self.directory, f'{session_id}.json')
+
+    # --- STATES ---
+
+    def get(self, session_id):
+        """The session's live state dict, or None if it has none"""
+        with self._mutex:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+                return state
+            state = self._pending.pop(session_id, None)
+            if state is not None:
+                # Evicted but not yet written: take it back, still dirty
+                self._states[session_id] = state
+                self._evict()
+                return state
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(session_id), encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        with self._mutex:
+            # Another thread may have loaded or created it meanwhile
+            state = self._states.setdefault(session_id, state)
+            self._states.move_to_end(session_id)
+            self._evict()
+        return state
+
+    def put(self, session_id, state):
+        """Store (or mark updated) a session's state"""
+        if self.directory is not None:
+            self._path(session_id)  # validates the id before anything is kept
+        with self._mutex:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            self._pending.pop(session_id, None)
+            self._dirty.add(session_id)
+            self._evict()
+        if self.directory is not None and self._flusher is None:
+            # Write-through; only this session, so no other session's lock is needed
+            self._flush_sessions([session_id])
+
+    def delete(self, session_id):
+        """Forget a session, on disk too; True if it had a state"""
+        with self.lock(session_id):
+            with self._mutex:
+                existed = self._states.pop(session_id, None) is not None
+                existed = self._pending.pop(session_id, None) is not None or existed
+                self._dirty.discard(session_id)
+            if self.directory is not None:
+                try:
+                    os.remove(self._path(session_id))
+                    existed = True
+                except FileNotFoundError:
+                    pass
+        return existed
+
+    def __len__(self):
+        return len(self._states)
+
+    def _evict(self):
+        # Caller holds _mutex
+        while len(self._states) > self.capacity:
+            session_id, state = self._states.popitem(last=False)
+            if session_id in self._dirty and self.directory is not None:
+                self._pending[session_id] = state
+            else:
+                self._dirty.discard(session_id)
+
+    # --- SNAPSHOTS ---
+
+    def _write(self, session_id, state):
+        path = self._path(session_id)
+        temp = f'{path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+
+    def flush(self):
+        """Write every updated session's snapshot now; returns how many were written"""
+        if self.directory is None:
+            return 0
+        with self._mutex:
+            dirty = list(self._dirty)
+        return self._flush_sessions(dirty)
+
+    def _flush_sessions(self, session_ids):
+        written = 0
+        error = None
+        for session_id in session_ids:
+            with self.lock(session_id):
+                with self._mutex:
+                    if session_id not in self._dirty:
+                        continue  # written or deleted since
+                    # Clean from here: holding its lock, nothing changes it before the write
+                    self._dirty.discard(session_id)
+                    state = self._states.get(session_id)
+                    if state is None:
+                        state = self._pending.get(session_id)
+                try:
+                    self._write(session_id, state)
+                except OSError as e:
+                    # Left dirty for the next flush (and kept, if evicted meanwhile)
+                    with self._mutex:
+                        self._dirty.add(session_id)
+                        if session_id not in self._states:
+                            self._pending[session_id] = state
+                    error = error or e
+                    continue
+                with self._mutex:
+                    if self._pending.get(session_id) is state:
+                        del self._pending[session_id]
+                written += 1
+        if error is not None:
+            raise error
+        return written
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"State store: writing snapshots failed, will retry: {e}", file=sys.stderr)
+
+    def close(self):
+        """Stop writing behind and write what is left"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import random
+import statistics
+
+import pytest
+
+from aggregate import Aggregate, Histogram, QuantileSketch, RunningStats, aggregate_batch
+from character_generator import Character, generate_batch
+
+
+def test_running_stats_merge_matches_one_pass():
+    """Test that Welford accumulators merged from parts equal one over the whole stream"""
+    rng = random.Random(1)
+    values = [rng.gauss(50, 12) for _ in range(1000)]
+    whole = RunningStats()
+    for v in values:
+        whole.add(v)
+    parts = [RunningStats() for _ in range(3)]
+    for i, v in enumerate(values):
+        parts[i % 3].add(v)
+    merged = RunningStats().merge(parts[0]).merge(parts[1]).merge(parts[2])
+    for stats in (whole, merged):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+
+def test_histogram_and_sketch():
+    """Test fixed bins with under/overflow and quantiles within the sketch's relative accuracy"""
+    histogram = Histogram(0, 10, width=2.5)
+    for v in (-1, 0, 2.4, 2.5, 9.9, 10, 42):
+        histogram.add(v)
+    assert histogram.bins() == [(0, 2), (2.5, 1), (5.0, 0), (7.5, 1)]
+    assert (histogram.underflow, histogram.overflow) == (1, 2)
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(0, 10))
+
+    rng = random.Random(5)
+    values = sorted([0] * 100 + [rng.lognormvariate(9, 1.5) for _ in range(5000)])
+    sketches = [QuantileSketch(0.01), QuantileSketch(0.01)]
+    for i, v in enumerate(values):
+        sketches[i % 2].add(v)
+    sketch = sketches[0].merge(sketches[1])
+    assert sketch.quantile(0.01) == 0.0
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert len(sketch.buckets) < 2000
+
+
+def test_batch_aggregate_matches_characters():
+    """Test that a streamed aggregate agrees with the generated characters, serially and across workers"""
+    characters = list(generate_batch(300, seed=13, death_rule_enabled=True, output_format='object'))
+    serial = aggregate_batch(300, seed=13, death_rule_enabled=True)
+    total = serial.to_dict()['total']
+    assert total['characters'] == 300
+    assert total['died'] == sum(c.died for c in characters) > 0
+    assert total['terms']['mean'] == pytest.approx(statistics.fmean(float(c.terms_served) for c in characters))
+    assert sum(s.characters for s in serial.careers.values()) == 300
+    assert serial.careers['Navy'].characters == sum(str(c.career) == 'Navy' for c in characters)
+    assert serial.to_dict() == Aggregate().extend(characters).to_dict()
+
+    parallel = aggregate_batch(300, seed=13, death_rule_enabled=True, workers=2, chunk_size=40).to_dict()
+    assert parallel['careers'].keys() == serial.to_dict()['careers'].keys()
+    assert parallel['total']['cash']['quantiles'] == total['cash']['quantiles']
+    assert parallel['total']['terms']['mean'] == pytest.approx(total['terms']['mean'])
+    assert parallel['total']['skills'] == total['skills']
+
+
+def test_died_survives_json_round_trip_without_a_log():
+    """Test that the died flag reaches the JSON even at log level 'off', where no DEATH event is recorded"""
+    characters = list(generate_batch(300, seed=13, death_rule_enabled=True, log_level='off', output_format='object'))
+    dead = [c for c in characters if c.died]
+    assert dead and not dead[0].to_json()['generation_log']
+    assert all(Character.from_json(c.to_json()).died == c.died for c in characters)
+    assert Aggregate().extend(Character.from_json(c.to_json()) for c in characters).to_dict() == \
+           Aggregate().extend(characters).to_dict()
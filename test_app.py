@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import random
+
+from app import app
+
+
+def _enlisted_client(service='Army'):
+    client = app.test_client()
+    client.post('/create_character')
+    client.post('/reveal_characteristic', json={'characteristic': 'strength'})
+    client.post('/attempt_enlistment', json={'service': service})
+    return client
+
+
+def test_term_resolve_runs_steps_in_one_request():
+    """Test that /term/resolve runs the requested steps and returns the whole updated state"""
+    random.seed(3)
+    client = _enlisted_client()
+    state = client.post('/term/resolve', json={'steps': ['survival']}).get_json()
+    assert set(state) == {'steps', 'results', 'revision', 'skills', 'status', 'term', 'buttons'}
+    assert state['steps'] == ['survival'] and list(state['results']) == ['survival']
+    assert state['buttons']['survival_completed'] and not state['buttons']['commission_completed']
+    assert state['status']['last_survival'] == state['results']['survival']
+    assert state['skills'] == client.post('/calculate_term_skills').get_json()
+    assert state['status'] == client.get('/character_status').get_json()
+    assert state['term'] == client.get('/term_info').get_json()
+
+    # Steps run in term order whatever order they are asked for
+    state = client.post('/term/resolve', json={'steps': ['promotion', 'commission']}).get_json()
+    assert state['steps'] == ['commission', 'promotion']
+
+
+def test_term_resolve_whole_term_and_errors():
+    """Test a full term in one call, skipped steps after a failed survival, and bad requests"""
+    for seed in range(40):
+        random.seed(seed)
+        client = _enlisted_client('Scouts')
+        state = client.post('/term/resolve').get_json()
+        results = state['results']
+        assert state['steps'] == ['survival', 'commission', 'promotion', 'reenlistment']
+        if results['survival']['outcome'] != 'survived':
+            assert results['reenlistment'] == {'skipped': 'did not survive the term'}
+            assert state['skills']['remaining_skills'] == 0
+            continue
+        # Scouts get two skills every term, plus one each for a commission and a promotion
+        earned = 2 + sum(results[step].get('success', False) for step in ('commission', 'promotion'))
+        assert state['skills']['remaining_skills'] == earned
+        assert client.get('/available_skill_tables').get_json()['remaining_skills'] == earned
+        if results['reenlistment']['succeeded']:
+            assert state['term']['term_number'] == 2
+            assert not state['buttons']['survival_completed']
+    assert client.post('/term/resolve', json={'steps': ['mustering']}).status_code == 400
+    assert app.test_client().post('/term/resolve').status_code == 400
+
+
+def test_ui_state_conditional_get():
+    """Test that /ui_state answers 304 until the state changes, and never reuses a revision"""
+    random.seed(5)
+    client = _enlisted_client('Navy')
+    first = client.get('/ui_state')
+    etag = first.headers['ETag']
+    state = first.get_json()
+    assert set(state) == {'revision', 'status', 'term', 'buttons', 'skills'}
+    assert etag == f'"{state["revision"]}"'
+    assert state['status'] == client.get('/character_status').get_json()
+
+    unchanged = client.get('/ui_state', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304 and unchanged.data == b''
+
+    # Skill reads and a rejected request leave the revision alone; a term step does not
+    client.get('/available_skill_tables')
+    client.get('/ui_state')
+    assert client.post('/term/resolve', json={'steps': ['mustering']}).status_code == 400
+    assert client.get('/ui_state', headers={'If-None-Match': etag}).status_code == 304
+    resolved = client.post('/term/resolve', json={'steps': ['survival']}).get_json()
+    assert resolved['revision'] > state['revision']
+    changed = client.get('/ui_state', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.get_json()['skills'] == resolved['skills']
+    assert client.get('/ui_state', headers={'If-None-Match': changed.headers['ETag']}).status_code == 304
+    # Recording the same skill rolls again changes nothing either
+    assert client.post('/calculate_term_skills').get_json() == resolved['skills']
+    assert client.get('/ui_state', headers={'If-None-Match': changed.headers['ETag']}).status_code == 304
+
+    # A new character after a delete never matches an old tag
+    client.post('/delete_character')
+    assert client.get('/ui_state').status_code == 400
+    client.post('/create_character')
+    assert client.get('/ui_state', headers={'If-None-Match': changed.headers['ETag']}).status_code == 200
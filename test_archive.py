@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import random
+
+import pytest
+
+import rules
+from archive import Archive, ArchiveWriter
+from character_generator import Character, generate_batch
+from compact_character import CompactCharacter
+from rules import Career
+
+
+def test_archive_random_access(tmp_path):
+    """Test that any archived character comes back exactly, without reading the others"""
+    path = str(tmp_path / 'chars.trv')
+    characters = list(generate_batch(120, seed=12, death_rule_enabled=True))
+    with ArchiveWriter(path) as writer:
+        assert writer.extend(characters[:100]) == range(100)
+        assert writer.append(Character.from_json(characters[100])) == 100
+        assert writer.extend(CompactCharacter.from_json(c) for c in characters[101:]) == range(101, 120)
+    with Archive(path) as archive:
+        assert len(archive) == 120
+        for i in (0, 57, 119, -1):
+            assert archive.to_json(i) == characters[i]
+        assert archive.character(3).to_json() == characters[3]
+        with pytest.raises(IndexError):
+            archive.record(120)
+
+
+def test_readers_see_appends_after_refresh(tmp_path):
+    """Test that an open reader picks up records appended later, and a reopened writer continues the ids"""
+    path = str(tmp_path / 'chars.trv')
+    characters = list(generate_batch(10, seed=2))
+    with ArchiveWriter(path) as writer:
+        writer.extend(characters[:4])
+        archive = Archive(path)
+        writer.extend(characters[4:7])
+        assert len(archive) == 4
+        assert archive.refresh() == 7
+    with ArchiveWriter(path) as writer:
+        assert writer.extend(characters[7:]) == range(7, 10)
+    archive.refresh()
+    assert [c.to_json() for c in archive] == characters
+    archive.close()
+
+
+def test_rejects_other_files(tmp_path):
+    """Test that opening something that is not an archive fails clearly"""
+    path = tmp_path / 'not.trv'
+    path.write_bytes(b'x' * 64)
+    (tmp_path / 'not.trv.idx').write_bytes(b'x' * 16)
+    with pytest.raises(ValueError):
+        Archive(str(path))
+
+
+def test_skill_rolls_refer_to_catalog_tables():
+    """Test that detailed skill rolls carry a table id that resolves to the table rolled on"""
+    c = Character(rng=random.Random(3))
+    c.characteristics = {stat: 9 for stat in rules.STATS}
+    for detail in c.roll_for_skills_detailed('Navy', 20):
+        assert 'table_contents' not in detail
+        resolved = rules.resolve_skill_roll(detail)
+        assert resolved['table_contents'] is rules.SKILL_TABLES[detail['table'].label]['Navy']
+        assert resolved['table_contents'][detail['roll']] == detail['result']
+        assert 'table_id' not in resolved
+    assert len(rules.SKILL_TABLE_CATALOG) == len(Career) * len(rules.SKILL_TABLE_NAMES)
+
+
+def test_archive_keeps_its_skill_table_catalog(tmp_path, monkeypatch):
+    """Test that table ids resolve against the archive's own catalog after the rules change"""
+    path = str(tmp_path / 'chars.trv')
+    with ArchiveWriter(path) as writer:
+        writer.extend(generate_batch(3, seed=4))
+    c = Character(rng=random.Random(4))
+    c.characteristics = {stat: 9 for stat in rules.STATS}
+    details = c.roll_for_skills_detailed('Scouts', 10)
+
+    monkeypatch.setattr(rules, 'SKILL_TABLE_CATALOG', {})
+    monkeypatch.setattr(rules, 'SKILL_TABLE_CATALOG_VERSION', 'changed')
+    with Archive(path) as archive:
+        assert archive.skill_table_catalog_version != rules.SKILL_TABLE_CATALOG_VERSION
+        for detail in details:
+            resolved = archive.resolve_skill_roll(detail)
+            assert resolved['table_contents'] == rules.SKILL_TABLES[detail['table'].label]['Scouts']
+    with pytest.raises(ValueError):
+        ArchiveWriter(path)
+
+
+def test_archive_keeps_its_compression_dictionary(tmp_path, monkeypatch):
+    """Test that an archive still decodes, and takes appends, after the shared dictionary changes"""
+    import compact_character
+    path = str(tmp_path / 'chars.trv')
+    characters = list(generate_batch(6, seed=9))
+    with ArchiveWriter(path) as writer:
+        writer.extend(characters[:3])
+    monkeypatch.setattr(compact_character, '_zdict', b'a different engine' * 100)
+    with ArchiveWriter(path) as writer:
+        writer.extend(characters[3:])
+    with Archive(path) as archive:
+        assert [c.to_json() for c in archive] == characters
+    monkeypatch.undo()
+    with Archive(path) as archive:
+        assert archive._zdict is None and archive.to_json(5) == characters[5]
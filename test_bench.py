@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import random
+
+import bench
+from character_generator import Character
+
+
+def test_bench_scenario_reports_every_phase():
+    """Test that a scenario result has throughput and all phase costs"""
+    result = bench.bench_scenario('Army', True, count=5, repeat=1)
+    assert result['chars_per_sec'] > 0
+    assert set(result['phases_us']) == set(bench.PHASES) | {'other'}
+
+
+def test_history_and_regression_check(tmp_path):
+    """Test that runs accumulate in the history and slow scenarios are flagged"""
+    path = str(tmp_path / 'history.json')
+    base = {'timestamp': 't0', 'results': {'Navy/death-off': {'chars_per_sec': 1000.0},
+                                           'Army/death-off': {'chars_per_sec': 1000.0}}}
+    run = {'timestamp': 't1', 'results': {'Navy/death-off': {'chars_per_sec': 850.0},
+                                          'Army/death-off': {'chars_per_sec': 950.0}}}
+    bench.append_history(path, base)
+    assert bench.append_history(path, run) == [base, run]
+    assert bench.load_history(path)[-1] == run
+    regressions = bench.compare(run, base, threshold=0.10)
+    assert [name for name, *_ in regressions] == ['Navy/death-off']
+    assert bench.compare(run, base, threshold=0.20) == []
+
+
+def test_check_promotion_accepts_names():
+    """Test that check_promotion (split out for timing) takes career names and careers without promotions"""
+    stats = {'str': 10, 'dex': 10, 'end': 10, 'int': 10, 'edu': 10, 'soc': 10}
+    success, roll, modifier, target = Character.check_promotion('Navy', stats, 'none', random.Random(2))
+    assert isinstance(success, bool) and 2 <= roll <= 12 and (modifier, target) == (1, 8)
+    rng = random.Random(2)
+    for career in ('Scouts', 'Others'):
+        assert Character.check_promotion(career, stats, 'none', rng) == (False, None, 0, None)
+    assert rng.random() == random.Random(2).random()  # no dice rolled
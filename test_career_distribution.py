@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from career_distribution import career_outcomes
+from population_engine import simulate_population, CAREERS, OUTCOMES
+
+
+def test_career_outcomes_are_distributions():
+    """Test that every exact distribution sums to one"""
+    outcomes = career_outcomes(death_rule_enabled=True)
+    assert abs(sum(o.probability for o in outcomes.values()) - 1) < 1e-9
+    for outcome in outcomes.values():
+        for dist in (outcome.outcome, outcome.terms_served, outcome.final_rank,
+                     outcome.mustering_out_rolls, outcome.cash):
+            assert abs(sum(dist.values()) + outcome.truncated - 1) < 1e-6
+
+
+def test_career_outcomes_match_population():
+    """Test that exact results agree with a large vectorized sample"""
+    outcomes = career_outcomes('Marines')
+    pop = simulate_population(200000, seed=3, service_choice='Marines')
+    for career, outcome in outcomes.items():
+        served = pop.career == CAREERS.index(career)
+        assert abs(served.mean() - outcome.probability) < 0.01
+        assert abs(pop.terms_served[served].mean() - outcome.expected_terms) < 0.05
+        injured = np.mean(pop.outcome[served] == OUTCOMES.index('injured'))
+        assert abs(injured - outcome.outcome.get('injured', 0)) < 0.01
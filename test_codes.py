@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import json
+import pickle
+import random
+
+import rules
+from character_generator import Character, generate_batch, regenerate_character
+from codes import EventType, to_labels
+from rules import Benefit, Career, Skill, SkillTable
+
+
+def test_codes_round_trip_labels():
+    """Test that every code parses back from its label and formats as it"""
+    for enum in (Career, Skill, SkillTable, Benefit, EventType):
+        for member in enum:
+            assert enum.parse(member.label) is member
+            assert str(member) == f"{member}" == member.label
+            assert pickle.loads(pickle.dumps(member)) is member
+    assert Skill.SHIPS_BOAT.label == "Ship's Boat"
+    assert Benefit.NONE.label == '-'
+    assert Career.get('Pirates') is None
+
+
+def test_to_json_contains_only_names():
+    """Test that no code leaks through the JSON boundary"""
+    for data in generate_batch(50, seed=11, death_rule_enabled=True):
+        assert json.loads(json.dumps(data)) == data
+        assert to_labels(data) == data
+        assert data['career'] in Character.get_available_careers()
+
+
+def test_public_career_helpers_return_names():
+    """Test that the static career helpers hand back names, not codes"""
+    rng = random.Random(1)
+    assert Character.get_random_career(rng) in Character.get_available_careers()
+    assert Character.get_draft_career(rng) in Character.get_available_careers()
+    stats = {stat: 12 for stat in rules.STATS}
+    for _ in range(20):
+        career = Character.attempt_enlistment(stats, Career.NAVY, rng)[0]
+        assert type(career) is str and json.dumps(career) == f'"{career}"'
+        assert career in Character.get_available_careers()
+
+
+def test_from_json_restores_codes():
+    """Test that from_json() turns names back into codes and to_json() reproduces the input"""
+    c = regenerate_character(5, 3)
+    data = c.to_json()
+    restored = Character.from_json(data)
+    assert restored.career is c.career
+    assert restored.skills == c.skills
+    assert all(type(event['event_type']) is EventType for event in restored.generation_log)
+    assert restored.to_json() == data
+
+
+def test_unlisted_skills_load_and_names_still_work_as_keys():
+    """Test that skills outside the rules tables survive from_json() and skills can be looked up by name"""
+    data = regenerate_character(5, 3).to_json()
+    data['skills'].append({'name': 'Zero-G Combat', 'level': 2})
+    restored = Character.from_json(data)
+    assert restored.skills['Zero-G Combat'] == 2
+    assert restored.to_json()['skills'] == data['skills']
+    pilot = restored.skills.get(Skill.PILOT, 0)
+    restored.add_skill('Cooking')
+    restored.add_skill('Pilot', 2)
+    assert restored.skills['Pilot'] == restored.skills[Skill.PILOT] == pilot + 2
+    assert 'Cooking' in restored.skills and restored.skills.get('Gambling', 0) == 0
+    assert type(next(iter(Character.from_json({'skills': {'Pilot': 1}}).skills))) is Skill
+
+
+def test_merchants_use_their_own_mustering_tables():
+    """Test that Merchants muster out on the Merchants tables, not the Others ones"""
+    assert rules.CASH_TABLE[Career.MERCHANTS][7] == 40000
+    assert rules.BENEFIT_TABLE[Career.MERCHANTS][7] is Benefit.FREE_TRADER
+    items = {item for data in generate_batch(300, seed=2, service_choice='Merchants')
+             if data['career'] == 'Merchants' for item in data['mustering_out_benefits']['items']}
+    assert 'Free Trader' in items or 'Blade' in items
+
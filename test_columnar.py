@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+from character_generator import Character, generate_batch
+from columnar import NO_CAREER, load_columns, write_columns, write_population
+from population_engine import simulate_population
+
+
+def test_columns_round_trip_characters(tmp_path):
+    """Test that every exported column matches the character it came from"""
+    characters = list(generate_batch(50, seed=6, death_rule_enabled=True))
+    assert write_columns(tmp_path, iter(characters), 50) == 50
+    columns = load_columns(tmp_path)
+    assert isinstance(columns.characters, np.memmap) and len(columns) == 50
+    for i, data in enumerate(characters):
+        record = columns.characters[i]
+        assert [record[stat] for stat in data['characteristics']] == list(data['characteristics'].values())
+        career = record['career']
+        assert (None if career == NO_CAREER else columns.career_names[career]) == data['career']
+        assert record['terms_served'] == data['terms_served'] and record['age'] == data['age']
+        assert record['cash'] == data['mustering_out_benefits']['cash']
+        assert bool(record['commissioned']) == data['commissioned']
+        levels = {name: int(level) for name, level in zip(columns.skill_names, columns.skills[i]) if level}
+        assert levels == {s['name']: s['level'] for s in data['skills']}
+
+
+def test_objects_and_dicts_export_the_same(tmp_path):
+    """Test that Character objects and their to_json() dicts give identical files"""
+    write_columns(tmp_path / 'a', generate_batch(30, seed=1, output_format='object'), 30)
+    write_columns(tmp_path / 'b', generate_batch(30, seed=1), 30)
+    a, b = load_columns(tmp_path / 'a'), load_columns(tmp_path / 'b')
+    assert np.array_equal(a.characters, b.characters) and np.array_equal(a.skills, b.skills)
+    assert a.upp().shape == (30, 6)
+
+
+def test_population_export(tmp_path):
+    """Test that a vectorized population exports without a per-character loop"""
+    pop = simulate_population(1000, seed=3)
+    write_population(tmp_path, pop)
+    columns = load_columns(tmp_path)
+    assert np.array_equal(columns.upp(), pop.characteristics)
+    assert np.array_equal(columns['cash'], pop.cash)
+    assert np.array_equal(columns['Pilot'], pop.skills[:, columns.skill_names.index('Pilot')])
+
+
+def test_count_must_match(tmp_path):
+    """Test that a short or long character stream is rejected"""
+    with pytest.raises(ValueError):
+        write_columns(tmp_path, generate_batch(3, seed=1), 4)
+    with pytest.raises(ValueError):
+        write_columns(tmp_path, generate_batch(3, seed=1), 2)
+
+
+def test_unlisted_skills_are_skipped_and_counted(tmp_path):
+    """Test that skills outside the rules tables are counted in the manifest instead of failing the export"""
+    characters = list(generate_batch(3, seed=4))
+    characters[1]['skills'].append({'name': 'Zero-G Combat', 'level': 2})
+    objects = [Character.from_json(data) for data in characters]
+    for directory, population in (('dicts', characters), ('objects', objects)):
+        assert write_columns(tmp_path / directory, population, 3) == 3
+        columns = load_columns(tmp_path / directory)
+        assert columns.manifest['unlisted_skills'] == {'Zero-G Combat': 1}
+        listed = {s['name']: s['level'] for s in characters[1]['skills'] if s['name'] != 'Zero-G Combat'}
+        assert {name: int(level) for name, level in zip(columns.skill_names, columns.skills[1]) if level} == listed
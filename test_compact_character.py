@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import json
+import tracemalloc
+
+from character_generator import Character, generate_batch
+from compact_character import CompactCharacter, compact_batch
+
+
+def test_compact_round_trip_is_lossless():
+    """Test that to_json() output survives compaction byte for byte"""
+    characters = list(generate_batch(200, seed=8, death_rule_enabled=True)) + [Character().to_json()]
+    for data in characters:
+        compact = CompactCharacter.from_json(data)
+        assert json.dumps(compact.to_json()) == json.dumps(data)
+        assert compact.to_character().to_json() == data
+        assert compact.terms_served == data['terms_served']
+        assert compact.upp == data['upp']
+
+
+def test_compact_without_logs():
+    """Test that keep_logs=False keeps everything except the four logs"""
+    data = next(generate_batch(1, seed=4))
+    restored = CompactCharacter.from_json(data, keep_logs=False).to_json()
+    for key in ('career_history', 'ageing_log', 'skill_acquisition_log', 'generation_log'):
+        assert restored[key] == []
+        restored[key] = data[key]
+    assert restored == data
+
+
+def _bytes_per_character(n, keep_logs):
+    data = list(generate_batch(n, seed=3))
+    CompactCharacter.from_json(data[0])  # build the shared dictionary outside the measurement
+    tracemalloc.start()
+    compact = [CompactCharacter.from_json(d, keep_logs) for d in data]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return used / len(compact)
+
+
+def test_compact_footprint_targets():
+    """Test the documented bytes-per-character targets"""
+    assert _bytes_per_character(300, keep_logs=True) <= 1024
+    assert _bytes_per_character(300, keep_logs=False) <= 384
+
+
+def test_compact_batch():
+    """Test that compact_batch matches generate_batch"""
+    compact = list(compact_batch(5, seed=6, service_choice='Navy'))
+    assert [c.to_json() for c in compact] == list(generate_batch(5, seed=6, service_choice='Navy'))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import random
+from collections import Counter
+
+import pytest
+
+import dice
+from character_generator import generate_batch, regenerate_character
+
+
+@pytest.mark.parametrize('backend', dice.BACKENDS)
+def test_backend_rolls_fair_dice(backend):
+    """Test that every backend rolls each d6 face about equally often"""
+    rng = dice.make_rng(backend, seed=1)
+    counts = Counter(rng.randint(1, 6) for _ in range(60000))
+    assert set(counts) == {1, 2, 3, 4, 5, 6}
+    assert all(abs(n - 10000) < 500 for n in counts.values())
+    assert rng.choice(['a', 'b', 'c']) in {'a', 'b', 'c'}
+
+
+@pytest.mark.parametrize('backend', ('pcg64', 'philox', 'counter'))
+def test_jump_ahead_matches_replay(backend):
+    """Test that jump(n) lands where replaying n steps would"""
+    replayed = dice.make_rng(backend, seed=7)
+    jumped = dice.make_rng(backend, seed=7)
+    if backend == 'counter':
+        for _ in range(1000):
+            replayed.next64()
+    else:
+        # Philox steps are counter blocks of four outputs
+        replayed._bits.random_raw(4000 if backend == 'philox' else 1000)
+    jumped.jump(1000)
+    assert [replayed.randint(1, 6) for _ in range(50)] == [jumped.randint(1, 6) for _ in range(50)]
+
+
+@pytest.mark.parametrize('backend', dice.BACKENDS)
+def test_regenerate_matches_batch(backend):
+    """Test that character #N can be rebuilt on its own with any backend"""
+    batch = list(generate_batch(20, seed=99, backend=backend))
+    assert regenerate_character(99, 17, backend=backend).to_json() == batch[17]
+    assert len({c['name'] + str(c['characteristics']) for c in batch}) > 1
+
+
+def test_batch_leaves_global_random_untouched():
+    """Test that batch generation uses per-character generators only"""
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    list(generate_batch(10, seed=1))
+    assert random.random() == expected
+
+
+def test_dice_stream_distributions():
+    """Test that buffered 2d6 and non-d6 ranges keep their exact distributions"""
+    stream = dice.DiceStream(seed=3)
+    totals = Counter(stream.roll_2d6() for _ in range(72000))
+    for total in range(2, 13):
+        expected = 72000 * (6 - abs(total - 7)) / 36
+        assert abs(totals[total] - expected) < 5 * expected ** 0.5
+    names = Counter(stream.choice(range(20)) for _ in range(20000))
+    assert set(names) == set(range(20))
+    assert all(abs(n - 1000) < 160 for n in names.values())
+    assert all(0 <= stream.randint(0, 10**6) <= 10**6 for _ in range(100))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+from character_generator import Character, generate_batch, regenerate_character
+from codes import EventType
+from event_store import EventStore
+from rules import Skill, SkillTable
+
+
+def test_views_are_rebuilt_from_one_record_list():
+    """Test that each log view is derived from the records, in recording order"""
+    store = EventStore()
+    store.event(EventType.TERM_START, 1, 22, {'term': 1, 'career': 'Navy'})
+    store.skill(1, 'term_skill', SkillTable.SERVICE, 3, Skill.PILOT, 1, 'Navy term 1')
+    store.rolls(1, 22)
+    store.ageing(1, 22, ['STR -1'], True)
+    assert len(store) == 4
+    assert store.generation_log() == [
+        {'event_type': EventType.TERM_START, 'term': 1, 'age': 22, 'data': {'term': 1, 'career': 'Navy'}},
+        {'event_type': EventType.AGEING, 'term': 1, 'age': 22, 'data': {'term': 1, 'age': 22, 'effects': ['STR -1']}},
+    ]
+    assert store.generation_log(labels=True)[0]['event_type'] == 'term_start'
+    assert store.skill_acquisition_log(labels=True)[0]['skill'] == 'Pilot'
+    assert store.ageing_log() == [{'term': 1, 'age': 22, 'effects': ['STR -1']}]
+    assert store.term_log() == [{'term': 1, 'age': 22, 'skills': [(SkillTable.SERVICE, Skill.PILOT)],
+                                 'ageing': ['STR -1']}]
+
+
+def test_views_return_fresh_lists():
+    """Test that mutating a view does not change the store"""
+    c = regenerate_character(7, 2)
+    c.generation_log.clear()
+    assert c.generation_log
+
+
+def test_from_json_round_trips_every_log():
+    """Test that a character rebuilt from JSON reports the same logs"""
+    for data in generate_batch(40, seed=9, death_rule_enabled=True):
+        restored = Character.from_json(data)
+        assert restored.to_json() == data
+
+
+def test_term_index_matches_a_full_scan():
+    """Test that the per-term lookups return what filtering the whole log would"""
+    for c in generate_batch(30, seed=4, output_format='object'):
+        log, skills = c.generation_log, c.skill_acquisition_log
+        for term in {e['term'] for e in log} | {e['term'] for e in skills}:
+            assert c.events_for_term(term) == [e for e in log if e['term'] == term]
+            assert c.events.skill_acquisition_log(term=term) == [e for e in skills if e['term'] == term]
+        assert c.events_for_term(99) == []
+
+
+def test_state_at_term_is_a_snapshot():
+    """Test that each term's checkpoint keeps the values it had then"""
+    c = regenerate_character(5, 3)
+    first, last = c.state_at_term(1), c.state_at_term(c.terms_served)
+    assert first['term'] == 1 and first['age'] == 22
+    assert last['skills'] == c.skills and last['rank'] == c.rank
+    assert first['skills'] is not c.skills
+    assert c.state_at_term(0) is None
+
+
+def test_term_log_keeps_characteristic_gains_as_rolled():
+    """Test that term_log shows a characteristic gain as its table text, e.g. '+1 END'"""
+    gains = [result for c in generate_batch(40, seed=3, output_format='object') for entry in c.term_log
+             for _, result in entry['skills'] if type(result) is str]
+    assert gains and all(gain in ('+1 STR', '+1 DEX', '+1 END', '+1 INT', '+1 EDU', '+1 SOC') for gain in gains)
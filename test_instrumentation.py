@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import io
+
+import character_generator
+from character_generator import Character, generate_batch, run_full_character_generation, write_jsonl
+from instrumentation import PHASES, Instrumentation
+
+
+def test_disabled_by_default_and_restored_after():
+    """Test that instrumentation leaves the engine untouched outside its block and changes no results"""
+    originals = {name: Character.__dict__[name] for names in PHASES.values() for name in names}
+    expected = list(generate_batch(10, seed=4))
+    with Instrumentation():
+        assert character_generator._instrumentation is not None
+        assert list(generate_batch(10, seed=4)) == expected
+    assert character_generator._instrumentation is None
+    assert {name: Character.__dict__[name] for name in originals} == originals
+
+
+def test_counts_a_batch():
+    """Test that the counters agree with the characters produced"""
+    with Instrumentation() as instrumentation:
+        characters = list(generate_batch(20, seed=9, output_format='object'))
+        out = io.StringIO()
+        write_jsonl(out, 5, seed=1)
+    stats = instrumentation.stats()
+    assert stats['characters'] == 25
+    assert stats['events_logged'] == sum(len(c.generation_log) for c in characters) + \
+        sum(len(c.generation_log) for c in generate_batch(5, seed=1, output_format='object'))
+    assert stats['bytes_serialised'] == len(out.getvalue())
+    assert stats['terms_simulated'] >= sum(int(c.terms_served) for c in characters)
+    assert stats['dice_rolls'] > stats['terms_simulated'] and stats['random_choices'] > 0
+    assert stats['phase_calls']['characteristics'] == 25 and stats['phase_calls']['to_json'] == 5
+    assert stats['wall_seconds'] >= sum(stats['phase_seconds'].values()) > 0
+
+
+def test_parallel_batches_merge_worker_stats():
+    """Test that workers report the same counts as a serial run"""
+    with Instrumentation() as serial:
+        list(generate_batch(40, seed=2))
+    with Instrumentation() as parallel:
+        list(generate_batch(40, seed=2, workers=2, chunk_size=5))
+    for key in ('characters', 'dice_rolls', 'random_choices', 'events_logged', 'terms_simulated', 'phase_calls'):
+        assert parallel.stats()[key] == serial.stats()[key]
+
+
+def test_run_full_character_generation_surface():
+    """Test that run_full_character_generation collects into a given Instrumentation"""
+    instrumentation = Instrumentation()
+    result = run_full_character_generation(service_choice='Scouts', seed=6, output_format='json',
+                                           instrumentation=instrumentation)
+    assert result['career'] == 'Scouts'
+    assert instrumentation.stats()['characters'] == 1
+    assert character_generator._instrumentation is None
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+from character_generator import generate_batch, write_jsonl
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'character_generator.py')
+
+
+def test_write_jsonl_matches_generate_batch():
+    """Test that every line is one compact character, in batch order, across buffer flushes"""
+    out = io.StringIO()
+    assert write_jsonl(out, 25, buffer_size=4096, seed=8, death_rule_enabled=True) == 25
+    lines = out.getvalue().split('\n')
+    assert lines.pop() == ''
+    assert [json.loads(line) for line in lines] == list(generate_batch(25, seed=8, death_rule_enabled=True))
+    assert all(': ' not in line[:20] for line in lines)
+
+
+def test_cli_streams_jsonl(tmp_path):
+    """Test that generate --jsonl writes nothing but JSON to stdout, and --out writes a file"""
+    run = [sys.executable, SCRIPT, 'generate', '--count', '3', '--jsonl', '--seed', '5', '--career', 'Navy']
+    stdout = subprocess.run(run, capture_output=True, text=True, cwd=tmp_path, check=True).stdout
+    assert [json.loads(line) for line in stdout.splitlines()] == list(generate_batch(3, seed=5, service_choice='Navy'))
+    path = tmp_path / 'chars.jsonl'
+    subprocess.run(run + ['--out', str(path)], capture_output=True, cwd=tmp_path, check=True)
+    assert path.read_text() == stdout
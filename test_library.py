@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from character_generator import generate_batch, generate_character
+from library import Library
+
+
+def test_batch_save_get_and_find(tmp_path):
+    """Test that a saved batch comes back intact by id and indexed searches match it"""
+    path = str(tmp_path / 'chars.db')
+    expected = list(generate_batch(120, seed=21, death_rule_enabled=True))
+    with Library(path) as library:
+        assert library.save_batch(120, batch_size=50, seed=21, death_rule_enabled=True) == 120
+        assert library._connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert len(library) == 120
+        assert library.get(1) == expected[0] and library.get(120) == expected[119]
+        assert library.get(121) is None
+
+        navy = library.find(career='Navy', min_rank=2, limit=1000)
+        assert [row['id'] for row in navy] == [i + 1 for i, data in enumerate(expected)
+                                                if data['career'] == 'Navy' and data['rank'] >= 2]
+        strong = library.find(strength=10, min_cash=1, limit=1000)
+        assert len(strong) == sum(1 for d in expected
+                                  if d['characteristics']['str'] >= 10 and d['mustering_out_benefits']['cash'] >= 1)
+        row = library.find(upp=expected[5]['upp'], limit=1)[0]
+        assert row['upp'] == expected[5]['upp']
+        with pytest.raises(ValueError):
+            library.find(luck=5)
+
+    with Library(path) as reopened:
+        character_id = reopened.save(generate_character(service_choice='Scouts', rng=None))
+        assert character_id == 121 and reopened.get(121)['career'] == 'Scouts'
+
+
+def test_app_saves_session_character(tmp_path, monkeypatch):
+    """Test that the web app saves the session's character and looks it up by id"""
+    import app
+    monkeypatch.setenv('TRAVELLER_LIBRARY', str(tmp_path / 'web.db'))
+    app.library.cache_clear()
+    client = app.app.test_client()
+    assert client.post('/library').status_code == 400
+    name = client.post('/create_character').get_json()['name']
+    client.post('/reveal_characteristic', json={'characteristic': 'social'})
+    etag = client.get('/ui_state').headers['ETag']
+    character_id = client.post('/library').get_json()['id']
+    assert client.get('/ui_state', headers={'If-None-Match': etag}).status_code == 304  # saving changes nothing
+    saved = client.get(f'/library/{character_id}').get_json()
+    assert saved['name'] == name and saved['revealed'] == ['social']
+    [row] = app.library().find(limit=5)
+    assert (row['id'], row['name'], row['career'], len(row['upp'])) == (character_id, name, None, 6)
+    assert client.get('/library/999').status_code == 404
+    app.library().close()
+    app.library.cache_clear()
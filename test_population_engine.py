@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from character_generator import generate_batch
+from population_engine import simulate_population, CAREERS, STATS
+
+
+def test_population_is_reproducible():
+    """Test that the same seed gives the same population"""
+    a = simulate_population(2000, seed=5)
+    b = simulate_population(2000, seed=5)
+    assert np.array_equal(a.characteristics, b.characteristics)
+    assert np.array_equal(a.cash, b.cash)
+    assert a.characteristics.shape == (2000, len(STATS))
+    assert a.characteristics.dtype == np.int8
+
+
+def test_population_matches_character_engine():
+    """Test that vectorized outcomes agree with the per-object engine"""
+    pop = simulate_population(200000, seed=11, service_choice='Army', death_rule_enabled=True)
+    characters = list(generate_batch(4000, seed=11, service_choice='Army', death_rule_enabled=True))
+
+    army = pop.career == CAREERS.index('Army')
+    expected_terms = np.mean([c['terms_served'] for c in characters if c['career'] == 'Army'])
+    assert abs(pop.terms_served[army].mean() - expected_terms) < 0.15
+
+    expected_army = np.mean([c['career'] == 'Army' for c in characters])
+    assert abs(army.mean() - expected_army) < 0.05
+    assert (pop.terms_half[pop.outcome == 2] % 2 == 0).all(), "Deaths should not add half terms"
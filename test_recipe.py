@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from recipe import RULES_HASH, Recipe, batch_recipes
+
+
+def test_recipes_regenerate_bit_for_bit():
+    """Test that a 24-byte recipe rebuilds the full character, logs included"""
+    for recipe, data in batch_recipes(40, seed=77, death_rule_enabled=True):
+        record = recipe.to_bytes()
+        assert len(record) == 24
+        restored = Recipe.from_bytes(record)
+        assert restored == recipe
+        assert restored.regenerate().to_json() == data
+        assert restored.verify() and restored.verify(data)
+
+
+def test_recipes_keep_every_option():
+    """Test that career, backend, log level and a 64-bit seed survive encoding"""
+    for recipe, data in batch_recipes(5, seed=2**64 - 1, service_choice='Marines', backend='philox', log_level='off'):
+        restored = Recipe.from_bytes(recipe.to_bytes())
+        assert (restored.service_choice, restored.backend, restored.log_level) == ('Marines', 'philox', 'off')
+        assert restored.verify(data)
+
+
+def test_verify_detects_mismatches():
+    """Test that a wrong digest or a recipe from other rules fails verification"""
+    recipe, data = next(batch_recipes(1, seed=3))
+    assert not recipe._replace(digest=recipe.digest ^ 1).verify()
+    assert not recipe._replace(rules_hash=RULES_HASH ^ 1).verify()
+    with pytest.raises(ValueError):
+        recipe._replace(rules_hash=RULES_HASH ^ 1).regenerate()
+    with pytest.raises(ValueError):
+        Recipe.of('not-an-int', 0).to_bytes()
+    with pytest.raises(ValueError):
+        Recipe.of(1, 0).verify()
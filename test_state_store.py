@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+import pytest
+
+from state_store import StateStore
+
+
+def test_lru_eviction_in_memory():
+    """Test that the least recently used session is dropped past capacity"""
+    store = StateStore(capacity=2)
+    store.put('a', {'n': 1})
+    store.put('b', {'n': 2})
+    assert store.get('a') == {'n': 1}  # a is now the most recent
+    store.put('c', {'n': 3})
+    assert store.get('b') is None
+    assert (store.get('a'), store.get('c'), len(store)) == ({'n': 1}, {'n': 3}, 2)
+    assert store.delete('a') and not store.delete('a')
+
+
+def test_write_behind_snapshots(tmp_path):
+    """Test that flushed and evicted sessions come back from disk, and deletes remove them"""
+    store = StateStore(capacity=1, directory=str(tmp_path), flush_interval=60)
+    store.put('one', {'age': 18})
+    assert not os.path.exists(tmp_path / 'one.json')  # written behind, not yet
+    store.put('two', {'age': 22})  # evicts 'one' before it was written
+    assert store.get('one') == {'age': 18}  # still served from memory until flushed
+    with store.lock('one'):
+        store.get('one')['age'] = 26
+        store.put('one', store.get('one'))
+    assert store.flush() == 2
+    assert json.loads((tmp_path / 'one.json').read_text()) == {'age': 26}
+    assert not list(tmp_path.glob('*.tmp'))
+    store.close()
+
+    reopened = StateStore(capacity=1, directory=str(tmp_path), flush_interval=0)
+    assert reopened.get('two') == {'age': 22} and reopened.get('one') == {'age': 26}
+    reopened.put('three', {'age': 30})  # written through
+    assert json.loads((tmp_path / 'three.json').read_text()) == {'age': 30}
+    assert reopened.delete('two') and not os.path.exists(tmp_path / 'two.json')
+    with pytest.raises(ValueError):
+        reopened.put('../escape', {})
+
+
+def test_app_sessions_are_separate():
+    """Test that two browsers get their own characters in the web app"""
+    from app import app
+    first, second = app.test_client(), app.test_client()
+    name = first.post('/create_character').get_json()['name']
+    assert second.get('/term_info').status_code == 400
+    second.post('/create_character')
+    first.post('/reveal_characteristic', json={'characteristic': 'strength'})
+    assert first.get('/character_status').get_json()['revealed'] == ['strength']
+    assert first.get('/character_status').get_json()['name'] == name
+    assert second.get('/character_status').get_json()['revealed'] == []
+    assert first.post('/delete_character').get_json() == {'deleted': True}
+    assert first.get('/term_info').status_code == 400
+    assert second.get('/term_info').get_json()['term_number'] == 1
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import json
+
+import character_generator
+from character_generator import generate_batch
+from tracing import Tracer, trace_character
+
+
+def _spans(trace, name):
+    return [e for e in trace['traceEvents'] if e['name'] == name]
+
+
+def _inside(inner, outer):
+    return outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+
+def test_spans_nest_character_term_phase(tmp_path):
+    """Test that terms nest in the character and phase spans in their term"""
+    path = tmp_path / 'trace.json'
+    character, trace = trace_character(5, 3, path=str(path), service_choice='Navy')
+    assert json.loads(path.read_text()) == trace
+    assert all(e['ph'] in ('X', 'M') for e in trace['traceEvents'])
+    [span] = _spans(trace, 'character')
+    assert span['args']['name'] == character.name and span['args']['career'] == str(character.career)
+    terms = _spans(trace, 'term')
+    survivals = _spans(trace, 'check_survival')
+    assert len(terms) == len(survivals) >= int(character.terms_served)
+    assert [t['args']['term'] for t in terms] == list(range(1, len(terms) + 1))
+    for term, survival in zip(terms, survivals):
+        assert _inside(term, span) and _inside(survival, term)
+        assert survival['args']['outcome'] in ('survived', 'injured', 'died')
+    for name in ('check_ageing', 'roll_for_skills_detailed', 'attempt_reenlistment'):
+        assert all(any(_inside(e, t) for t in terms) for e in _spans(trace, name))
+    [muster] = _spans(trace, 'roll_mustering_out')
+    assert _inside(muster, span) and all(t['ts'] + t['dur'] <= muster['ts'] for t in terms)
+
+
+def test_tracing_a_batch_changes_nothing():
+    """Test that a traced batch gives the same characters and one character span each"""
+    expected = list(generate_batch(15, seed=8, death_rule_enabled=True))
+    with Tracer() as tracer:
+        assert list(generate_batch(15, seed=8, death_rule_enabled=True)) == expected
+    assert character_generator._instrumentation is None
+    trace = tracer.trace()
+    assert len(_spans(trace, 'character')) == 15
+    assert trace['otherData']['characters'] == 15
@@ -0,0 +1,130 @@
+import json
+import time
+
+from character_generator import regenerate_character
+from instrumentation import Instrumentation
+
+# Span tracing of character generation in Chrome Trace Event format.
+#
+# A Tracer is an Instrumentation that also records one complete ("X") event
+# per span, with whole-microsecond timestamps from when it was enabled:
+#
+#   character                      Character() to the end of generate_character
+#     generate_characteristics, attempt_enlistment, ...
+#     term (args: term)            one check_survival to the next, or to mustering out
+#       check_survival (args: outcome), check_commission, check_promotion, roll_for_skills_detailed,
+#       check_ageing, attempt_reenlistment
+#     roll_mustering_out
+#
+# Phase spans are named after the engine function and categorised by their
+# instrumentation.PHASES phase. Load the written file in chrome://tracing or
+# https://ui.perfetto.dev. Batches with workers > 1 still merge the workers'
+# stats, but only spans from this process are recorded.
+
+PID = 1
+TID = 1
+
+
+class Tracer(Instrumentation):
+    """Instrumentation that also records nested spans; write() saves them as a Chrome trace"""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._character = None  # start of the open character span
+        self._term = None       # (start, term number) of the open term span
+        self._terms = 0
+
+    def _now(self):
+        # Integer microsecond ticks, so a span ending at t never overlaps one starting at t
+        return (time.perf_counter_ns() - self._origin) // 1000
+
+    def _span(self, name, category, start, end, args=None):
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': end - start, 'pid': PID, 'tid': TID}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def _end_term(self, now):
+        if self._term is not None:
+            start, term = self._term
+            self._span('term', 'term', start, now, {'term': term})
+            self._term = None
+
+    # --- ENGINE HOOKS ---
+
+    def dice(self, rng):
+        now = self._now()
+        if self._character is not None:
+            # The last character never finished (an invalid career); close it unlabelled
+            self._end_term(now)
+            self._span('character', 'character', self._character, now)
+        self._character = now
+        self._terms = 0
+        return super().dice(rng)
+
+    def character_done(self, character):
+        now = self._now()
+        self._end_term(now)
+        if self._character is not None:
+            self._span('character', 'character', self._character, now, {
+                'name': character.name,
+                'career': str(character.career),
+                'terms_served': character.terms_served,
+                'age': character.age,
+            })
+            self._character = None
+        super().character_done(character)
+
+    def _wrap(self, func, phase):
+        timed = super()._wrap(func, phase)
+        name = func.__name__
+        spans = self
+
+        def traced(*args, **kwargs):
+            start = spans._now()
+            if phase == 'survival':
+                # Every term starts with its survival roll
+                spans._end_term(start)
+                spans._terms += 1
+                spans._term = (start, spans._terms)
+            elif phase == 'mustering_out':
+                spans._end_term(start)
+            result = None
+            try:
+                result = timed(*args, **kwargs)
+                return result
+            finally:
+                # Survival spans carry their outcome: 'survived', 'injured' or 'died'
+                spans._span(name, phase, start, spans._now(),
+                            {'outcome': result} if phase == 'survival' else None)
+        return traced
+
+    # --- RESULTS ---
+
+    def trace(self):
+        """The recorded spans as a Chrome Trace Event JSON object"""
+        events = sorted(self.events, key=lambda e: (e['ts'], -e['dur']))
+        metadata = [
+            {'name': 'process_name', 'ph': 'M', 'pid': PID, 'tid': TID, 'args': {'name': 'character_generator'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': PID, 'tid': TID, 'args': {'name': 'generation'}},
+        ]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms', 'otherData': self.stats()}
+
+    def write(self, path):
+        """Save trace() to path; returns the number of spans"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f, separators=(',', ':'))
+        return len(self.events)
+
+
+def trace_character(seed, index, path=None, **options):
+    """Regenerate character #index of a seeded batch under a Tracer; returns (character, trace)"""
+    with Tracer() as tracer:
+        character = regenerate_character(seed, index, **options)
+        if character is not None:
+            character.to_json()
+    if path is not None:
+        tracer.write(path)
+    return character, tracer.trace()